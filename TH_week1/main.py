@@ -1,38 +1,91 @@
 import sys, os
+import argparse
+import time
 sys.path.append(os.path.dirname(__file__))
-from utils import read_txt, convert_graph, convert_graph_weight
-from search import BFS, DFS, UCS_old, UCS_new
+from utils import load_graph_file, compile_graph, reverse_graph
+from search import BFS, DFS, UCS_old, UCS_new, UCS_bidir, FRONTIERS
+
+ALGOS = ["bfs", "dfs", "ucs-old", "ucs-new", "bidir-ucs"]
+
+def parse_args():
+    p = argparse.ArgumentParser(description="BFS, DFS, UCS trên đồ thị đọc từ file")
+    p.add_argument("--input", default="input/Input.txt", help="đồ thị cho BFS/DFS (text hoặc nhị phân)")
+    p.add_argument("--input-ucs", default="input/InputUCS.txt", help="đồ thị có trọng số cho UCS (text hoặc nhị phân)")
+    p.add_argument("--algo", choices=["all"] + ALGOS, default="all", help="thuật toán cần chạy")
+    p.add_argument("--time", action="store_true", help="in thời gian chạy của từng thuật toán")
+    p.add_argument("--frontier", choices=FRONTIERS, default="auto",
+                   help="hàng đợi của UCS_new: heap, bucket (Dial), radix; auto chọn bucket khi trọng số nguyên nhỏ")
+    p.add_argument("--stats", action="store_true", help="in số đỉnh mở rộng, số lần push/pop, kích thước frontier lớn nhất")
+    p.add_argument("--stats-json", metavar="FILE", help="ghi thống kê dạng JSON ra FILE ('-' là stdout)")
+    sub = p.add_subparsers(dest="command")
+    c = sub.add_parser("compile", help="chuyển file text sang file nhị phân để nạp tức thì")
+    c.add_argument("src", help="file ma trận kề hoặc danh sách cạnh")
+    c.add_argument("dst", help="file nhị phân đầu ra")
+    c.add_argument("--weighted", action="store_true", help="giữ trọng số (ô khác 0 là cạnh)")
+    return p.parse_args()
 
 def main():
-    # Đọc file Input.txt và InputUCS.txt
-    file_1 = open("input/Input.txt", "r")
-    file_2 = open("input/InputUCS.txt", "r")
+    args = parse_args()
+    if args.command == "compile":
+        size, m = compile_graph(args.src, args.dst, args.weighted)
+        print(f"Đã ghi {args.dst}: {size} đỉnh, {m} cạnh")
+        return
 
+    # Đọc Input.txt và InputUCS.txt thẳng thành đồ thị CSR (file text hoặc nhị phân đã biên dịch)
+    size_1, start_1, goal_1, graph_1 = load_graph_file(args.input)
+    size_2, start_2, goal_2, graph_2 = load_graph_file(args.input_ucs, weighted=True)
 
-    size_1, start_1, goal_1, matrix_1 = read_txt(file_1)
-    size_2, start_2, goal_2, matrix_2 = read_txt(file_2)
-    file_1.close()
-    file_2.close()
+    # search_stats.py nằm ở thư mục gốc của repo
+    stats = {}
+    if args.stats or args.stats_json:
+        sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+        from search_stats import SearchStats
 
-    graph_1 = convert_graph(matrix_1)
-    graph_2 = convert_graph_weight(matrix_2)
+    def run(name, fn, *fargs, **kwargs):
+        if args.algo not in ("all", name):
+            return None
+        if args.stats or args.stats_json:
+            kwargs["stats"] = stats[name] = SearchStats()
+        t0 = time.perf_counter()
+        result = fn(*fargs, **kwargs)
+        if args.time:
+            print(f"[{name}] {(time.perf_counter() - t0) * 1000:.3f} ms")
+        return result
 
     # Thực thi thuật toán BFS
-    result_bfs = BFS(graph_1, start_1, goal_1)
-    print("Kết quả sử dụng thuật toán BFS:\n", result_bfs)
+    result_bfs = run("bfs", BFS, graph_1, start_1, goal_1)
+    if result_bfs is not None:
+        print("Kết quả sử dụng thuật toán BFS:\n", result_bfs)
 
     # Thực thi thuật toán DFS
-    result_dfs = DFS(graph_1, start_1, goal_1)
-    print("Kết quả sử dụng thuật toán DFS:\n", result_dfs)
+    result_dfs = run("dfs", DFS, graph_1, start_1, goal_1)
+    if result_dfs is not None:
+        print("Kết quả sử dụng thuật toán DFS:\n", result_dfs)
 
     # Thực thi thuật toán UCS_old
-    result_ucs, cost = UCS_old(graph_2, start_2, goal_2)
-    print("Kết quả sử dụng thuật toán UCS_old:\n", result_ucs, "với tổng chi phí là", cost)
-    
+    result = run("ucs-old", UCS_old, graph_2, start_2, goal_2)
+    if result is not None:
+        result_ucs, cost = result
+        print("Kết quả sử dụng thuật toán UCS_old:\n", result_ucs, "với tổng chi phí là", cost)
+
     # Thực thi thuật toán UCS_new
-    result_ucs, cost = UCS_new(graph_2, start_2, goal_2)
-    print("Kết quả sử dụng thuật toán UCS_new:\n", result_ucs, "với tổng chi phí là", cost)
+    result = run("ucs-new", UCS_new, graph_2, start_2, goal_2, frontier=args.frontier)
+    if result is not None:
+        result_ucs, cost = result
+        print("Kết quả sử dụng thuật toán UCS_new:\n", result_ucs, "với tổng chi phí là", cost)
+
+    # Thực thi UCS hai chiều (đồ thị ngược được tạo một lần, ngoài phần đo thời gian)
+    if args.algo in ("all", "bidir-ucs"):
+        reverse_2 = reverse_graph(graph_2)
+        cost, result_ucs = run("bidir-ucs", UCS_bidir, graph_2, start_2, goal_2, reverse_2)
+        print("Kết quả sử dụng thuật toán UCS hai chiều:\n", result_ucs, "với tổng chi phí là", cost)
 
+    if args.stats:
+        for name, st in stats.items():
+            st.report(name)
+    if args.stats_json:
+        from search_stats import write_json
+        write_json(stats, args.stats_json)
 
     # Kết quả sử dụng thuật toán BFS:
     #  [0, 2, 7, 8, 10, 14, 15, 16, 17]
@@ -42,6 +95,8 @@ def main():
     #  6919 với tổng chi phí là [0, 2, 7, 8, 10, 14, 15, 16, 17]
     # Kết quả sử dụng thuật toán UCS_new:
     #  6919 với tổng chi phí là [0, 2, 7, 8, 10, 14, 15, 16, 17]
+    # Kết quả sử dụng thuật toán UCS hai chiều:
+    #  [0, 2, 7, 8, 10, 14, 15, 16, 17] với tổng chi phí là 6919
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
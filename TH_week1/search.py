@@ -1,9 +1,12 @@
 import heapq
+from collections import deque
+from functools import partial
+from time import perf_counter
 
 class Queue:
-    """Cấu trúc dữ liệu hàng đợi (FIFO - First In First Out)"""
+    """Cấu trúc dữ liệu hàng đợi (FIFO - First In First Out), dùng deque để get là O(1)"""
     def __init__(self):
-        self.items = []
+        self.items = deque()
 
     def put(self, item):
         """Thêm phần tử vào cuối hàng đợi"""
@@ -12,7 +15,7 @@ class Queue:
     def get(self):
         """Lấy và loại bỏ phần tử ở đầu hàng đợi"""
         if not self.empty():
-            return self.items.pop(0)
+            return self.items.popleft()
         else:
             raise Exception("Queue is empty!")
 
@@ -21,7 +24,7 @@ class Queue:
         return len(self.items) == 0
 
     def __str__(self):
-        return f"Queue({self.items})"
+        return f"Queue({list(self.items)})"
 
 
 class PriorityQueue:
@@ -48,37 +51,203 @@ class PriorityQueue:
         return f"PriorityQueue({self.elements})"
 
 
-def BFS(graph, start, end):
-    visited = []
+# -----------------------------
+# Frontier cho UCS: push(cost, node), pop() -> (cost, node), len()
+# Khoá lấy ra không giảm dần (chi phí UCS luôn tăng theo thứ tự mở rộng) nên
+# với trọng số nguyên không âm có thể dùng hàng đợi đơn điệu thay cho heap.
+# Chỉ UCS_new dùng các frontier này: UCS_old đóng đỉnh ngay khi đưa vào hàng đợi nên
+# kết quả phụ thuộc thứ tự lấy ra khi bằng chi phí, vẫn giữ PriorityQueue (cost, node).
+# -----------------------------
+class HeapFrontier:
+    """Binary heap (heapq) trên các cặp (cost, node): trọng số bất kỳ, O(log n) mỗi thao tác"""
+    def __init__(self):
+        self.heap = []
+        # pop gọi thẳng heapq.heappop, không qua một hàm Python
+        self.pop = partial(heapq.heappop, self.heap)
+
+    def push(self, cost, node):
+        heapq.heappush(self.heap, (cost, node))
+
+    def __len__(self):
+        return len(self.heap)
+
+
+class BucketFrontier:
+    """
+    Hàng đợi Dial: max_weight + 1 bucket xoay vòng, bucket cost % (max_weight + 1).
+    Mọi khoá trong frontier nằm trong [cursor, cursor + max_weight] nên bucket chỉ
+    cần lưu node. push là O(1), pop quét tới bucket khác rỗng kế tiếp (tổng số
+    bước quét không vượt quá chi phí lớn nhất được lấy ra). Trong cùng bucket lấy
+    theo thứ tự vào trước ra trước.
+    """
+    def __init__(self, max_weight):
+        self.size = max_weight + 1
+        self.buckets = [deque() for _ in range(self.size)]
+        self.cursor = 0
+        self.count = 0
+
+    def push(self, cost, node):
+        self.buckets[cost % self.size].append(node)
+        self.count += 1
+
+    def pop(self):
+        if not self.count:
+            raise IndexError("pop from empty frontier")
+        buckets, size, cost = self.buckets, self.size, self.cursor
+        while not buckets[cost % size]:
+            cost += 1
+        self.cursor = cost
+        self.count -= 1
+        return cost, buckets[cost % size].popleft()
+
+    def __len__(self):
+        return self.count
+
+
+class RadixFrontier:
+    """
+    Radix heap cho khoá nguyên không âm, đơn điệu: bucket i chứa các khoá có bit
+    cao nhất khác với last (khoá vừa lấy ra) ở vị trí i - 1; bucket 0 chứa khoá
+    bằng last. Khi bucket 0 rỗng, bucket khác rỗng đầu tiên được chia lại theo
+    khoá nhỏ nhất của nó. Mỗi phần tử chỉ bị chuyển bucket O(log C) lần.
+    """
+    def __init__(self):
+        self.buckets = [[] for _ in range(65)]
+        self.last = 0
+        self.count = 0
+
+    def push(self, cost, node):
+        if cost == self.last:
+            self.buckets[0].append(node)
+        else:
+            self.buckets[(cost ^ self.last).bit_length()].append((cost, node))
+        self.count += 1
+
+    def pop(self):
+        if not self.count:
+            raise IndexError("pop from empty frontier")
+        buckets = self.buckets
+        if not buckets[0]:
+            i = 1
+            while not buckets[i]:
+                i += 1
+            items = buckets[i]
+            buckets[i] = []
+            last = self.last = min(cost for cost, _ in items)
+            zero = buckets[0]
+            for cost, node in items:
+                if cost == last:
+                    zero.append(node)
+                else:
+                    buckets[(cost ^ last).bit_length()].append((cost, node))
+        self.count -= 1
+        return self.last, buckets[0].pop()
+
+    def __len__(self):
+        return self.count
+
+
+FRONTIERS = ("auto", "heap", "bucket", "radix")
+# frontier="auto" chọn hàng đợi Dial khi trọng số lớn nhất không vượt quá giá trị này
+BUCKET_MAX_WEIGHT = 1 << 10
+
+
+def integer_weight_bound(graph):
+    """Trọng số lớn nhất nếu mọi trọng số là số nguyên không âm, ngược lại None"""
+    if hasattr(graph, "weight_bound"):
+        # CSRGraph luôn lưu trọng số dạng số nguyên 64 bit và giữ lại kết quả
+        return graph.weight_bound()
+    bound = 0
+    for nbrs in graph.values():
+        for _, w in nbrs:
+            if type(w) is not int or w < 0:
+                return None
+            if w > bound:
+                bound = w
+    return bound
+
+
+def make_frontier(graph, kind="auto"):
+    """
+    Tạo frontier cho UCS. "auto" dùng hàng đợi Dial cho CSRGraph có trọng số
+    nguyên không âm, lớn nhất <= BUCKET_MAX_WEIGHT, còn lại dùng heap:
+      - đồ thị dict phải duyệt mọi cạnh bằng Python mới biết trọng số là số nguyên,
+        tốn gần bằng chính lần tìm kiếm nên không được kiểm tra tự động
+      - radix heap viết bằng Python chỉ nhanh hơn heapq (viết bằng C) khi trọng số
+        nhỏ, lúc đó hàng đợi Dial còn nhanh hơn; với trọng số lớn nó chậm hơn heap
+        (benchmarks/bench_week1_frontier.py), nên chỉ dùng khi chọn rõ
+    """
+    if kind not in FRONTIERS:
+        raise ValueError(f"Unknown frontier {kind!r}, expected one of {FRONTIERS}")
+    if kind == "auto":
+        bound = graph.weight_bound() if hasattr(graph, "weight_bound") else None
+        if bound is not None and bound <= BUCKET_MAX_WEIGHT:
+            return BucketFrontier(bound)
+        return HeapFrontier()
+    bound = None if kind == "heap" else integer_weight_bound(graph)
+    if kind in ("bucket", "radix") and bound is None:
+        raise ValueError(f"frontier={kind!r} requires non-negative integer weights")
+    if kind == "bucket" and bound > 1 << 24:
+        # mỗi giá trị trọng số cần một bucket
+        raise ValueError(f"frontier='bucket' needs {bound + 1} buckets, use 'radix' for large weights")
+    if kind == "heap":
+        return HeapFrontier()
+    if kind == "bucket":
+        return BucketFrontier(bound)
+    return RadixFrontier()
+
+
+# Tham số stats (tuỳ chọn) của các hàm tìm kiếm: xem search_stats.py ở thư mục gốc.
+
+def _parent_table(graph):
+    """Mảng cha đánh chỉ số theo đỉnh nếu biết số đỉnh (CSRGraph), ngược lại dùng dict"""
+    num_nodes = getattr(graph, "num_nodes", None)
+    if num_nodes is None:
+        return dict()
+    return [None] * num_nodes
+
+
+def BFS(graph, start, end, stats=None):
+    t0 = perf_counter()
+    visited = set()
     frontier = Queue()
+    expanded = generated = 0
+    peak = 1
 
     # thêm node start vào frontier và visited
     frontier.put(start)
-    visited.append(start)
+    visited.add(start)
 
     # start không có node cha
-    parent = dict()
+    parent = _parent_table(graph)
     parent[start] = None
 
     path_found = False
 
     while True:
         if frontier.empty():
+            if stats is not None:
+                stats.add(expanded=expanded, generated=generated, pushes=len(visited), pops=expanded,
+                          peak_frontier=peak, wall_time=perf_counter() - t0)
             raise Exception("No way Exception")
 
         current_node = frontier.get()
-        visited.append(current_node)
+        expanded += 1
 
         # Kiểm tra current_node có là end hay không
         if current_node == end:
             path_found = True
             break
 
-        for node in graph[current_node]:
+        neighbors = graph[current_node]
+        generated += len(neighbors)
+        for node in neighbors:
             if node not in visited:
                 frontier.put(node)
                 parent[node] = current_node
-                visited.append(node)
+                visited.add(node)
+        if len(frontier.items) > peak:
+            peak = len(frontier.items)
 
     # Xây dựng đường đi
     path = []
@@ -89,40 +258,53 @@ def BFS(graph, start, end):
             end = parent[end]
         path.reverse()
 
+    if stats is not None:
+        stats.add(expanded=expanded, generated=generated, pushes=len(visited), pops=expanded,
+                  peak_frontier=peak, wall_time=perf_counter() - t0)
     return path
 
 
-def DFS(graph, start, end):
-    visited = []
+def DFS(graph, start, end, stats=None):
+    t0 = perf_counter()
+    visited = set()
     frontier = []
+    expanded = generated = 0
+    peak = 1
 
     # thêm node start vào frontier và visited
     frontier.append(start)
-    visited.append(start)
+    visited.add(start)
 
     # start không có node cha
-    parent = dict()
+    parent = _parent_table(graph)
     parent[start] = None
 
     path_found = False
 
     while True:
         if frontier == []:
+            if stats is not None:
+                stats.add(expanded=expanded, generated=generated, pushes=len(visited), pops=expanded,
+                          peak_frontier=peak, wall_time=perf_counter() - t0)
             raise Exception("No way Exception")
 
         current_node = frontier.pop()
-        visited.append(current_node)
+        expanded += 1
 
         # Kiểm tra current_node có là end hay không
         if current_node == end:
             path_found = True
             break
 
-        for node in graph[current_node]:
+        neighbors = graph[current_node]
+        generated += len(neighbors)
+        for node in neighbors:
             if node not in visited:
                 frontier.append(node)
                 parent[node] = current_node
-                visited.append(node)
+                visited.add(node)
+        if len(frontier) > peak:
+            peak = len(frontier)
 
     # Xây dựng đường đi
     path = []
@@ -133,29 +315,38 @@ def DFS(graph, start, end):
             end = parent[end]
         path.reverse()
 
+    if stats is not None:
+        stats.add(expanded=expanded, generated=generated, pushes=len(visited), pops=expanded,
+                  peak_frontier=peak, wall_time=perf_counter() - t0)
     return path
 
 
-def UCS_old(graph, start, end):
-    visited = []
+def UCS_old(graph, start, end, stats=None):
+    t0 = perf_counter()
+    visited = set()
     frontier = PriorityQueue()
+    expanded = generated = 0
+    peak = 1
 
     # thêm node start vào frontier và visited
     frontier.put((0, start))
-    visited.append(start)
+    visited.add(start)
 
     # start không có node cha
-    parent = dict()
+    parent = _parent_table(graph)
     parent[start] = None
 
     path_found = False
 
     while True:
         if frontier.empty():
+            if stats is not None:
+                stats.add(expanded=expanded, generated=generated, pushes=len(visited), pops=expanded,
+                          peak_frontier=peak, wall_time=perf_counter() - t0)
             raise Exception("No way Exception")
 
         current_w, current_node = frontier.get()
-        visited.append(current_node)
+        expanded += 1
 
         # Kiểm tra current_node có là end hay không
         if current_node == end:
@@ -163,11 +354,14 @@ def UCS_old(graph, start, end):
             break
 
         for nodei in graph[current_node]:
+            generated += 1
             node, weight = nodei
             if node not in visited:
                 frontier.put((current_w + weight, node))
                 parent[node] = current_node
-                visited.append(node)
+                visited.add(node)
+        if len(frontier.elements) > peak:
+            peak = len(frontier.elements)
 
     # Xây dựng đường đi
     path = []
@@ -178,19 +372,34 @@ def UCS_old(graph, start, end):
             end = parent[end]
         path.reverse()
 
+    if stats is not None:
+        stats.add(expanded=expanded, generated=generated, pushes=len(visited), pops=expanded,
+                  peak_frontier=peak, wall_time=perf_counter() - t0)
     return current_w, path
 
 
-def UCS_new(graph, start, goal):
+def UCS_new(graph, start, goal, stats=None, frontier="auto"):
     # graph: dict[node] -> list[(neighbor, weight)]
-    frontier = [(0, start)]          # heap of (cost, node)
+    # frontier: "heap", "bucket" (Dial), "radix" hoặc "auto" (xem make_frontier)
+    t0 = perf_counter()
+    queue = make_frontier(graph, frontier)
+    push, pop = queue.push, queue.pop
+    push(0, start)
     came_from = {start: None}
     cost_so_far = {start: 0}
     explored = set()
+    pops = stale = generated = 0
+    pushes = peak = 1
+    result = float("inf"), []
 
-    while frontier:
-        current_cost, u = heapq.heappop(frontier)
+    while True:
+        try:
+            current_cost, u = pop()
+        except IndexError:
+            break
+        pops += 1
         if u in explored:
+            stale += 1
             continue
         explored.add(u)
 
@@ -202,16 +411,96 @@ def UCS_new(graph, start, goal):
                 path.append(v)
                 v = came_from[v]
             path.reverse()
-            return current_cost, path
+            result = current_cost, path
+            break
 
         for v, w in graph.get(u, []):
+            generated += 1
             if w < 0:
                 raise ValueError("UCS requires nonnegative edge weights")
             new_cost = current_cost + w
             if v not in cost_so_far or new_cost < cost_so_far[v]:
                 cost_so_far[v] = new_cost
                 came_from[v] = u
-                heapq.heappush(frontier, (new_cost, v))
+                push(new_cost, v)
+                pushes += 1
+        # số phần tử trong frontier = pushes - pops, không cần gọi len(queue)
+        if pushes - pops > peak:
+            peak = pushes - pops
+
+    if stats is not None:
+        stats.add(expanded=pops - stale, generated=generated, pushes=pushes, pops=pops, stale=stale,
+                  peak_frontier=peak, wall_time=perf_counter() - t0)
+    # not found: (inf, [])
+    return result
+
+
+def UCS_bidir(graph, start, goal, reverse=None, stats=None):
+    # UCS hai chiều: tìm xuôi từ start trên graph và ngược từ goal trên reverse
+    # (đồ thị đảo chiều, tự tạo nếu không truyền vào).
+    # Dừng khi tổng hai đỉnh heap >= chi phí tốt nhất đã gặp (meet-in-the-middle).
+    if reverse is None:
+        from utils import reverse_graph
+        reverse = reverse_graph(graph)
+    t0 = perf_counter()
+    if start == goal:
+        if stats is not None:
+            stats.add(wall_time=perf_counter() - t0)
+        return 0, [start]
+
+    inf = float("inf")
+    graphs = (graph, reverse)
+    frontier = ([(0, start)], [(0, goal)])
+    cost_so_far = ({start: 0}, {goal: 0})
+    came_from = ({start: None}, {goal: None})
+    explored = (set(), set())
+    best, meet = inf, None
+    pops = stale = generated = 0
+    pushes = peak = 2
+
+    while frontier[0] and frontier[1]:
+        if frontier[0][0][0] + frontier[1][0][0] >= best:
+            break
+        # mở rộng phía có đỉnh heap nhỏ hơn
+        side = 0 if frontier[0][0][0] <= frontier[1][0][0] else 1
+        current_cost, u = heapq.heappop(frontier[side])
+        pops += 1
+        if u in explored[side]:
+            stale += 1
+            continue
+        explored[side].add(u)
+        other_cost = cost_so_far[1 - side]
 
-    # not found
-    return float("inf"), []
+        for v, w in graphs[side].get(u, []):
+            generated += 1
+            if w < 0:
+                raise ValueError("UCS requires nonnegative edge weights")
+            new_cost = current_cost + w
+            if v not in cost_so_far[side] or new_cost < cost_so_far[side][v]:
+                cost_so_far[side][v] = new_cost
+                came_from[side][v] = u
+                heapq.heappush(frontier[side], (new_cost, v))
+                pushes += 1
+            if v in other_cost and new_cost + other_cost[v] < best:
+                best, meet = new_cost + other_cost[v], v
+        if len(frontier[0]) + len(frontier[1]) > peak:
+            peak = len(frontier[0]) + len(frontier[1])
+
+    if stats is not None:
+        stats.add(expanded=pops - stale, generated=generated, pushes=pushes, pops=pops, stale=stale,
+                  peak_frontier=peak, wall_time=perf_counter() - t0)
+    if meet is None:
+        return inf, []
+
+    # nửa đầu: start -> meet, nửa sau: meet -> goal
+    path = []
+    v = meet
+    while v is not None:
+        path.append(v)
+        v = came_from[0][v]
+    path.reverse()
+    v = came_from[1][meet]
+    while v is not None:
+        path.append(v)
+        v = came_from[1][v]
+    return best, path
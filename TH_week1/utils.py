@@ -1,3 +1,7 @@
+import mmap
+import struct
+import sys
+from array import array
 from collections import defaultdict
 from queue import Queue, PriorityQueue
 
@@ -11,33 +15,36 @@ def _next_nonempty_line(f: TextIO) -> str:
             return ln
     raise ValueError("Unexpected end of file while reading.")
 
-def read_txt(file: TextIO):
-    # Dòng 1: N
-    size_line = _next_nonempty_line(file)
-    size = int(size_line)
+# Dạng dòng 1 của từng định dạng text: N (ma trận kề), N M (danh sách cạnh)
+_HEADER_FORMS = {1: "'N'", 2: "'N M'"}
 
-    # Dòng 2: start goal (2 số)
+def _read_header(file: TextIO, formats=(1, 2)):
+    """Dòng 1 (số trường phải thuộc formats) và dòng 2: start goal"""
+    header_line = _next_nonempty_line(file)
+    header = header_line.split()
+    if len(header) not in formats:
+        if len(formats) > 1:
+            raise ValueError(f"Unrecognized graph header: {header_line}")
+        raise ValueError(f"Expected {_HEADER_FORMS[formats[0]]} on line 1, got: {header_line}")
     sg_line = _next_nonempty_line(file)
     sg = sg_line.split()
     if len(sg) != 2:
         raise ValueError(f"Expected two integers 'start goal' on line 2, got: {sg_line}")
     start, goal = map(int, sg)
+    return list(map(int, header)), start, goal
 
-    # Đọc đúng N dòng ma trận (bỏ qua dòng trống)
-    matrix = []
-    while len(matrix) < size:
-        row_line = _next_nonempty_line(file)
-        row = list(map(int, row_line.split()))
-        matrix.append(row)
-
-    # Kiểm tra kích thước
-    if len(matrix) != size:
-        raise ValueError(f"Expected {size} rows, got {len(matrix)}")
-    for i, row in enumerate(matrix):
+def _matrix_rows(file: TextIO, size: int):
+    # Đọc đúng N dòng ma trận (bỏ qua dòng trống), kiểm tra số cột từng dòng
+    for i in range(size):
+        row = list(map(int, _next_nonempty_line(file).split()))
         if len(row) != size:
             raise ValueError(f"Row {i} has {len(row)} cols, expected {size}")
+        yield row
 
-    return size, start, goal, matrix
+def read_txt(file: TextIO):
+    header, start, goal = _read_header(file, formats=(1,))
+    size = header[0]
+    return size, start, goal, list(_matrix_rows(file, size))
 
 
 
@@ -57,3 +64,257 @@ def convert_graph_weight(a):
             if a[i][j] != 0:
                 adjList[i].append((j, a[i][j]))
     return adjList
+
+# đảo chiều danh sách kề (dùng cho tìm kiếm ngược từ goal)
+def reverse_graph(graph):
+    if isinstance(graph, CSRGraph):
+        return graph.reversed()
+    rev = defaultdict(list)
+    for u, nbrs in list(graph.items()):
+        for item in nbrs:
+            if isinstance(item, tuple):
+                v, w = item
+                rev[v].append((u, w))
+            else:
+                rev[item].append(u)
+    return rev
+
+
+# -----------------------------
+# Đồ thị thưa dạng CSR (Compressed Sparse Row)
+# -----------------------------
+class CSRGraph:
+    """
+    Danh sách kề nén: các cạnh đi ra từ u nằm ở vị trí offsets[u]..offsets[u+1]
+    trong neighbors (và weights nếu đồ thị có trọng số).
+    Hỗ trợ graph[u] và graph.get(u, []) giống dict danh sách kề, nên BFS, DFS,
+    UCS_old, UCS_new chạy trực tiếp mà không cần chuyển sang dict.
+    """
+    def __init__(self, num_nodes, offsets, neighbors, weights=None):
+        if len(offsets) != num_nodes + 1:
+            raise ValueError(f"Expected {num_nodes + 1} offsets, got {len(offsets)}")
+        if weights is not None and len(weights) != len(neighbors):
+            raise ValueError("neighbors and weights must have the same length")
+        self.num_nodes = num_nodes
+        self.offsets = offsets
+        self.neighbors = neighbors
+        self.weights = weights
+
+    @property
+    def weighted(self):
+        return self.weights is not None
+
+    @property
+    def num_edges(self):
+        return len(self.neighbors)
+
+    def __len__(self):
+        return self.num_nodes
+
+    def __contains__(self, u):
+        return isinstance(u, int) and 0 <= u < self.num_nodes
+
+    def __getitem__(self, u):
+        """Đồ thị không trọng số trả về các đỉnh kề, có trọng số trả về các cặp (đỉnh kề, trọng số)"""
+        lo, hi = self.offsets[u], self.offsets[u + 1]
+        if self.weights is None:
+            return self.neighbors[lo:hi]
+        return zip(self.neighbors[lo:hi], self.weights[lo:hi])
+
+    def get(self, u, default=None):
+        if u not in self:
+            return default
+        return self[u]
+
+    def weight_bound(self):
+        """Trọng số lớn nhất nếu mọi trọng số >= 0, ngược lại None; tính một lần rồi giữ lại"""
+        if not hasattr(self, "_weight_bound"):
+            w = self.weights
+            if w is None or (len(w) and min(w) < 0):
+                self._weight_bound = None
+            else:
+                self._weight_bound = max(w) if len(w) else 0
+        return self._weight_bound
+
+    def reversed(self):
+        """Đồ thị ngược: mỗi cạnh u -> v thành v -> u (counting sort theo v)"""
+        n, m = self.num_nodes, len(self.neighbors)
+        offsets = array("q", bytes(8 * (n + 1)))
+        for v in self.neighbors:
+            offsets[v + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+        pos = array("q", offsets[:-1])
+        neighbors = array("i", bytes(4 * m))
+        weights = array("q", bytes(8 * m)) if self.weighted else None
+        for u in range(n):
+            for k in range(self.offsets[u], self.offsets[u + 1]):
+                v = self.neighbors[k]
+                p = pos[v]
+                neighbors[p] = u
+                if weights is not None:
+                    weights[p] = self.weights[k]
+                pos[v] = p + 1
+        return CSRGraph(n, offsets, neighbors, weights)
+
+
+def _read_matrix_rows(file: TextIO, size: int, weighted: bool) -> CSRGraph:
+    offsets = array("q", [0])
+    neighbors = array("i")
+    weights = array("q") if weighted else None
+    for row in _matrix_rows(file, size):
+        if weighted:
+            for j, w in enumerate(row):
+                if w != 0:
+                    neighbors.append(j)
+                    weights.append(w)
+        else:
+            neighbors.extend([j for j, w in enumerate(row) if w == 1])
+        offsets.append(len(neighbors))
+    return CSRGraph(size, offsets, neighbors, weights)
+
+def _read_edges(file: TextIO, size: int, m: int, weighted: bool) -> CSRGraph:
+    src = array("i")
+    dst = array("i")
+    wts = array("q")
+    for _ in range(m):
+        parts = _next_nonempty_line(file).split()
+        if len(parts) not in (2, 3):
+            raise ValueError(f"Expected 'u v [w]', got: {' '.join(parts)}")
+        u, v = int(parts[0]), int(parts[1])
+        if not (0 <= u < size and 0 <= v < size):
+            raise ValueError(f"Edge ({u}, {v}) out of range for N={size}")
+        src.append(u)
+        dst.append(v)
+        wts.append(int(parts[2]) if len(parts) == 3 else 1)
+
+    # counting sort theo đỉnh nguồn
+    offsets = array("q", bytes(8 * (size + 1)))
+    for u in src:
+        offsets[u + 1] += 1
+    for i in range(size):
+        offsets[i + 1] += offsets[i]
+
+    pos = array("q", offsets[:-1])
+    neighbors = array("i", bytes(4 * m))
+    weights = array("q", bytes(8 * m)) if weighted else None
+    for k in range(m):
+        u = src[k]
+        p = pos[u]
+        neighbors[p] = dst[k]
+        if weighted:
+            weights[p] = wts[k]
+        pos[u] = p + 1
+    return CSRGraph(size, offsets, neighbors, weights)
+
+def _read_csr(file: TextIO, weighted: bool, formats):
+    header, start, goal = _read_header(file, formats)
+    size = header[0]
+    if len(header) == 1:
+        graph = _read_matrix_rows(file, size, weighted)
+    else:
+        graph = _read_edges(file, size, header[1], weighted)
+    return size, start, goal, graph
+
+def read_csr(file: TextIO, weighted: bool = False):
+    """
+    Đọc file ma trận kề (cùng định dạng với read_txt) từng dòng một và xây CSRGraph,
+    không bao giờ giữ cả ma trận N×N trong bộ nhớ.
+    Không trọng số: ô bằng 1 là cạnh (như convert_graph); có trọng số: ô khác 0 (như convert_graph_weight).
+    """
+    return _read_csr(file, weighted, formats=(1,))
+
+def read_edge_list(file: TextIO, weighted: bool = False):
+    """
+    Đọc đồ thị dạng danh sách cạnh:
+      - Dòng 1: N M (số đỉnh, số cạnh)
+      - Dòng 2: start goal
+      - M dòng tiếp theo: u v [w] (cạnh có hướng u -> v, w mặc định là 1)
+    Các cạnh được xếp theo đỉnh nguồn bằng counting sort, giữ nguyên thứ tự trong file.
+    """
+    return _read_csr(file, weighted, formats=(2,))
+
+def read_graph(file: TextIO, weighted: bool = False):
+    """
+    Đọc đồ thị CSR, tự nhận dạng định dạng theo dòng đầu:
+    một số (N) là ma trận kề, hai số (N M) là danh sách cạnh.
+    """
+    return _read_csr(file, weighted, formats=(1, 2))
+
+
+# -----------------------------
+# File nhị phân (đã biên dịch) để nạp tức thì bằng mmap
+# -----------------------------
+# Bố cục (little-endian):
+#   header: magic(8) version(u32) flags(u32) N(i64) M(i64) start(i64) goal(i64)
+#   offsets: i64[N+1] | neighbors: i32[M] (đệm tới bội 8) | weights: i64[M] nếu flags có BIN_WEIGHTED
+BIN_MAGIC = b"NMAICSR\0"
+BIN_VERSION = 1
+BIN_WEIGHTED = 1
+_BIN_HEADER = struct.Struct("<8sIIqqqq")
+
+def _pad8(n):
+    return (n + 7) & ~7
+
+def write_binary(path, size, start, goal, graph: CSRGraph):
+    """Ghi CSRGraph ra file nhị phân có phiên bản, dùng cho read_binary"""
+    if sys.byteorder != "little":
+        raise ValueError("Binary graph format requires a little-endian machine")
+    offsets = array("q", graph.offsets)
+    neighbors = array("i", graph.neighbors)
+    flags = BIN_WEIGHTED if graph.weighted else 0
+    with open(path, "wb") as f:
+        f.write(_BIN_HEADER.pack(BIN_MAGIC, BIN_VERSION, flags, size, len(neighbors), start, goal))
+        f.write(offsets.tobytes())
+        data = neighbors.tobytes()
+        f.write(data + bytes(_pad8(len(data)) - len(data)))
+        if graph.weighted:
+            f.write(array("q", graph.weights).tobytes())
+
+def is_binary_graph(path) -> bool:
+    with open(path, "rb") as f:
+        return f.read(len(BIN_MAGIC)) == BIN_MAGIC
+
+def read_binary(path, weighted=None):
+    """
+    Mở file nhị phân bằng mmap. offsets/neighbors/weights là memoryview trỏ thẳng vào
+    vùng nhớ được ánh xạ (zero-copy), nên thời gian nạp gần như không phụ thuộc kích thước đồ thị.
+    weighted (nếu khác None) phải khớp với cờ trong header: ma trận không trọng số chỉ lấy
+    ô bằng 1 làm cạnh, nên không thể suy ra nó từ file đã biên dịch có trọng số và ngược lại.
+    """
+    if sys.byteorder != "little":
+        raise ValueError("Binary graph format requires a little-endian machine")
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    buf = memoryview(mm)
+    magic, version, flags, size, m, start, goal = _BIN_HEADER.unpack_from(buf, 0)
+    if magic != BIN_MAGIC:
+        raise ValueError(f"{path} is not a compiled graph file")
+    if version != BIN_VERSION:
+        raise ValueError(f"Unsupported graph file version {version}, expected {BIN_VERSION}")
+    if weighted is not None and bool(flags & BIN_WEIGHTED) != weighted:
+        raise ValueError(f"{path} was compiled {'without' if weighted else 'with'} --weighted but is loaded as "
+                         f"{'weighted' if weighted else 'unweighted'}; compile it again "
+                         f"{'with' if weighted else 'without'} --weighted")
+
+    pos = _BIN_HEADER.size
+    offsets = buf[pos:pos + 8 * (size + 1)].cast("q")
+    pos += 8 * (size + 1)
+    neighbors = buf[pos:pos + 4 * m].cast("i")
+    pos += _pad8(4 * m)
+    weights = buf[pos:pos + 8 * m].cast("q") if flags & BIN_WEIGHTED else None
+    return size, start, goal, CSRGraph(size, offsets, neighbors, weights)
+
+def load_graph_file(path, weighted: bool = False):
+    """Nạp đồ thị từ file nhị phân (nếu có magic) hoặc file text (ma trận kề / danh sách cạnh)"""
+    if is_binary_graph(path):
+        return read_binary(path, weighted)
+    with open(path, "r") as f:
+        return read_graph(f, weighted)
+
+def compile_graph(src, dst, weighted: bool = False):
+    """Chuyển file text sang file nhị phân"""
+    with open(src, "r") as f:
+        size, start, goal, graph = read_graph(f, weighted)
+    write_binary(dst, size, start, goal, graph)
+    return size, graph.num_edges
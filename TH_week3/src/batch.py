@@ -0,0 +1,178 @@
+from __future__ import annotations
+import csv
+import io
+import json
+import math
+import multiprocessing as mp
+import sys
+import time
+from collections import defaultdict
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from graph import RoadGraph
+from search import greedy_best_first, dijkstra_tree, tree_path
+
+Query = Tuple[str, str]
+Result = Dict[str, object]
+
+# --algo values batch mode can answer. astar and ucs share one Dijkstra
+# (uniform-cost) tree per start city; ch, the bidirectional searches and ALT
+# bounds have no batch path.
+ALGOS = ("astar", "gbfs", "ucs")
+
+def read_queries(stream: TextIO) -> Iterator[Query]:
+    """One query per line: ``start goal`` (whitespace or comma separated)."""
+    for line in stream:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        parts = line.replace(",", " ").split()
+        if len(parts) != 2:
+            raise ValueError(f"expected 'start goal', got: {line}")
+        yield parts[0], parts[1]
+
+def _result(start: str, goal: str, path: List[str], cost: float) -> Result:
+    return {"start": start, "goal": goal, "cost": cost if math.isfinite(cost) else None, "path": path}
+
+def _error(start: str, goal: str, message: str) -> Result:
+    return {"start": start, "goal": goal, "cost": None, "path": [], "error": message}
+
+def solve_chunk(G: RoadGraph, H: Dict[str, float], chunk: List[Query], algo: str) -> List[Result]:
+    """Answer a chunk of queries, returning results in input order.
+
+    For ``astar`` and ``ucs`` the queries are grouped by start city and a
+    single Dijkstra tree (stopped once all of that start's goals are settled)
+    serves the whole group; the costs are optimal, so they match A* with an
+    admissible heuristic. ``gbfs`` has no tree equivalent and runs once per
+    query.
+    """
+    if algo not in ALGOS:
+        raise ValueError(f"--algo {algo} is not supported in batch mode (choose from {', '.join(ALGOS)})")
+    out: List[Optional[Result]] = [None] * len(chunk)
+    if algo == "gbfs":
+        for i, (s, t) in enumerate(chunk):
+            if s not in G or t not in G:
+                out[i] = _error(s, t, "start or goal not in graph")
+                continue
+            path, cost, _ = greedy_best_first(G, s, t, H)
+            out[i] = _result(s, t, path, cost)
+        return out
+
+    by_source: Dict[str, List[int]] = defaultdict(list)
+    for i, (s, _) in enumerate(chunk):
+        by_source[s].append(i)
+    for s, idxs in by_source.items():
+        if s not in G:
+            for i in idxs:
+                out[i] = _error(s, chunk[i][1], "start or goal not in graph")
+            continue
+        tree = dijkstra_tree(G, s, (chunk[i][1] for i in idxs))
+        for i in idxs:
+            t = chunk[i][1]
+            if t not in G:
+                out[i] = _error(s, t, "start or goal not in graph")
+                continue
+            path, cost = tree_path(G, tree, t)
+            out[i] = _result(s, t, path, cost)
+    return out
+
+FORMATS = ("jsonl", "csv")
+CSV_HEADER = "start,goal,cost,path,error\n"
+
+def render(results: Iterable[Result], fmt: str) -> List[str]:
+    """Turn results into output lines (each ending in a newline)."""
+    if fmt == "jsonl":
+        return [json.dumps(r) + "\n" for r in results]
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    lines = []
+    for r in results:
+        writer.writerow([r["start"], r["goal"], "" if r["cost"] is None else r["cost"],
+                         " ".join(r["path"]), r.get("error", "")])
+        lines.append(buf.getvalue())
+        buf.seek(0)
+        buf.truncate()
+    return lines
+
+# Graph and heuristic seen by pool workers. With the fork start method they are
+# inherited from the parent; otherwise each worker receives them once via the
+# pool initializer, never per task.
+_WORKER_STATE: Optional[Tuple[RoadGraph, Dict[str, float]]] = None
+
+def _init_worker(state: Optional[Tuple[RoadGraph, Dict[str, float]]]) -> None:
+    global _WORKER_STATE
+    if state is not None:
+        _WORKER_STATE = state
+
+def _solve_task(task: Tuple[List[Query], str, str]) -> List[str]:
+    G, H = _WORKER_STATE
+    chunk, algo, fmt = task
+    return render(solve_chunk(G, H, chunk, algo), fmt)
+
+class ParallelSolver:
+    """Process pool that answers chunks of queries, preserving input order.
+
+    Each chunk is sorted by start city and cut into tasks of ``task_size``
+    queries, so one task usually covers whole start groups and IPC is
+    amortized over many queries. Workers also render the output lines, so
+    only strings travel back to the parent.
+    """
+
+    def __init__(self, G: RoadGraph, H: Dict[str, float], workers: int, task_size: int = 2_000) -> None:
+        global _WORKER_STATE
+        self.task_size = task_size
+        if "fork" in mp.get_all_start_methods():
+            _WORKER_STATE = (G, H)
+            self.pool = mp.get_context("fork").Pool(workers, _init_worker, (None,))
+        else:
+            self.pool = mp.Pool(workers, _init_worker, ((G, H),))
+
+    def solve(self, chunk: List[Query], algo: str, fmt: str) -> List[str]:
+        order = sorted(range(len(chunk)), key=lambda i: chunk[i][0])
+        slices = [order[k:k + self.task_size] for k in range(0, len(order), self.task_size)]
+        tasks = [([chunk[i] for i in idxs], algo, fmt) for idxs in slices]
+        out: List[Optional[str]] = [None] * len(chunk)
+        for idxs, results in zip(slices, self.pool.imap(_solve_task, tasks)):
+            for i, r in zip(idxs, results):
+                out[i] = r
+        return out
+
+    def close(self) -> None:
+        self.pool.close()
+        self.pool.join()
+
+def run_batch(G: RoadGraph, H: Dict[str, float], queries: Iterable[Query], algo: str,
+              out: TextIO, fmt: str = "jsonl", chunk_size: int = 100_000,
+              workers: int = 1) -> Tuple[int, float]:
+    """Stream results for queries to out chunk by chunk; returns (count, seconds).
+
+    With workers > 1 each chunk is solved by a ParallelSolver process pool.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown format {fmt}")
+    if algo not in ALGOS:
+        raise ValueError(f"--algo {algo} is not supported in batch mode (choose from {', '.join(ALGOS)})")
+    if fmt == "csv":
+        out.write(CSV_HEADER)
+    it = iter(queries)
+    count = 0
+    t0 = time.perf_counter()
+    solver = ParallelSolver(G, H, workers) if workers > 1 else None
+    try:
+        while True:
+            chunk = list(islice(it, chunk_size))
+            if not chunk:
+                break
+            if solver is None:
+                out.writelines(render(solve_chunk(G, H, chunk, algo), fmt))
+            else:
+                out.writelines(solver.solve(chunk, algo, fmt))
+            count += len(chunk)
+    finally:
+        if solver is not None:
+            solver.close()
+    return count, time.perf_counter() - t0
+
+def report_throughput(count: int, seconds: float, stream: TextIO = sys.stderr) -> None:
+    qps = count / seconds if seconds > 0 else float("inf")
+    print(f"{count} queries in {seconds:.3f}s ({qps:,.0f} queries/s)", file=stream)
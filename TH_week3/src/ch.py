@@ -0,0 +1,245 @@
+from __future__ import annotations
+import heapq
+import struct
+import sys
+from array import array
+from typing import Dict, List, Sequence, Tuple
+from graph import RoadGraph
+
+# Contraction Hierarchies.
+#
+# Nodes are contracted one by one in order of importance; contracting v adds a
+# shortcut u-x (remembering v as its middle node) whenever u-v-x is the only
+# shortest route between two remaining neighbors. Every edge then points from
+# the lower-ranked to the higher-ranked endpoint, and a query is two Dijkstra
+# searches that only climb the hierarchy.
+#
+# File layout (little-endian):
+#   header: magic(8) version(u32) n(u32) m(u32) names_len(u32)
+#   names: utf-8 joined by "\n", padded to 8 | rank: i32[n], padded to 8
+#   offsets: i64[n+1] | target: i32[m], padded | middle: i32[m] (-1 = original road), padded
+#   weight: f64[m]
+CH_MAGIC = b"NMAICH\0\0"
+CH_VERSION = 1
+_HEADER = struct.Struct("<8sIIII")
+
+UpEdge = Tuple[int, float, int]  # (higher-ranked neighbor, weight, middle node or -1)
+
+def _pad8(n: int) -> int:
+    return (n + 7) & ~7
+
+def _witness_search(adj: List[Dict[int, Tuple[float, int]]], source: int, skip: int,
+                    max_dist: float, settle_limit: int) -> Dict[int, float]:
+    """Bounded Dijkstra from source in the remaining graph, ignoring skip."""
+    dist = {source: 0.0}
+    heap = [(0.0, source)]
+    settled = 0
+    while heap and settled < settle_limit:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        if d > max_dist:
+            break
+        settled += 1
+        for v, (w, _) in adj[u].items():
+            if v == skip:
+                continue
+            nd = d + w
+            if nd < dist.get(v, float("inf")):
+                dist[v] = nd
+                heapq.heappush(heap, (nd, v))
+    return dist
+
+def _shortcuts(adj: List[Dict[int, Tuple[float, int]]], v: int,
+               settle_limit: int) -> List[Tuple[int, int, float]]:
+    """Shortcuts (u, x, weight) needed if v were contracted now."""
+    nbrs = list(adj[v].items())
+    out = []
+    for i, (u, (wu, _)) in enumerate(nbrs):
+        rest = nbrs[i + 1:]
+        if not rest:
+            break
+        max_dist = wu + max(wx for _, (wx, _) in rest)
+        dist = _witness_search(adj, u, v, max_dist, settle_limit)
+        for x, (wx, _) in rest:
+            via = wu + wx
+            if dist.get(x, float("inf")) > via:
+                out.append((u, x, via))
+    return out
+
+class ContractionHierarchy:
+    def __init__(self, names: Sequence[str], rank: Sequence[int], up: Sequence[Sequence[UpEdge]]) -> None:
+        self.names = list(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.rank = list(rank)
+        self.up: List[Tuple[UpEdge, ...]] = [tuple(e) for e in up]
+
+    @classmethod
+    def build(cls, G: RoadGraph, settle_limit: int = 60) -> "ContractionHierarchy":
+        n = len(G)
+        adj: List[Dict[int, Tuple[float, int]]] = [{v: (w, -1) for v, w in row} for row in G.adj]
+        deleted = [0] * n
+        rank = [-1] * n
+        up: List[List[UpEdge]] = [[] for _ in range(n)]
+
+        def priority(v: int) -> int:
+            # edge difference plus contracted neighbors, which keeps the order spatially uniform
+            return len(_shortcuts(adj, v, settle_limit)) - len(adj[v]) + deleted[v]
+
+        heap = [(priority(v), v) for v in range(n)]
+        heapq.heapify(heap)
+        order = 0
+        while heap:
+            _, v = heapq.heappop(heap)
+            if rank[v] != -1:
+                continue
+            # Lazy update: re-evaluate and defer if v is no longer the cheapest.
+            p = priority(v)
+            if heap and p > heap[0][0]:
+                heapq.heappush(heap, (p, v))
+                continue
+            rank[v] = order
+            order += 1
+            up[v] = [(x, w, m) for x, (w, m) in adj[v].items()]
+            for u, x, via in _shortcuts(adj, v, settle_limit):
+                if via < adj[u].get(x, (float("inf"), -1))[0]:
+                    adj[u][x] = (via, v)
+                    adj[x][u] = (via, v)
+            for x in adj[v]:
+                del adj[x][v]
+                deleted[x] += 1
+            adj[v] = {}
+        return cls(G.names, rank, up)
+
+    def _edge(self, a: int, b: int) -> UpEdge:
+        lo, hi = (a, b) if self.rank[a] < self.rank[b] else (b, a)
+        for e in self.up[lo]:
+            if e[0] == hi:
+                return e
+        raise KeyError(f"no hierarchy edge {a} - {b}")
+
+    def _unpack(self, a: int, b: int, out: List[int]) -> None:
+        # Appends the original-road route from a to b, excluding a itself.
+        stack = [(a, b)]
+        while stack:
+            a, b = stack.pop()
+            m = self._edge(a, b)[2]
+            if m == -1:
+                out.append(b)
+            else:
+                stack.append((m, b))
+                stack.append((a, m))
+
+    def query(self, start: str, goal: str) -> Tuple[List[str], float, int]:
+        """Bidirectional upward Dijkstra; returns (path, cost, settled nodes)."""
+        if start not in self.index or goal not in self.index:
+            raise ValueError("start or goal not in graph")
+        inf = float("inf")
+        s, t = self.index[start], self.index[goal]
+        up = self.up
+        dist = ({s: 0.0}, {t: 0.0})
+        parent: Tuple[Dict[int, int], Dict[int, int]] = ({s: -1}, {t: -1})
+        heaps = ([(0.0, s)], [(0.0, t)])
+        done = (set(), set())
+        best, meet = (0.0, s) if s == t else (inf, -1)
+        settled = 0
+        side = 0
+        while heaps[0] or heaps[1]:
+            if not heaps[side]:
+                side ^= 1
+            heap, d_here, d_there = heaps[side], dist[side], dist[side ^ 1]
+            d, u = heapq.heappop(heap)
+            if d >= best:
+                # Nothing cheaper can come from this direction any more.
+                heap.clear()
+                side ^= 1
+                continue
+            if u in done[side]:
+                continue
+            done[side].add(u)
+            settled += 1
+            if u in d_there and d + d_there[u] < best:
+                best, meet = d + d_there[u], u
+            # Stall-on-demand: the graph is undirected, so up[u] also lists the
+            # higher nodes that lead down into u. If one of them already reaches
+            # u more cheaply, u is not on a shortest path and need not be relaxed.
+            if any(d_here.get(v, inf) + w < d for v, w, _ in up[u]):
+                side ^= 1
+                continue
+            for v, w, _ in up[u]:
+                nd = d + w
+                if nd < d_here.get(v, inf):
+                    d_here[v] = nd
+                    parent[side][v] = u
+                    heapq.heappush(heap, (nd, v))
+            side ^= 1
+        if meet == -1:
+            return [], inf, settled
+
+        fwd = []
+        u = meet
+        while u != -1:
+            fwd.append(u)
+            u = parent[0][u]
+        fwd.reverse()
+        bwd = []
+        u = parent[1][meet]
+        while u != -1:
+            bwd.append(u)
+            u = parent[1][u]
+        hops = fwd + bwd
+        route = [hops[0]]
+        for a, b in zip(hops, hops[1:]):
+            self._unpack(a, b, route)
+        return [self.names[v] for v in route], best, settled
+
+    def num_shortcuts(self) -> int:
+        return sum(1 for row in self.up for e in row if e[2] != -1)
+
+    def save(self, path: str) -> None:
+        if sys.byteorder != "little":
+            raise ValueError("CH file format requires a little-endian machine")
+        offsets = array("q", [0])
+        target, middle, weight = array("i"), array("i"), array("d")
+        for row in self.up:
+            for x, w, m in row:
+                target.append(x)
+                weight.append(w)
+                middle.append(m)
+            offsets.append(len(target))
+        name_bytes = "\n".join(self.names).encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(CH_MAGIC, CH_VERSION, len(self.names), len(target), len(name_bytes)))
+            for chunk in (name_bytes, array("i", self.rank).tobytes(), offsets.tobytes(),
+                          target.tobytes(), middle.tobytes()):
+                f.write(chunk + bytes(_pad8(len(chunk)) - len(chunk)))
+            f.write(weight.tobytes())
+
+    @classmethod
+    def load(cls, path: str) -> "ContractionHierarchy":
+        if sys.byteorder != "little":
+            raise ValueError("CH file format requires a little-endian machine")
+        with open(path, "rb") as f:
+            buf = f.read()
+        magic, version, n, m, names_len = _HEADER.unpack_from(buf, 0)
+        if magic != CH_MAGIC:
+            raise ValueError(f"{path} is not a contraction hierarchy file")
+        if version != CH_VERSION:
+            raise ValueError(f"Unsupported CH file version {version}, expected {CH_VERSION}")
+        off = _HEADER.size
+
+        def take(typecode: str, count: int, size: int) -> array:
+            nonlocal off
+            a = array(typecode, buf[off:off + size * count])
+            off += _pad8(size * count)
+            return a
+
+        names = buf[off:off + names_len].decode("utf-8").split("\n") if n else []
+        off += _pad8(names_len)
+        rank = take("i", n, 4)
+        offsets = take("q", n + 1, 8)
+        target = take("i", m, 4)
+        middle = take("i", m, 4)
+        weight = take("d", m, 8)
+        up = [[(target[k], weight[k], middle[k]) for k in range(offsets[u], offsets[u + 1])] for u in range(n)]
+        return cls(names, rank, up)
@@ -1,37 +1,154 @@
 from __future__ import annotations
-from typing import Dict, Tuple
-import networkx as nx
+import math
+import mmap
+import struct
+import sys
+from array import array
+from typing import Dict, Iterator, List, Mapping, Sequence, Tuple, Union
+from graph import RoadGraph
 
-def load_heuristic(path: str) -> Dict[str, float]:
-    h: Dict[str, float] = {}
+# File nhị phân gộp cả ba tệp dữ liệu, mở bằng mmap.
+# Bố cục (little-endian):
+#   header: magic(8) version(u32) n_cities(u32) n_arcs(u32) names_len(u32)
+#   names: utf-8, ngăn bởi "\n", đệm tới bội 8
+#   offsets: i32[n_cities + 1] | nbr: i32[n_arcs] (mỗi mảng đệm tới bội 8) | weight: f64[n_arcs]
+#   pos: f64[2 * n_cities] | heuristic: f64[n_cities]  (NaN = không có dữ liệu)
+# Danh sách kề lưu dạng CSR, mỗi cạnh hai chiều, mỗi hàng sắp theo id, nên
+# RoadGraph đọc thẳng từ memoryview mà không phải dựng lại.
+BIN_MAGIC = b"NMAIROAD"
+BIN_VERSION = 2
+_HEADER = struct.Struct("<8sIIII")
+
+def _pad8(n: int) -> int:
+    return (n + 7) & ~7
+
+def _read_lines(path: str):
     with open(path, encoding="utf-8") as f:
         for line in f:
             line = line.strip()
             if not line or line.startswith("#"):
                 continue
-            city, val = line.split()
-            h[city] = float(val)
+            yield line.split()
+
+def is_compiled(path: str) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(BIN_MAGIC)) == BIN_MAGIC
+    except (IsADirectoryError, FileNotFoundError):
+        return False
+
+def load_heuristic(path: str) -> Mapping[str, float]:
+    if is_compiled(path):
+        return load_compiled(path)["heuristic"]
+    h: Dict[str, float] = {}
+    for city, val in _read_lines(path):
+        h[city] = float(val)
     return h
 
-def load_positions(path: str) -> Dict[str, Tuple[float, float]]:
+def load_positions(path: str) -> Mapping[str, Tuple[float, float]]:
+    if is_compiled(path):
+        return load_compiled(path)["positions"]
     pos = {}
-    with open(path, encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-            city, x, y = line.split()
-            pos[city] = (float(x), float(y))
+    for city, x, y in _read_lines(path):
+        pos[city] = (float(x), float(y))
     return pos
 
-def load_graph(path: str) -> nx.Graph:
-    G = nx.Graph()
-    with open(path, encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-            a, b, w = line.split()
-            w = float(w)
-            G.add_edge(a, b, weight=w)
-    return G
+def load_graph(path: str) -> RoadGraph:
+    if is_compiled(path):
+        return load_compiled(path)["graph"]
+    return RoadGraph.from_edges((a, b, float(w)) for a, b, w in _read_lines(path))
+
+def compile_data(data_dir: str, out_path: str) -> Tuple[int, int]:
+    """Đọc heuristic.txt, cities.txt, citiesGraph.txt và ghi thành một file nhị phân."""
+    if sys.byteorder != "little":
+        raise ValueError("Compiled data format requires a little-endian machine")
+    h = load_heuristic(f"{data_dir}/heuristic.txt")
+    pos = load_positions(f"{data_dir}/cities.txt")
+    edges = list(_read_lines(f"{data_dir}/citiesGraph.txt"))
+
+    names = sorted(set(h) | set(pos) | {a for a, _, _ in edges} | {b for _, b, _ in edges})
+    index = {name: i for i, name in enumerate(names)}
+    n = len(names)
+
+    src = array("i", (index[a] for a, _, _ in edges))
+    dst = array("i", (index[b] for _, b, _ in edges))
+    weight = array("d", (float(w) for _, _, w in edges))
+    # bỏ cạnh lặp và khuyên giống load_graph, rồi trải thành CSR
+    G = RoadGraph.from_arrays(names, src, dst, weight)
+    offsets, nbr, nbr_w = G.to_csr()
+    xy = array("d", [math.nan] * (2 * n))
+    for city, (x, y) in pos.items():
+        xy[2 * index[city]] = x
+        xy[2 * index[city] + 1] = y
+    hv = array("d", [math.nan] * n)
+    for city, val in h.items():
+        hv[index[city]] = val
+
+    name_bytes = "\n".join(names).encode("utf-8")
+    with open(out_path, "wb") as f:
+        f.write(_HEADER.pack(BIN_MAGIC, BIN_VERSION, n, len(nbr), len(name_bytes)))
+        for chunk in (name_bytes, offsets.tobytes(), nbr.tobytes()):
+            f.write(chunk + bytes(_pad8(len(chunk)) - len(chunk)))
+        f.write(nbr_w.tobytes())
+        f.write(xy.tobytes())
+        f.write(hv.tobytes())
+    return n, G.number_of_edges()
+
+def open_compiled(path: str) -> dict:
+    """Ánh xạ file nhị phân vào bộ nhớ; các mảng trả về là memoryview zero-copy."""
+    if sys.byteorder != "little":
+        raise ValueError("Compiled data format requires a little-endian machine")
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    buf = memoryview(mm)
+    magic, version, n, m, names_len = _HEADER.unpack_from(buf, 0)
+    if magic != BIN_MAGIC:
+        raise ValueError(f"{path} is not a compiled data file")
+    if version != BIN_VERSION:
+        raise ValueError(f"Unsupported data file version {version}, expected {BIN_VERSION}")
+
+    off = _HEADER.size
+    names: List[str] = bytes(buf[off:off + names_len]).decode("utf-8").split("\n") if n else []
+    off += _pad8(names_len)
+    offsets = buf[off:off + 4 * (n + 1)].cast("i")
+    off += _pad8(4 * (n + 1))
+    nbr = buf[off:off + 4 * m].cast("i")
+    off += _pad8(4 * m)
+    weight = buf[off:off + 8 * m].cast("d")
+    off += 8 * m
+    xy = buf[off:off + 16 * n].cast("d")
+    off += 16 * n
+    hv = buf[off:off + 8 * n].cast("d")
+    return {"names": names, "offsets": offsets, "nbr": nbr, "weight": weight, "xy": xy, "h": hv}
+
+class NodeValues(Mapping):
+    """Read-only view name -> value over a per-node array of a compiled file.
+
+    Each node has ``width`` values (1 for the heuristic, 2 for x, y); NaN
+    marks a city with no data. Lookups go through the graph's name index, so
+    nothing is built when the file is loaded.
+    """
+
+    def __init__(self, index: Dict[str, int], values: Sequence[float], width: int = 1) -> None:
+        self.index, self.values, self.width = index, values, width
+
+    def __getitem__(self, name: str) -> Union[float, Tuple[float, ...]]:
+        i = self.index[name] * self.width
+        if math.isnan(self.values[i]):
+            raise KeyError(name)
+        return self.values[i] if self.width == 1 else tuple(self.values[i:i + self.width])
+
+    def __iter__(self) -> Iterator[str]:
+        values, width = self.values, self.width
+        return (name for name, i in self.index.items() if not math.isnan(values[i * width]))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __reduce__(self):
+        return NodeValues, (self.index, array("d", self.values), self.width)
+
+def load_compiled(path: str) -> dict:
+    raw = open_compiled(path)
+    G = RoadGraph.from_csr(raw["names"], raw["offsets"], raw["nbr"], raw["weight"])
+    return {"graph": G, "positions": NodeValues(G.index, raw["xy"], 2), "heuristic": NodeValues(G.index, raw["h"])}
@@ -0,0 +1,151 @@
+from __future__ import annotations
+from array import array
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+Adj = Tuple[Tuple[int, float], ...]
+
+class CSRAdj(dict):
+    """``adj`` read straight from CSR arrays (e.g. memoryviews of a compiled file).
+
+    Row ``u`` is ``nbr[offsets[u]:offsets[u + 1]]`` with the matching weights,
+    already sorted by neighbor id. Rows are turned into ``Adj`` tuples on first
+    access (``__missing__``) and kept, so loading does no per-edge work, a
+    search only pays for the nodes it expands, and later lookups are plain
+    dict hits. Length and iteration follow node ids, like a list of rows.
+    """
+
+    def __init__(self, offsets: Sequence[int], nbr: Sequence[int], weight: Sequence[float]) -> None:
+        super().__init__()
+        if len(nbr) != len(weight) or not offsets or offsets[-1] != len(nbr):
+            raise ValueError("offsets, nbr and weight do not describe one CSR graph")
+        self.offsets, self.nbr, self.weight = offsets, nbr, weight
+
+    def __missing__(self, u: int) -> Adj:
+        if not 0 <= u < len(self):
+            raise IndexError(u)
+        a, b = self.offsets[u], self.offsets[u + 1]
+        row = self[u] = tuple(zip(self.nbr[a:b], self.weight[a:b]))
+        return row
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __iter__(self) -> Iterator[Adj]:
+        return (self[u] for u in range(len(self)))
+
+    def __reduce__(self):
+        # memoryviews cannot be pickled (spawned batch workers); ship copies
+        return CSRAdj, (array("i", self.offsets), array("i", self.nbr), array("d", self.weight))
+
+class RoadGraph:
+    """Undirected weighted graph over interned city names.
+
+    Cities get integer ids in sorted-name order, so comparing ids orders
+    cities the same way as comparing names. ``adj[u]`` is a precomputed tuple
+    of ``(neighbor_id, weight)`` sorted by neighbor id, or a ``CSRAdj`` that
+    builds those tuples on demand.
+    """
+
+    def __init__(self, names: Sequence[str], adj: Sequence[Adj]) -> None:
+        if len(names) != len(adj):
+            raise ValueError("names and adj must have the same length")
+        self.names: List[str] = list(names)
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        self.adj: Sequence[Adj] = adj if isinstance(adj, CSRAdj) else list(adj)
+        self._heuristic_cache: Optional[Tuple[Dict[str, float], List[float]]] = None
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[Tuple[str, str, float]]) -> "RoadGraph":
+        edges = list(edges)
+        names = sorted({a for a, _, _ in edges} | {b for _, b, _ in edges})
+        index = {name: i for i, name in enumerate(names)}
+        return cls._build(names, ((index[a], index[b], w) for a, b, w in edges))
+
+    @classmethod
+    def from_arrays(cls, names: Sequence[str], src: Sequence[int], dst: Sequence[int],
+                    weight: Sequence[float]) -> "RoadGraph":
+        """Build from parallel edge arrays whose ids already index ``names`` (kept as-is)."""
+        if any(a > b for a, b in zip(names, names[1:])):
+            raise ValueError("names must be sorted")
+        return cls._build(names, zip(src, dst, weight))
+
+    @classmethod
+    def from_csr(cls, names: Sequence[str], offsets: Sequence[int], nbr: Sequence[int],
+                 weight: Sequence[float]) -> "RoadGraph":
+        """Wrap CSR arrays that already hold both directions of every edge, rows sorted by id."""
+        return cls(names, CSRAdj(offsets, nbr, weight))
+
+    def to_csr(self) -> Tuple[array, array, array]:
+        """``(offsets, nbr, weight)`` arrays of ``adj``, the layout ``from_csr`` reads."""
+        offsets, nbr, weight = array("i", [0]), array("i"), array("d")
+        for row in self.adj:
+            for v, w in row:
+                nbr.append(v)
+                weight.append(w)
+            offsets.append(len(nbr))
+        return offsets, nbr, weight
+
+    @classmethod
+    def _build(cls, names: Sequence[str], edges: Iterable[Tuple[int, int, float]]) -> "RoadGraph":
+        # Later duplicates overwrite earlier ones, like networkx add_edge.
+        nbrs: List[Dict[int, float]] = [{} for _ in names]
+        for a, b, w in edges:
+            if a == b:
+                continue
+            nbrs[a][b] = float(w)
+            nbrs[b][a] = float(w)
+        return cls(names, [tuple(sorted(d.items())) for d in nbrs])
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.index
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def number_of_edges(self) -> int:
+        if isinstance(self.adj, CSRAdj):
+            return len(self.adj.nbr) // 2
+        return sum(len(a) for a in self.adj) // 2
+
+    def neighbors(self, name: str) -> Iterator[str]:
+        names = self.names
+        return (names[v] for v, _ in self.adj[self.index[name]])
+
+    def weight(self, a: str, b: str) -> float:
+        v = self.index[b]
+        for u, w in self.adj[self.index[a]]:
+            if u == v:
+                return w
+        raise KeyError(f"no edge {a} - {b}")
+
+    def edges(self) -> Iterator[Tuple[str, str, float]]:
+        names = self.names
+        for u, row in enumerate(self.adj):
+            for v, w in row:
+                if u < v:
+                    yield names[u], names[v], w
+
+    def heuristic_table(self, h: Mapping[str, float]) -> List[float]:
+        """``h`` as a list indexed by node id (inf for missing cities).
+
+        The last table is cached by identity, so repeated queries with the same
+        dict pay the O(n) conversion once; build a new dict rather than
+        mutating one that has already been used.
+        """
+        cached = self._heuristic_cache
+        if cached is not None and cached[0] is h:
+            return cached[1]
+        inf = float("inf")
+        table = [h.get(name, inf) for name in self.names]
+        self._heuristic_cache = (h, table)
+        return table
+
+    def to_networkx(self):
+        """Optional conversion for plotting; networkx is only imported here."""
+        import networkx as nx
+
+        G = nx.Graph()
+        G.add_nodes_from(self.names)
+        for a, b, w in self.edges():
+            G.add_edge(a, b, weight=w)
+        return G
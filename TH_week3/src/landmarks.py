@@ -0,0 +1,179 @@
+from __future__ import annotations
+import random
+import struct
+import sys
+from array import array
+from typing import List, Sequence
+from graph import RoadGraph
+from search import dijkstra_tree
+
+# ALT (A*, Landmarks, Triangle inequality) preprocessing.
+#
+# For an undirected graph and any landmark L, |d(L, t) - d(L, v)| <= d(v, t),
+# so the max over a few landmarks is an admissible heuristic for every goal t.
+#
+# File layout (little-endian):
+#   header: magic(8) version(u32) n(u32) k(u32) names_len(u32)
+#   names: utf-8 joined by "\n", padded to 8 | landmark ids: i32[k], padded to 8
+#   distances: f32[k * n], row per landmark (inf = unreachable)
+ALT_MAGIC = b"NMAIALT\0"
+ALT_VERSION = 1
+_HEADER = struct.Struct("<8sIIII")
+# Each float32 distance is off by at most 2^-24 of its value, so a bound
+# |dt - dv| is shrunk by this factor of (dt + dv) to stay admissible.
+_F32_MARGIN = 1.2e-7
+
+def _pad8(n: int) -> int:
+    return (n + 7) & ~7
+
+def _distances(G: RoadGraph, source: int) -> List[float]:
+    dist, _ = dijkstra_tree(G, G.names[source])
+    row = [float("inf")] * len(G)
+    for v, d in dist.items():
+        row[v] = d
+    return row
+
+def _farthest(G: RoadGraph, k: int, rng: random.Random) -> List[int]:
+    # First landmark: the node farthest from a random start; then repeatedly the
+    # node maximizing the distance to its closest chosen landmark.
+    inf = float("inf")
+    seed = _distances(G, rng.randrange(len(G)))
+    first = max(range(len(G)), key=lambda v: seed[v] if seed[v] < inf else -1.0)
+    chosen = [first]
+    closest = _distances(G, first)
+    while len(chosen) < k:
+        cand = max((v for v in range(len(G)) if v not in chosen),
+                   key=lambda v: closest[v] if closest[v] < inf else -1.0, default=None)
+        if cand is None:
+            break
+        chosen.append(cand)
+        closest = [min(a, b) for a, b in zip(closest, _distances(G, cand))]
+    return chosen
+
+def _avoid(G: RoadGraph, k: int, rng: random.Random) -> List[int]:
+    # Goldberg & Harrelson "avoid": grow a shortest-path tree from a random root,
+    # weight each node by how badly the current landmarks bound it, and descend
+    # from the root into the heaviest landmark-free subtree down to a leaf.
+    chosen: List[int] = _farthest(G, 1, rng)
+    rows = [_distances(G, chosen[0])]
+    inf = float("inf")
+    while len(chosen) < k:
+        root = rng.randrange(len(G))
+        dist, came_from = dijkstra_tree(G, G.names[root])
+        bound = [max(abs(r[root] - r[v]) if r[v] < inf else 0.0 for r in rows) for v in range(len(G))]
+        children: dict = {}
+        for v, p in came_from.items():
+            if p != -1 and v in dist:
+                children.setdefault(p, []).append(v)
+        size = {v: dist[v] - bound[v] for v in dist}
+        has_landmark = {v: v in chosen for v in dist}
+        for v in sorted(dist, key=dist.__getitem__, reverse=True):
+            p = came_from[v]
+            if p != -1:
+                size[p] += size[v]
+                has_landmark[p] = has_landmark[p] or has_landmark[v]
+        for v in dist:
+            if has_landmark[v]:
+                size[v] = 0.0
+        v = root
+        while children.get(v):
+            best = max(children[v], key=size.__getitem__)
+            if size[best] <= 0.0:
+                break
+            v = best
+        if v in chosen or (v == root and size[v] <= 0.0):
+            # Nothing left to improve from this root; fall back to farthest.
+            closest = [min(r[u] for r in rows) for u in range(len(G))]
+            v = max((u for u in range(len(G)) if u not in chosen),
+                    key=lambda u: closest[u] if closest[u] < inf else -1.0, default=None)
+            if v is None:
+                break
+        chosen.append(v)
+        rows.append(_distances(G, v))
+    return chosen
+
+STRATEGIES = {"farthest": _farthest, "avoid": _avoid}
+
+class LandmarkHeuristic:
+    """ALT lower bounds towards one goal, indexable by node id (memoized)."""
+
+    def __init__(self, rows: Sequence[Sequence[float]], goal: int, margin: float) -> None:
+        self.rows = rows
+        self.to_goal = [r[goal] for r in rows]
+        self.margin = margin
+        self.memo: dict = {}
+
+    def __getitem__(self, v: int) -> float:
+        h = self.memo.get(v)
+        if h is None:
+            inf = float("inf")
+            h = 0.0
+            for r, dt in zip(self.rows, self.to_goal):
+                dv = r[v]
+                if dv == inf or dt == inf:
+                    if dv != dt:
+                        # v and the goal lie in different components
+                        h = inf
+                        break
+                    continue
+                b = (dt - dv if dt > dv else dv - dt) - self.margin * (dt + dv)
+                if b > h:
+                    h = b
+            self.memo[v] = h
+        return h
+
+class Landmarks:
+    """Distance tables from k landmarks, stored as float32 rows."""
+
+    def __init__(self, names: Sequence[str], landmarks: Sequence[int], rows: Sequence[Sequence[float]]) -> None:
+        self.names = list(names)
+        self.landmarks = list(landmarks)
+        self.rows = rows
+
+    @classmethod
+    def build(cls, G: RoadGraph, k: int = 8, strategy: str = "avoid", seed: int = 0) -> "Landmarks":
+        if strategy not in STRATEGIES:
+            raise ValueError(f"unknown landmark strategy {strategy}")
+        k = min(k, len(G))
+        chosen = STRATEGIES[strategy](G, k, random.Random(seed))
+        rows = [array("f", _distances(G, L)) for L in chosen]
+        return cls(G.names, chosen, rows)
+
+    def heuristic(self, G: RoadGraph, goal: str) -> LandmarkHeuristic:
+        if G.names != self.names:
+            raise ValueError("landmark table was built for a different graph")
+        return LandmarkHeuristic(self.rows, G.index[goal], _F32_MARGIN)
+
+    def save(self, path: str) -> None:
+        if sys.byteorder != "little":
+            raise ValueError("ALT file format requires a little-endian machine")
+        name_bytes = "\n".join(self.names).encode("utf-8")
+        ids = array("i", self.landmarks).tobytes()
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(ALT_MAGIC, ALT_VERSION, len(self.names), len(self.landmarks), len(name_bytes)))
+            for chunk in (name_bytes, ids):
+                f.write(chunk + bytes(_pad8(len(chunk)) - len(chunk)))
+            for r in self.rows:
+                f.write(array("f", r).tobytes())
+
+    @classmethod
+    def load(cls, path: str) -> "Landmarks":
+        if sys.byteorder != "little":
+            raise ValueError("ALT file format requires a little-endian machine")
+        with open(path, "rb") as f:
+            buf = f.read()
+        magic, version, n, k, names_len = _HEADER.unpack_from(buf, 0)
+        if magic != ALT_MAGIC:
+            raise ValueError(f"{path} is not a landmark file")
+        if version != ALT_VERSION:
+            raise ValueError(f"Unsupported landmark file version {version}, expected {ALT_VERSION}")
+        off = _HEADER.size
+        names = buf[off:off + names_len].decode("utf-8").split("\n") if n else []
+        off += _pad8(names_len)
+        landmarks = list(array("i", buf[off:off + 4 * k]))
+        off += _pad8(4 * k)
+        rows = []
+        for _ in range(k):
+            rows.append(array("f", buf[off:off + 4 * n]))
+            off += 4 * n
+        return cls(names, landmarks, rows)
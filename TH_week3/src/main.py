@@ -1,34 +1,139 @@
 from __future__ import annotations
 import argparse
+import os
+import sys
+import time
 from typing import Tuple
-from data_loader import load_heuristic, load_positions, load_graph
-from search import greedy_best_first, a_star, path_cost
+from data_loader import load_heuristic, load_positions, load_graph, compile_data, is_compiled, load_compiled
+from search import greedy_best_first, a_star, bidirectional_a_star, path_cost, ZeroHeuristic
+from landmarks import Landmarks, STRATEGIES
+from ch import ContractionHierarchy
 from plot_map import draw_graph
+from batch import ALGOS as BATCH_ALGOS, read_queries, run_batch, report_throughput
 
 def parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser("GBFS and A* on Romania map")
-    p.add_argument("--data", default="data", help="data directory")
+    p.add_argument("--data", default="data", help="data directory or compiled .bin file")
     p.add_argument("--start", default="Arad", help="start city")
     p.add_argument("--goal", default="Hirsova", help="goal city")
-    p.add_argument("--algo", choices=["gbfs", "astar"], default="astar", help="search algorithm")
+    p.add_argument("--algo", choices=["gbfs", "astar", "ucs", "ch", "bidir-astar", "bidir-ucs"], default="astar", help="search algorithm")
     p.add_argument("--plot", action="store_true", help="save a PNG of the route")
     p.add_argument("--out", default="route.png", help="output figure path if --plot is set")
-    return p.parse_args()
+    p.add_argument("--time", action="store_true", help="print the wall time of the search")
+    p.add_argument("--stats", action="store_true",
+                   help="print search counters (expanded, generated, heap pushes/pops, ...)")
+    p.add_argument("--stats-json", metavar="FILE", help="write the search counters as JSON to FILE ('-' for stdout)")
+    p.add_argument("--compile", metavar="BIN", help="compile the text files in --data into BIN and exit")
+    p.add_argument("--batch", metavar="FILE",
+                   help="answer 'start goal' queries from FILE ('-' for stdin) instead of --start/--goal")
+    p.add_argument("--format", choices=["jsonl", "csv"], default="jsonl", help="batch output format")
+    p.add_argument("--output", default="-", help="batch output file ('-' for stdout)")
+    p.add_argument("--workers", type=int, default=1, help="worker processes for --batch")
+    p.add_argument("--alt", metavar="FILE", help="use ALT landmark bounds from FILE instead of heuristic.txt")
+    p.add_argument("--build-alt", metavar="FILE", help="precompute landmark distances into FILE and exit")
+    p.add_argument("--landmarks", type=int, default=8, help="number of landmarks for --build-alt")
+    p.add_argument("--ch", metavar="FILE", help="contraction hierarchy file for --algo ch")
+    p.add_argument("--build-ch", metavar="FILE", help="contract the graph into FILE and exit")
+    p.add_argument("--landmark-strategy", choices=sorted(STRATEGIES), default="avoid",
+                   help="landmark selection for --build-alt")
+    args = p.parse_args()
+    if args.batch and args.algo not in BATCH_ALGOS:
+        p.error(f"--batch supports --algo {', '.join(BATCH_ALGOS)}, not {args.algo}")
+    if args.batch and args.alt:
+        p.error("--batch uses heuristic.txt and cannot be combined with --alt")
+    return args
 
 def main() -> None:
     args = parse_args()
-    H = load_heuristic(f"{args.data}/heuristic.txt")
-    pos = load_positions(f"{args.data}/cities.txt")
-    G = load_graph(f"{args.data}/citiesGraph.txt")
+    if args.compile:
+        n, m = compile_data(args.data, args.compile)
+        print(f"wrote {args.compile}: {n} cities, {m} roads")
+        return
 
+    if is_compiled(args.data):
+        data = load_compiled(args.data)
+        H, pos, G = data["heuristic"], data["positions"], data["graph"]
+    else:
+        H = load_heuristic(f"{args.data}/heuristic.txt")
+        pos = load_positions(f"{args.data}/cities.txt")
+        G = load_graph(f"{args.data}/citiesGraph.txt")
+
+    if args.build_alt:
+        L = Landmarks.build(G, args.landmarks, args.landmark_strategy)
+        L.save(args.build_alt)
+        print(f"wrote {args.build_alt}: landmarks={[G.names[v] for v in L.landmarks]}")
+        return
+    if args.build_ch:
+        C = ContractionHierarchy.build(G)
+        C.save(args.build_ch)
+        print(f"wrote {args.build_ch}: {len(C.names)} nodes, {C.num_shortcuts()} shortcuts")
+        return
+    h_start = None
+    if args.alt:
+        L = Landmarks.load(args.alt)
+        h = L.heuristic(G, args.goal)
+        if args.start in G:
+            h_start = L.heuristic(G, args.start)
+    else:
+        h = H
+
+    if args.batch:
+        src = sys.stdin if args.batch == "-" else open(args.batch, encoding="utf-8")
+        dst = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+        try:
+            count, seconds = run_batch(G, H, read_queries(src), args.algo, dst, args.format,
+                                       workers=args.workers)
+        finally:
+            if src is not sys.stdin:
+                src.close()
+            if dst is not sys.stdout:
+                dst.close()
+        report_throughput(count, seconds)
+        return
+
+    stats = None
+    if args.stats or args.stats_json:
+        # search_stats lives at the repository root
+        sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir))
+        from search_stats import SearchStats, write_json
+        stats = SearchStats()
+
+    t0 = time.perf_counter()
     if args.algo == "gbfs":
-        path, cost, expanded = greedy_best_first(G, args.start, args.goal, H)
+        path, cost, expanded = greedy_best_first(G, args.start, args.goal, h, stats)
         print(f"[GBFS] path={path} cost={cost:.0f} expanded={expanded}")
         title = "GBFS path"
+    elif args.algo == "ch":
+        if not args.ch:
+            raise SystemExit("--algo ch needs --ch FILE (create it with --build-ch FILE)")
+        path, cost, settled = ContractionHierarchy.load(args.ch).query(args.start, args.goal)
+        if stats is not None:
+            stats.add(expanded=settled, wall_time=time.perf_counter() - t0)
+        print(f"[CH] path={path} cost={cost:.0f} settled={settled}")
+        title = "CH path"
+    elif args.algo in ("bidir-astar", "bidir-ucs"):
+        # Without --alt there is no bound towards the start city, so the backward
+        # potential falls back to 0 (still consistent when h is).
+        if args.algo == "bidir-astar":
+            path, cost, expanded = bidirectional_a_star(G, args.start, args.goal, h, h_start, stats)
+        else:
+            path, cost, expanded = bidirectional_a_star(G, args.start, args.goal, stats=stats)
+        print(f"[{args.algo}] path={path} cost={cost:.0f} expanded={expanded}")
+        title = "Bidirectional path"
+    elif args.algo == "ucs":
+        path, cost, expanded = a_star(G, args.start, args.goal, ZeroHeuristic(), stats)
+        print(f"[UCS] path={path} cost={cost:.0f} expanded={expanded}")
+        title = "UCS path"
     else:
-        path, cost, expanded = a_star(G, args.start, args.goal, H)
-        print(f"[A*] path={path} cost={cost:.0f} expanded={expanded}")
+        path, cost, expanded = a_star(G, args.start, args.goal, h, stats)
+        print(f"[A*{' ALT' if args.alt else ''}] path={path} cost={cost:.0f} expanded={expanded}")
         title = "A* path"
+    if args.time:
+        print(f"time={(time.perf_counter() - t0) * 1e6:.0f}us")
+    if args.stats:
+        stats.report(args.algo)
+    if args.stats_json:
+        write_json({args.algo: stats}, args.stats_json)
 
     if args.plot:
         draw_graph(G, pos, path, args.out, f"{title}: {args.start} to {args.goal}")
@@ -2,6 +2,9 @@ def draw_graph(G, pos, path=None, out_path=None, title: str = "") -> None:
     import matplotlib.pyplot as plt
     import networkx as nx
 
+    if not isinstance(G, nx.Graph):
+        G = G.to_networkx()
+
     fig, ax = plt.subplots(figsize=(10, 8))
 
     # 1) Vẽ nền: cạnh mảnh, hơi trong suốt; node chưa gắn nhãn
@@ -1,10 +1,38 @@
 from __future__ import annotations
-from typing import Callable, Dict, List, Tuple, Optional
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple, Optional, Union
 import heapq
-import networkx as nx
+from time import perf_counter
+from graph import RoadGraph
 
 Path = List[str]
-Heu = Dict[str, float]
+Heu = Mapping[str, float]
+# A heuristic is either a name -> value table (heuristic.txt, or the NodeValues
+# view of a compiled file) or anything indexable by node id, e.g.
+# Landmarks.heuristic(G, goal).
+AnyHeu = Union[Heu, Sequence[float]]
+
+class _TimedHeuristic:
+    """``h[v]`` that adds the time of every lookup to ``stats.heuristic_time``."""
+
+    def __init__(self, h: Sequence[float], stats: Any) -> None:
+        self._get = stats.timed(h.__getitem__)
+
+    def __getitem__(self, v: int) -> float:
+        return self._get(v)
+
+def _id_heuristic(G: RoadGraph, h: AnyHeu, stats: Optional[Any] = None) -> Sequence[float]:
+    if isinstance(h, Mapping):
+        return G.heuristic_table(h)
+    if stats is not None and not isinstance(h, (list, ZeroHeuristic)):
+        # evaluated on lookup (e.g. ALT bounds): time each lookup
+        return _TimedHeuristic(h, stats)
+    return h
+
+class ZeroHeuristic:
+    """h(v) = 0 for every node: turns a_star into uniform-cost search."""
+
+    def __getitem__(self, v: int) -> float:
+        return 0.0
 
 def reconstruct_path(came_from: Dict[str, Optional[str]], goal: str) -> Path:
     path: Path = []
@@ -15,65 +43,234 @@ def reconstruct_path(came_from: Dict[str, Optional[str]], goal: str) -> Path:
     path.reverse()
     return path
 
-def greedy_best_first(G: nx.Graph, start: str, goal: str, h: Heu) -> Tuple[Path, float, int]:
+def _reconstruct_ids(G: RoadGraph, came_from: Dict[int, int], goal: int) -> Path:
+    names = G.names
+    path: Path = []
+    node = goal
+    while node != -1:
+        path.append(names[node])
+        node = came_from[node]
+    path.reverse()
+    return path
+
+# stats: see search_stats.py at the repository root. Here heuristic_time is the
+# time spent turning h into a per-node table, plus every lookup into an h that
+# is evaluated on demand, such as Landmarks.heuristic(G, goal).
+
+def greedy_best_first(G: RoadGraph, start: str, goal: str, h: AnyHeu,
+                      stats: Optional[Any] = None) -> Tuple[Path, float, int]:
     if start not in G or goal not in G:
         raise ValueError("start or goal not in graph")
-    open_heap: List[Tuple[float, str]] = [(h[start], start)]
-    came_from: Dict[str, Optional[str]] = {start: None}
+    t0 = perf_counter()
+    inf = float("inf")
+    adj, hv = G.adj, _id_heuristic(G, h, stats)
+    t_h = perf_counter() - t0
+    s, t = G.index[start], G.index[goal]
+    open_heap: List[Tuple[float, int]] = [(hv[s], s)]
+    came_from: Dict[int, int] = {s: -1}
     visited = set()
-    expanded = 0
+    expanded = pops = generated = 0
+    pushes = peak = 1
+    path: Path = []
+    cost = inf
     while open_heap:
         _, u = heapq.heappop(open_heap)
+        pops += 1
         if u in visited:
             continue
         visited.add(u)
         expanded += 1
-        if u == goal:
-            path = reconstruct_path(came_from, goal)
+        if u == t:
+            path = _reconstruct_ids(G, came_from, t)
             cost = path_cost(G, path)
-            return path, cost, expanded
-        for v in sorted(G.neighbors(u)):
+            break
+        nbrs = adj[u]
+        generated += len(nbrs)
+        for v, _w in nbrs:
             if v in visited:
                 continue
             if v not in came_from:
                 came_from[v] = u
-            heapq.heappush(open_heap, (h.get(v, float("inf")), v))
-    return [], float("inf"), expanded
+            heapq.heappush(open_heap, (hv[v], v))
+            pushes += 1
+        if len(open_heap) > peak:
+            peak = len(open_heap)
+    if stats is not None:
+        stats.add(expanded=expanded, generated=generated, pushes=pushes, pops=pops, stale=pops - expanded,
+                  peak_frontier=peak, heuristic_time=t_h, wall_time=perf_counter() - t0)
+    return path, cost, expanded
 
-def a_star(G: nx.Graph, start: str, goal: str, h: Heu) -> Tuple[Path, float, int]:
+def a_star(G: RoadGraph, start: str, goal: str, h: AnyHeu,
+           stats: Optional[Any] = None) -> Tuple[Path, float, int]:
     if start not in G or goal not in G:
         raise ValueError("start or goal not in graph")
-    open_heap: List[Tuple[float, str]] = []
-    heapq.heappush(open_heap, (h[start], start))
-    g: Dict[str, float] = {start: 0.0}
-    came_from: Dict[str, Optional[str]] = {start: None}
+    t0 = perf_counter()
+    inf = float("inf")
+    adj, hv = G.adj, _id_heuristic(G, h, stats)
+    t_h = perf_counter() - t0
+    s, t = G.index[start], G.index[goal]
+    open_heap: List[Tuple[float, int]] = []
+    heapq.heappush(open_heap, (hv[s], s))
+    g: Dict[int, float] = {s: 0.0}
+    came_from: Dict[int, int] = {s: -1}
     closed = set()
-    expanded = 0
+    expanded = pops = generated = 0
+    pushes = peak = 1
+    path: Path = []
+    cost = inf
     while open_heap:
         f_u, u = heapq.heappop(open_heap)
+        pops += 1
         if u in closed:
             continue
         closed.add(u)
         expanded += 1
-        if u == goal:
-            path = reconstruct_path(came_from, goal)
-            return path, g[goal], expanded
-        for v in G.neighbors(u):
-            w = G[u][v]["weight"]
-            tentative = g[u] + w
-            if v in closed and tentative >= g.get(v, float("inf")):
-                continue
-            if tentative < g.get(v, float("inf")):
+        if u == t:
+            path = _reconstruct_ids(G, came_from, t)
+            cost = g[t]
+            break
+        g_u = g[u]
+        nbrs = adj[u]
+        generated += len(nbrs)
+        for v, w in nbrs:
+            tentative = g_u + w
+            if tentative < g.get(v, inf):
                 came_from[v] = u
                 g[v] = tentative
-                f_v = tentative + h.get(v, float("inf"))
+                f_v = tentative + hv[v]
                 heapq.heappush(open_heap, (f_v, v))
-    return [], float("inf"), expanded
+                pushes += 1
+        if len(open_heap) > peak:
+            peak = len(open_heap)
+    if stats is not None:
+        stats.add(expanded=expanded, generated=generated, pushes=pushes, pops=pops, stale=pops - expanded,
+                  peak_frontier=peak, heuristic_time=t_h, wall_time=perf_counter() - t0)
+    return path, cost, expanded
+
+def bidirectional_a_star(G: RoadGraph, start: str, goal: str, h_goal: Optional[AnyHeu] = None,
+                         h_start: Optional[AnyHeu] = None, stats: Optional[Any] = None) -> Tuple[Path, float, int]:
+    """Bidirectional A* with the average potential p(v) = (h_goal(v) - h_start(v)) / 2.
+
+    The forward search orders by d_f(v) + p(v) and the backward one by
+    d_b(v) - p(v); with consistent h_goal/h_start both see the same
+    non-negative reduced edge costs, so the search can stop as soon as the two
+    queue minima sum to at least the best meeting cost. Leaving either
+    heuristic out uses 0 for it; leaving both out gives bidirectional UCS.
+    """
+    if start not in G or goal not in G:
+        raise ValueError("start or goal not in graph")
+    t0 = perf_counter()
+    inf = float("inf")
+    adj = G.adj
+    s, t = G.index[start], G.index[goal]
+    if s == t:
+        if stats is not None:
+            stats.add(wall_time=perf_counter() - t0)
+        return [start], 0.0, 0
+    hf = ZeroHeuristic() if h_goal is None else _id_heuristic(G, h_goal, stats)
+    hb = ZeroHeuristic() if h_start is None else _id_heuristic(G, h_start, stats)
+    t_h = perf_counter() - t0
+
+    def potential(v: int) -> float:
+        a, b = hf[v], hb[v]
+        # inf means v cannot reach goal (or start), so it is never on a route
+        return inf if a == inf or b == inf else (a - b) / 2
+
+    sign = (1.0, -1.0)
+    dist: Tuple[Dict[int, float], Dict[int, float]] = ({s: 0.0}, {t: 0.0})
+    came_from: Tuple[Dict[int, int], Dict[int, int]] = ({s: -1}, {t: -1})
+    heaps = ([(potential(s), s)], [(-potential(t), t)])
+    closed = (set(), set())
+    best, meet = inf, -1
+    expanded = pops = generated = 0
+    pushes = peak = 2
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+        side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+        _, u = heapq.heappop(heaps[side])
+        pops += 1
+        if u in closed[side]:
+            continue
+        closed[side].add(u)
+        expanded += 1
+        d_here, d_there, parent = dist[side], dist[side ^ 1], came_from[side]
+        d_u = d_here[u]
+        nbrs = adj[u]
+        generated += len(nbrs)
+        for v, w in nbrs:
+            nd = d_u + w
+            if nd < d_here.get(v, inf):
+                p = potential(v)
+                if p == inf:
+                    continue
+                d_here[v] = nd
+                parent[v] = u
+                heapq.heappush(heaps[side], (nd + sign[side] * p, v))
+                pushes += 1
+                if v in d_there and nd + d_there[v] < best:
+                    best, meet = nd + d_there[v], v
+        if len(heaps[0]) + len(heaps[1]) > peak:
+            peak = len(heaps[0]) + len(heaps[1])
+    if stats is not None:
+        stats.add(expanded=expanded, generated=generated, pushes=pushes, pops=pops, stale=pops - expanded,
+                  peak_frontier=peak, heuristic_time=t_h, wall_time=perf_counter() - t0)
+    if meet == -1:
+        return [], inf, expanded
+
+    fwd = _reconstruct_ids(G, came_from[0], meet)
+    names = G.names
+    v = came_from[1][meet]
+    while v != -1:
+        fwd.append(names[v])
+        v = came_from[1][v]
+    return fwd, best, expanded
+
+def dijkstra_tree(G: RoadGraph, source: str, targets: Optional[Iterable[str]] = None
+                  ) -> Tuple[Dict[int, float], Dict[int, int]]:
+    """Shortest-path tree from source, keyed by node id.
+
+    Stops as soon as every city in targets is settled (or explores the whole
+    component when targets is None). Returns (dist, came_from) where
+    came_from[source] == -1; use tree_path to read a route out of it.
+    """
+    if source not in G:
+        raise ValueError("source not in graph")
+    adj = G.adj
+    s = G.index[source]
+    pending = None if targets is None else {G.index[t] for t in targets if t in G}
+    dist: Dict[int, float] = {s: 0.0}
+    came_from: Dict[int, int] = {s: -1}
+    done = set()
+    heap: List[Tuple[float, int]] = [(0.0, s)]
+    while heap:
+        d_u, u = heapq.heappop(heap)
+        if u in done:
+            continue
+        done.add(u)
+        if pending is not None:
+            pending.discard(u)
+            if not pending:
+                break
+        for v, w in adj[u]:
+            nd = d_u + w
+            if nd < dist.get(v, float("inf")):
+                dist[v] = nd
+                came_from[v] = u
+                heapq.heappush(heap, (nd, v))
+    return {u: dist[u] for u in done}, came_from
+
+def tree_path(G: RoadGraph, tree: Tuple[Dict[int, float], Dict[int, int]], goal: str) -> Tuple[Path, float]:
+    dist, came_from = tree
+    t = G.index.get(goal)
+    if t is None or t not in dist:
+        return [], float("inf")
+    return _reconstruct_ids(G, came_from, t), dist[t]
 
-def path_cost(G: nx.Graph, path: Path) -> float:
+def path_cost(G: RoadGraph, path: Path) -> float:
     if not path or len(path) == 1:
         return 0.0
     total = 0.0
     for a, b in zip(path, path[1:]):
-        total += G[a][b]["weight"]
+        total += G.weight(a, b)
     return total
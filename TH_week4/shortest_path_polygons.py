@@ -2,8 +2,16 @@
 # -*- coding: utf-8 -*-
 
 import argparse
+import json
 import math
+import multiprocessing as mp
+import os
+import struct
+import sys
+import time
+from array import array
 from dataclasses import dataclass
+from multiprocessing import shared_memory
 from typing import List, Tuple, Dict, Optional
 import heapq
 from collections import deque, defaultdict
@@ -103,9 +111,129 @@ def build_edges_from_polygons(polygons: List[List[Tuple[float,float]]]) -> List[
             edges.append((a, b, pid))
     return edges
 
-def is_visible(u: Node, v: Node, all_edges, polygons) -> bool:
+class EdgeGrid:
+    # Uniform grid over polygon edges. Each cell lists the edges whose bounding box
+    # overlaps it, so a visibility query only tests edges in the cells the segment
+    # passes through (plus a cheap bounding-box rejection per edge).
+    def __init__(self, all_edges, cell: Optional[float] = None):
+        self.edges = all_edges
+        if not all_edges:
+            self.x0 = self.y0 = 0.0
+            self.cell = 1.0
+            self.nx = self.ny = 1
+            self.cells: List[List[int]] = [[]]
+            self.boxes = []
+            return
+        xs = [p[0] for c, d, _ in all_edges for p in (c, d)]
+        ys = [p[1] for c, d, _ in all_edges for p in (c, d)]
+        self.x0, self.y0 = min(xs), min(ys)
+        w = max(max(xs) - self.x0, 1e-9)
+        h = max(max(ys) - self.y0, 1e-9)
+        if cell is None:
+            # about two edges per cell on average
+            cell = math.sqrt(w * h / max(1, len(all_edges)) * 2)
+        self.cell = max(cell, 1e-9)
+        self.nx = int(w / self.cell) + 1
+        self.ny = int(h / self.cell) + 1
+        self.cells = [[] for _ in range(self.nx * self.ny)]
+        self.boxes = []
+        for k, (c, d, _) in enumerate(all_edges):
+            box = (min(c[0], d[0]), min(c[1], d[1]), max(c[0], d[0]), max(c[1], d[1]))
+            self.boxes.append(box)
+            for cx in range(self._col(box[0] - 1e-9), self._col(box[2] + 1e-9) + 1):
+                for cy in range(self._row(box[1] - 1e-9), self._row(box[3] + 1e-9) + 1):
+                    self.cells[cx * self.ny + cy].append(k)
+
+    def _col(self, x: float) -> int:
+        return min(self.nx - 1, max(0, int((x - self.x0) / self.cell)))
+
+    def _row(self, y: float) -> int:
+        return min(self.ny - 1, max(0, int((y - self.y0) / self.cell)))
+
+    def candidates(self, a: Tuple[float, float], b: Tuple[float, float]):
+        # Edges stored in the cells the segment ab touches. Column by column, the
+        # y-range of the segment inside the column (padded by eps) selects the cells,
+        # which conservatively covers corner crossings.
+        if a[0] > b[0]:
+            a, b = b, a
+        eps = 1e-9
+        cx0 = self._col(a[0] - eps)
+        cx1 = self._col(b[0] + eps)
+        dx = b[0] - a[0]
+        slope = (b[1] - a[1]) / dx if dx > eps else None
+        lo_y, hi_y = min(a[1], b[1]), max(a[1], b[1])
+        seen = set()
+        ax, ay, by = a[0], a[1], b[1]
+        box = (min(a[0], b[0]) - eps, lo_y - eps, max(a[0], b[0]) + eps, hi_y + eps)
+        boxes = self.boxes
+        for cx in range(cx0, cx1 + 1):
+            if slope is None:
+                y_from, y_to = lo_y, hi_y
+            else:
+                xl = max(ax, self.x0 + cx * self.cell)
+                xr = min(b[0], self.x0 + (cx + 1) * self.cell)
+                y_from = ay + (xl - ax) * slope
+                y_to = ay + (xr - ax) * slope
+                if y_from > y_to:
+                    y_from, y_to = y_to, y_from
+            base = cx * self.ny
+            for cy in range(self._row(y_from - eps), self._row(y_to + eps) + 1):
+                for k in self.cells[base + cy]:
+                    if k in seen:
+                        continue
+                    seen.add(k)
+                    e = boxes[k]
+                    # bounding-box rejection
+                    if e[0] > box[2] or e[2] < box[0] or e[1] > box[3] or e[3] < box[1]:
+                        continue
+                    yield self.edges[k]
+
+class EdgeArrays:
+    # Polygon edge endpoints as NumPy arrays, so a block of segments can be tested
+    # against every edge at once. blocked() applies the same rules (and epsilons) as
+    # is_visible: an edge sharing an endpoint with the segment only blocks on a proper
+    # crossing, any other edge blocks on any contact, collinear overlaps included.
+    def __init__(self, all_edges):
+        import numpy as np
+        pts = np.array([(c[0], c[1], d[0], d[1]) for c, d, _ in all_edges], dtype=np.float64).reshape(-1, 4)
+        self.cx, self.cy, self.dx, self.dy = (pts[:, k][None, :] for k in range(4))
+
+    def blocked(self, a, b):
+        # a, b: (B, 2) arrays of segment endpoints. Returns a (B, E) boolean mask of
+        # the edges that block each segment.
+        import numpy as np
+        eps = 1e-9
+        ax, ay = a[:, 0:1], a[:, 1:2]
+        bx, by = b[:, 0:1], b[:, 1:2]
+        cx, cy, dx, dy = self.cx, self.cy, self.dx, self.dy
+
+        # orientation() with the operands in the same order, so the values match bit for bit
+        o1 = (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+        o2 = (bx - ax) * (dy - ay) - (by - ay) * (dx - ax)
+        o3 = (dx - cx) * (ay - cy) - (dy - cy) * (ax - cx)
+        o4 = (dx - cx) * (by - cy) - (dy - cy) * (bx - cx)
+        proper = (o1 * o2 < 0) & (o3 * o4 < 0)
+
+        def within(px, py, sx, sy, tx, ty):
+            # bounding-box part of on_segment()
+            return ~((px + eps < np.minimum(sx, tx)) | (px - eps > np.maximum(sx, tx)) |
+                     (py + eps < np.minimum(sy, ty)) | (py - eps > np.maximum(sy, ty)))
+
+        touch = ((np.abs(o1) <= eps) & within(cx, cy, ax, ay, bx, by)) | \
+                ((np.abs(o2) <= eps) & within(dx, dy, ax, ay, bx, by)) | \
+                ((np.abs(o3) <= eps) & within(ax, ay, cx, cy, dx, dy)) | \
+                ((np.abs(o4) <= eps) & within(bx, by, cx, cy, dx, dy))
+
+        def same(px, py, qx, qy):
+            return (np.abs(px - qx) <= eps) & (np.abs(py - qy) <= eps)
+
+        shared = same(ax, ay, cx, cy) | same(ax, ay, dx, dy) | same(bx, by, cx, cy) | same(bx, by, dx, dy)
+        return np.where(shared, proper, proper | touch)
+
+def is_visible(u: Node, v: Node, all_edges, polygons, index: Optional[EdgeGrid] = None) -> bool:
     # Visible if the segment uv does not cross any polygon edge except possibly at shared endpoints.
     # Also, two vertices of the same polygon are only visible if they are adjacent (share an edge).
+    # With an EdgeGrid index only the edges near uv are tested; the result is the same.
     if u.x == v.x and u.y == v.y:
         return False
 
@@ -123,7 +251,8 @@ def is_visible(u: Node, v: Node, all_edges, polygons) -> bool:
     def same_point(p, q) -> bool:
         return abs(p[0] - q[0]) <= 1e-9 and abs(p[1] - q[1]) <= 1e-9
 
-    for (c, d, eid_pid) in all_edges:
+    edges = all_edges if index is None else index.candidates(a, b)
+    for (c, d, eid_pid) in edges:
         # If the polygon edge shares an endpoint with uv, allow the touch (unless proper intersection)
         if same_point(a, c) or same_point(a, d) or same_point(b, c) or same_point(b, d):
             if proper_intersection(a, b, c, d):
@@ -136,27 +265,444 @@ def is_visible(u: Node, v: Node, all_edges, polygons) -> bool:
 
     return True
 
-def build_graph(S, G, polygons):
+def is_tangent(u: Node, v: Node, polygons) -> bool:
+    # True if the line uv does not cut into u's polygon at u: both polygon neighbours
+    # of u lie on the same side of uv (or on it). S and G have no polygon.
+    if u.pid is None:
+        return True
+    poly = polygons[u.pid]
+    m = len(poly)
+    a = (u.x, u.y)
+    b = (v.x, v.y)
+    o1 = orientation(a, b, poly[(u.idx - 1) % m])
+    o2 = orientation(a, b, poly[(u.idx + 1) % m])
+    return not ((o1 < -1e-9 and o2 > 1e-9) or (o1 > 1e-9 and o2 < -1e-9))
+
+def is_bitangent(u: Node, v: Node, polygons) -> bool:
+    # Around convex obstacles a shortest path only bends at vertices where it is
+    # tangent to the obstacle, so only pairs tangent at both ends are needed.
+    return is_tangent(u, v, polygons) and is_tangent(v, u, polygons)
+
+def build_nodes(S, G, polygons) -> List[Node]:
     nodes: List[Node] = []
     nodes.append(Node(S[0], S[1], None, None, "S"))
     nodes.append(Node(G[0], G[1], None, None, "G"))
     for pid, poly in enumerate(polygons):
         for idx, (x, y) in enumerate(poly):
             nodes.append(Node(x, y, pid, idx, "V"))
+    return nodes
+
+def _assemble_adj(nodes: List[Node], pairs) -> Dict[int, List[Tuple[int, float]]]:
+    # Same insertion order as the pairwise loop in build_graph: pairs (i, j), i < j, ascending.
+    adj: Dict[int, List[Tuple[int, float]]] = defaultdict(list)
+    for i, j in pairs:
+        u, v = nodes[i], nodes[j]
+        w = dist((u.x, u.y), (v.x, v.y))
+        adj[i].append((j, w))
+        adj[j].append((i, w))
+    return adj
+
+def _ray_hit(p, dx: float, dy: float, c, d) -> float:
+    # Parameter t where the ray p + t*(dx, dy) meets the line through edge cd.
+    ex, ey = d[0] - c[0], d[1] - c[1]
+    den = dx * ey - dy * ex
+    if den == 0:
+        return math.inf
+    return ((c[0] - p[0]) * ey - (c[1] - p[1]) * ex) / den
+
+def _edges_cross(all_edges, index: EdgeGrid) -> bool:
+    # True if two polygon edges meet anywhere other than at a shared endpoint.
+    def same_point(p, q) -> bool:
+        return abs(p[0] - q[0]) <= 1e-9 and abs(p[1] - q[1]) <= 1e-9
+
+    for edge in all_edges:
+        a, b, _ = edge
+        for other_edge in index.candidates(a, b):
+            if other_edge is edge:
+                continue
+            c, d, _ = other_edge
+            shared = same_point(a, c) or same_point(a, d) or same_point(b, c) or same_point(b, d)
+            if shared:
+                if proper_intersection(a, b, c, d):
+                    return True
+                # collinear overlap of two edges that share an endpoint
+                other = d if (same_point(a, c) or same_point(b, c)) else c
+                far = a if (same_point(b, c) or same_point(b, d)) else b
+                if abs(orientation(a, b, other)) <= 1e-9 and (on_segment(a, b, other) or on_segment(c, d, far)):
+                    return True
+            elif segments_intersect(a, b, c, d):
+                return True
+    return False
+
+def sweep_visible_from(i: int, nodes: List[Node], all_edges, ends, incident, polygons):
+    # Lee's rotational sweep around node i. Returns (visible, undecided): the nodes the
+    # sweep proves visible, and the nodes in degenerate position (collinear with another
+    # node, lying on an edge, ...) that must be checked with is_visible. The active
+    # edges crossing the sweep ray are kept in a binary heap ordered by distance from
+    # node i along the ray, with pos[k] = slot of edge k so any edge can be removed in
+    # O(log n). Polygon edges do not cross (build_graph checks), so two active edges
+    # keep their order for as long as both cross the ray; comparisons always use a
+    # probe ray between two events, which every active edge crosses strictly. Only
+    # the nearest edge (heap[0]) is ever queried. A sweep is O(n log n), so the whole
+    # graph is O(n^2 log n).
+    u = nodes[i]
+    p = (u.x, u.y)
+    tol = 1e-9
+    visible: List[int] = []
+    events = []
+    twins: List[int] = []
+    for j, v in enumerate(nodes):
+        if j == i:
+            continue
+        dx, dy = v.x - p[0], v.y - p[1]
+        if abs(dx) <= 1e-9 and abs(dy) <= 1e-9:
+            # a twin node on top of p has no direction
+            twins.append(j)
+            continue
+        events.append((math.atan2(dy, dx), math.hypot(dx, dy), j))
+    if not events:
+        return visible, twins
+    events.sort()
+
+    def collinear(j: int, k: int) -> bool:
+        ax, ay = nodes[j].x - p[0], nodes[j].y - p[1]
+        bx, by = nodes[k].x - p[0], nodes[k].y - p[1]
+        cross = ax * by - ay * bx
+        return abs(cross) <= max(tol * math.hypot(ax, ay) * math.hypot(bx, by), 1e-8) and ax * bx + ay * by > 0
+
+    # Group events on the same ray; any group with more than one node is degenerate.
+    groups: List[List[int]] = []
+    angles: List[float] = []
+    for ang, r, j in events:
+        if groups and collinear(groups[-1][-1], j):
+            groups[-1].append(j)
+        else:
+            groups.append([j])
+            angles.append(ang)
+    if len(groups) > 1 and collinear(groups[-1][0], groups[0][0]):
+        # the ray at angle pi is split by atan2 into both ends of the order
+        groups[0] = groups.pop() + groups[0]
+        angles.pop()
+    gid = {w: g for g, members in enumerate(groups) for w in members}
+
+    # Start the sweep in the middle of the widest angular gap between groups.
+    m = len(groups)
+    gaps = [((angles[(k + 1) % m] - angles[k]) % (2 * math.pi) or 2 * math.pi, k) for k in range(m)]
+    _, k0 = max(gaps)
+    start = (k0 + 1) % m
+
+    def probe_after(k: int) -> Tuple[float, float]:
+        a0 = angles[k]
+        a1 = angles[(k + 1) % m]
+        gap = (a1 - a0) % (2 * math.pi) or 2 * math.pi
+        a = a0 + gap / 2
+        return math.cos(a), math.sin(a)
+
+    def same_point(q) -> bool:
+        return abs(q[0] - p[0]) <= 1e-9 and abs(q[1] - p[1]) <= 1e-9
+
+    # Edges touching p (by coordinates) are ignored by is_visible; an edge passing
+    # through p blocks every direction, and a node on top of p is degenerate too.
+    own = set(incident.get(i, ()))
+    for k, (c, d, _) in enumerate(all_edges):
+        if k in own or same_point(c) or same_point(d):
+            own.add(k)
+            continue
+        if on_segment(c, d, p):
+            return [], twins + [j for _, _, j in events]
+
+    dx, dy = probe_after(k0)
+    hits = []
+    for k, (c, d, _) in enumerate(all_edges):
+        if k in own:
+            continue
+        sc = dx * (c[1] - p[1]) - dy * (c[0] - p[0])
+        sd = dx * (d[1] - p[1]) - dy * (d[0] - p[0])
+        if sc * sd < 0:
+            t = _ray_hit(p, dx, dy, c, d)
+            if t > 0:
+                hits.append((t, k))
+    hits.sort()
+    # a list sorted by distance is already a valid heap
+    active = [k for _, k in hits]
+    pos = {k: slot for slot, k in enumerate(active)}
+    ray = [dx, dy]
+    hit: Dict[int, float] = {}  # distance of edge k along ray, cleared when ray moves
+    undecided = twins
+
+    def along(k: int) -> float:
+        t = hit.get(k)
+        if t is None:
+            c, d, _ = all_edges[k]
+            t = hit[k] = _ray_hit(p, ray[0], ray[1], c, d)
+        return t
+
+    def sift_up(slot: int) -> None:
+        k = active[slot]
+        t = along(k)
+        while slot > 0:
+            parent = (slot - 1) >> 1
+            q = active[parent]
+            if t >= along(q):
+                break
+            active[slot] = q
+            pos[q] = slot
+            slot = parent
+        active[slot] = k
+        pos[k] = slot
+
+    def sift_down(slot: int) -> None:
+        k, size = active[slot], len(active)
+        t = along(k)
+        while True:
+            child = 2 * slot + 1
+            if child >= size:
+                break
+            q, tq = active[child], along(active[child])
+            if child + 1 < size:
+                t2 = along(active[child + 1])
+                if t2 < tq:
+                    child, q, tq = child + 1, active[child + 1], t2
+            if t <= tq:
+                break
+            active[slot] = q
+            pos[q] = slot
+            slot = child
+        active[slot] = k
+        pos[k] = slot
+
+    def insert(k: int) -> None:
+        active.append(k)
+        sift_up(len(active) - 1)
+
+    def remove(k: int) -> None:
+        slot = pos.pop(k)
+        last = active.pop()
+        if slot < len(active):
+            active[slot] = last
+            if slot > 0 and along(last) < along(active[(slot - 1) >> 1]):
+                sift_up(slot)
+            else:
+                sift_down(slot)
+
+    for step in range(m):
+        g = (start + step) % m
+        members = groups[g]
+        # ray still holds the probe before this event
+        for w in members:
+            for k in incident.get(w, ()):
+                if k in pos:
+                    remove(k)
+        for w in members:
+            v = nodes[w]
+            if len(members) > 1:
+                undecided.append(w)
+                continue
+            if u.pid is not None and v.pid == u.pid and not adjacent_indices(len(polygons[u.pid]), u.idx, v.idx):
+                continue
+            if not active:
+                visible.append(w)
+                continue
+            c, d, _ = all_edges[active[0]]
+            t = _ray_hit(p, v.x - p[0], v.y - p[1], c, d)
+            if abs(t - 1) <= 1e-9:
+                undecided.append(w)
+            elif t > 1:
+                visible.append(w)
+        ray[0], ray[1] = probe_after(g)
+        hit.clear()
+        for w in members:
+            v = nodes[w]
+            for k in incident.get(w, ()):
+                if k in own:
+                    continue
+                a, b = ends[k]
+                x = nodes[b] if a == w else nodes[a]
+                if gid[b if a == w else a] == gid[w]:
+                    # edge along the sweep ray: both endpoints are already undecided
+                    continue
+                o = orientation(p, (v.x, v.y), (x.x, x.y))
+                if abs(o) <= 1e-9:
+                    # nearly collinear but not grouped: give up on the sweep for this node
+                    return [], twins + [j for _, _, j in events]
+                if o > 0 and k not in pos:
+                    insert(k)
+    return visible, undecided
 
+VISGRAPH_METHODS = ("grid", "naive", "sweep", "numpy")
+
+def build_graph(S, G, polygons, method: str = "grid", jobs: int = 1, reduced: bool = False):
+    # method: "grid" tests each pair against an EdgeGrid, "naive" against every edge,
+    # "sweep" runs a rotational sweep from every node (pairs in degenerate position
+    # fall back to is_visible with the grid), "numpy" tests blocks of pairs against
+    # every edge with EdgeArrays. All methods return the same adj, and so does any
+    # number of jobs (worker processes, see _parallel_pairs). reduced keeps only the
+    # bitangent pairs (reduced visibility graph): fewer edges, same shortest paths
+    # among disjoint convex polygons (an S or G inside an obstacle gets no path,
+    # where the full graph would cut through the interior).
+    nodes = build_nodes(S, G, polygons)
     all_edges = build_edges_from_polygons(polygons)
+    index = EdgeGrid(all_edges) if method in ("grid", "sweep") else None
+    if method == "sweep" and _edges_cross(all_edges, index):
+        method = "grid"
+    if jobs > 1:
+        pairs = _parallel_pairs(S, G, polygons, method, jobs, reduced)
+    else:
+        pairs = visible_pairs(nodes, all_edges, polygons, method, index, range(len(nodes)), reduced)
+    return nodes, _assemble_adj(nodes, pairs)
 
-    # Build adjacency list with weights
+def visible_pairs(nodes: List[Node], all_edges, polygons, method: str, index: Optional[EdgeGrid], rows: range,
+                  reduced: bool = False):
+    # Visible pairs (i, j), i < j, for the rows i in rows, in ascending order. With
+    # reduced only bitangent pairs are kept; the pairwise methods test that first,
+    # since it is much cheaper than is_visible.
+    if method in ("sweep", "numpy"):
+        if method == "sweep":
+            pairs = _sweep_pairs(nodes, all_edges, polygons, index, rows)
+        else:
+            pairs = _numpy_pairs(nodes, all_edges, polygons, rows)
+        for i, j in pairs:
+            if not reduced or is_bitangent(nodes[i], nodes[j], polygons):
+                yield i, j
+        return
     n = len(nodes)
-    adj: Dict[int, List[Tuple[int, float]]] = defaultdict(list)
+    for i in rows:
+        for j in range(i + 1, n):
+            if reduced and not is_bitangent(nodes[i], nodes[j], polygons):
+                continue
+            if is_visible(nodes[i], nodes[j], all_edges, polygons, index):
+                yield i, j
+
+def _numpy_pairs(nodes: List[Node], all_edges, polygons, rows: range, block: int = 1 << 18):
+    # Visible pairs (i, j), i < j, i in rows, in ascending order, from boolean masks
+    # over blocks of pairs. block bounds the size of the (pairs x edges) masks.
+    import numpy as np
+    n = len(nodes)
+    xy = np.array([(v.x, v.y) for v in nodes], dtype=np.float64).reshape(-1, 2)
+    pid = np.array([-1 if v.pid is None else v.pid for v in nodes])
+    idx = np.array([-1 if v.idx is None else v.idx for v in nodes])
+    size = np.array([0 if v.pid is None else len(polygons[v.pid]) for v in nodes])
+    # the pairs (i, j), j > i, of each row, row after row
+    r = np.arange(rows.start, rows.stop)
+    counts = n - 1 - r
+    I = np.repeat(r, counts)
+    J = np.arange(len(I)) - np.repeat(np.cumsum(counts) - counts, counts) + np.repeat(r + 1, counts)
+
+    # Rules of is_visible that do not depend on the edges.
+    keep = (xy[I, 0] != xy[J, 0]) | (xy[I, 1] != xy[J, 1])
+    same_poly = (pid[I] >= 0) & (pid[I] == pid[J])
+    m = np.maximum(size[I], 1)
+    adjacent = ((idx[I] - idx[J]) % m == 1) | ((idx[J] - idx[I]) % m == 1)
+    keep &= ~same_poly | adjacent
+    I, J = I[keep], J[keep]
+    if not all_edges:
+        yield from zip(I.tolist(), J.tolist())
+        return
+
+    arrays = EdgeArrays(all_edges)
+    step = max(1, block // len(all_edges))
+    for lo in range(0, len(I), step):
+        bi, bj = I[lo:lo + step], J[lo:lo + step]
+        visible = ~arrays.blocked(xy[bi], xy[bj]).any(axis=1)
+        yield from zip(bi[visible].tolist(), bj[visible].tolist())
+
+def edge_ends(polygons, all_edges):
+    # Node ids (as numbered by build_nodes) of each polygon edge, and the edges
+    # incident to each node.
+    offsets = [2]
+    for poly in polygons:
+        offsets.append(offsets[-1] + len(poly))
+    ends = []
+    incident: Dict[int, List[int]] = defaultdict(list)
+    for k, (_, _, pid) in enumerate(all_edges):
+        # edge k starts at vertex k of the concatenated polygons (node k + 2)
+        first = offsets[pid]
+        a = k + 2
+        b = first + (a - first + 1) % len(polygons[pid])
+        ends.append((a, b))
+        incident[a].append(k)
+        incident[b].append(k)
+    return ends, incident
+
+def _sweep_pairs(nodes: List[Node], all_edges, polygons, index: EdgeGrid, rows: range):
+    ends, incident = edge_ends(polygons, all_edges)
+    for i in rows:
+        visible, undecided = sweep_visible_from(i, nodes, all_edges, ends, incident, polygons)
+        found = {j for j in visible if j > i}
+        for j in undecided:
+            if j > i and is_visible(nodes[i], nodes[j], all_edges, polygons, index):
+                found.add(j)
+        for j in sorted(found):
+            yield i, j
+
+# Per-process state of the parallel build: (nodes, all_edges, polygons, method, index, reduced),
+# rebuilt once per worker from the shared coordinate block.
+_WORKER_STATE = None
+
+def _init_worker(shm_name: str, sizes: List[int], method: str, reduced: bool) -> None:
+    global _WORKER_STATE
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        coords = shm.buf[:8 * (4 + 2 * sum(sizes))].cast("d").tolist()
+    finally:
+        shm.close()
+    S, G = (coords[0], coords[1]), (coords[2], coords[3])
+    polygons = []
+    k = 4
+    for m in sizes:
+        polygons.append([(coords[k + 2 * t], coords[k + 2 * t + 1]) for t in range(m)])
+        k += 2 * m
+    nodes = build_nodes(S, G, polygons)
+    all_edges = build_edges_from_polygons(polygons)
+    index = EdgeGrid(all_edges) if method in ("grid", "sweep") else None
+    _WORKER_STATE = (nodes, all_edges, polygons, method, index, reduced)
+
+def _rows_task(rows: Tuple[int, int]) -> bytes:
+    nodes, all_edges, polygons, method, index, reduced = _WORKER_STATE
+    out = array("i")
+    for i, j in visible_pairs(nodes, all_edges, polygons, method, index, range(*rows), reduced):
+        out.append(i)
+        out.append(j)
+    return out.tobytes()
+
+def _row_blocks(n: int, count: int) -> List[Tuple[int, int]]:
+    # Contiguous row ranges with about the same number of pairs each (row i has n-1-i).
+    target = max(1, (n * (n - 1) // 2) // max(1, count))
+    blocks, lo, acc = [], 0, 0
     for i in range(n):
-        for j in range(i+1, n):
-            u, v = nodes[i], nodes[j]
-            if is_visible(u, v, all_edges, polygons):
-                w = dist((u.x, u.y), (v.x, v.y))
-                adj[i].append((j, w))
-                adj[j].append((i, w))
-    return nodes, adj
+        acc += n - 1 - i
+        if acc >= target:
+            blocks.append((lo, i + 1))
+            lo, acc = i + 1, 0
+    if lo < n:
+        blocks.append((lo, n))
+    return blocks
+
+def _parallel_pairs(S, G, polygons, method: str, jobs: int, reduced: bool = False):
+    # The pair space is cut into row blocks (several per job, for load balancing)
+    # evaluated in a process pool. S, G and the polygon vertices go into one
+    # read-only shared memory block that every worker reads once. Blocks come back
+    # in submission order, so the pairs are in the same ascending (i, j) order as
+    # the serial loop.
+    coords = array("d", [S[0], S[1], G[0], G[1]])
+    for poly in polygons:
+        for x, y in poly:
+            coords.append(x)
+            coords.append(y)
+    sizes = [len(poly) for poly in polygons]
+    n = 2 + sum(sizes)
+    shm = shared_memory.SharedMemory(create=True, size=len(coords) * coords.itemsize)
+    try:
+        shm.buf[:len(coords) * coords.itemsize] = coords.tobytes()
+        ctx = mp.get_context("fork") if "fork" in mp.get_all_start_methods() else mp.get_context()
+        with ctx.Pool(jobs, _init_worker, (shm.name, sizes, method, reduced)) as pool:
+            for chunk in pool.imap(_rows_task, _row_blocks(n, 4 * jobs)):
+                flat = array("i")
+                flat.frombytes(chunk)
+                yield from zip(flat[0::2], flat[1::2])
+    finally:
+        shm.close()
+        shm.unlink()
 
 # -----------------------------
 # Search algorithms
@@ -169,92 +715,327 @@ def reconstruct_path(parents: Dict[int,int], goal: int):
         cur = parents.get(cur, None)
     return list(reversed(path))
 
-def bfs(adj, start: int, goal: int):
+# stats: see search_stats.py at the repository root.
+def bfs(adj, start: int, goal: int, stats=None):
+    t0 = time.perf_counter()
     q = deque([start])
     parents = {start: None}
+    path = None
+    expanded = generated = 0
+    peak = 1
     while q:
         u = q.popleft()
+        expanded += 1
         if u == goal:
-            return reconstruct_path(parents, goal)
-        for v, _ in adj[u]:
+            path = reconstruct_path(parents, goal)
+            break
+        nbrs = adj[u]
+        generated += len(nbrs)
+        for v, _ in nbrs:
             if v not in parents:
                 parents[v] = u
                 q.append(v)
-    return None
+        if len(q) > peak:
+            peak = len(q)
+    if stats is not None:
+        stats.add(expanded=expanded, generated=generated, pushes=len(parents), pops=expanded,
+                  peak_frontier=peak, wall_time=time.perf_counter() - t0)
+    return path
 
-def dfs(adj, start: int, goal: int):
+def dfs(adj, start: int, goal: int, stats=None):
+    t0 = time.perf_counter()
     stack = [start]
     parents = {start: None}
+    path = None
+    expanded = generated = 0
+    peak = 1
     while stack:
         u = stack.pop()
+        expanded += 1
         if u == goal:
-            return reconstruct_path(parents, goal)
-        for v, _ in adj[u]:
+            path = reconstruct_path(parents, goal)
+            break
+        nbrs = adj[u]
+        generated += len(nbrs)
+        for v, _ in nbrs:
             if v not in parents:
                 parents[v] = u
                 stack.append(v)
-    return None
+        if len(stack) > peak:
+            peak = len(stack)
+    if stats is not None:
+        stats.add(expanded=expanded, generated=generated, pushes=len(parents), pops=expanded,
+                  peak_frontier=peak, wall_time=time.perf_counter() - t0)
+    return path
 
-def ucs(adj, start: int, goal: int):
+def ucs(adj, start: int, goal: int, stats=None):
+    t0 = time.perf_counter()
     pq = [(0.0, start)]
     dist_map = {start: 0.0}
     parents = {start: None}
     visited = set()
+    path = None
+    pops = stale = generated = 0
+    pushes = peak = 1
     while pq:
         g, u = heapq.heappop(pq)
+        pops += 1
         if u in visited: 
+            stale += 1
             continue
         visited.add(u)
         if u == goal:
-            return reconstruct_path(parents, goal)
-        for v, w in adj[u]:
+            path = reconstruct_path(parents, goal)
+            break
+        nbrs = adj[u]
+        generated += len(nbrs)
+        for v, w in nbrs:
             ng = g + w
             if v not in dist_map or ng < dist_map[v] - 1e-12:
                 dist_map[v] = ng
                 parents[v] = u
                 heapq.heappush(pq, (ng, v))
-    return None
+                pushes += 1
+        if len(pq) > peak:
+            peak = len(pq)
+    if stats is not None:
+        stats.add(expanded=pops - stale, generated=generated, pushes=pushes, pops=pops, stale=stale,
+                  peak_frontier=peak, wall_time=time.perf_counter() - t0)
+    return path
 
-def greedy_best_first(adj, nodes, start: int, goal: int):
+def greedy_best_first(adj, nodes, start: int, goal: int, stats=None):
+    t0 = time.perf_counter()
     def h(i): 
         return dist((nodes[i].x, nodes[i].y), (nodes[goal].x, nodes[goal].y))
+    if stats is not None:
+        h = stats.timed(h)
     pq = [(h(start), start)]
     parents = {start: None}
     visited = set()
+    path = None
+    pops = stale = generated = 0
+    pushes = peak = 1
     while pq:
         _, u = heapq.heappop(pq)
+        pops += 1
         if u in visited:
+            stale += 1
             continue
         visited.add(u)
         if u == goal:
-            return reconstruct_path(parents, goal)
-        for v, _w in adj[u]:
+            path = reconstruct_path(parents, goal)
+            break
+        nbrs = adj[u]
+        generated += len(nbrs)
+        for v, _w in nbrs:
             if v not in visited and v not in parents:
                 parents[v] = u
                 heapq.heappush(pq, (h(v), v))
-    return None
+                pushes += 1
+        if len(pq) > peak:
+            peak = len(pq)
+    if stats is not None:
+        stats.add(expanded=pops - stale, generated=generated, pushes=pushes, pops=pops, stale=stale,
+                  peak_frontier=peak, wall_time=time.perf_counter() - t0)
+    return path
 
-def astar(adj, nodes, start: int, goal: int):
+def astar(adj, nodes, start: int, goal: int, stats=None):
+    t0 = time.perf_counter()
     def h(i): 
         return dist((nodes[i].x, nodes[i].y), (nodes[goal].x, nodes[goal].y))
+    if stats is not None:
+        h = stats.timed(h)
     pq = [(h(start), 0.0, start)]  # (f, g, node)
     best_g = {start: 0.0}
     parents = {start: None}
     closed = set()
+    path = None
+    pops = stale = generated = 0
+    pushes = peak = 1
     while pq:
         f, g, u = heapq.heappop(pq)
+        pops += 1
         if u in closed:
+            stale += 1
             continue
         closed.add(u)
         if u == goal:
-            return reconstruct_path(parents, goal)
-        for v, w in adj[u]:
+            path = reconstruct_path(parents, goal)
+            break
+        nbrs = adj[u]
+        generated += len(nbrs)
+        for v, w in nbrs:
             ng = g + w
             if v not in best_g or ng < best_g[v] - 1e-12:
                 best_g[v] = ng
                 parents[v] = u
                 heapq.heappush(pq, (ng + h(v), ng, v))
-    return None
+                pushes += 1
+        if len(pq) > peak:
+            peak = len(pq)
+    if stats is not None:
+        stats.add(expanded=pops - stale, generated=generated, pushes=pushes, pops=pops, stale=stale,
+                  peak_frontier=peak, wall_time=time.perf_counter() - t0)
+    return path
+
+# -----------------------------
+# Reusable obstacle graph
+# -----------------------------
+OBSTACLE_MAGIC = b"NMAIVIS\0"
+OBSTACLE_VERSION = 1
+_OBSTACLE_HEADER = struct.Struct("<8sIIIII")  # magic, version, polygons, vertices, adj entries, flags
+_FLAG_CROSSING = 1
+_FLAG_REDUCED = 2
+
+class _LayeredAdj:
+    # adj view for one query: the edges of S and G in front of the stored obstacle edges,
+    # which is the order build_graph appends them in.
+    def __init__(self, base: List[List[Tuple[int, float]]], extra: Dict[int, List[Tuple[int, float]]]):
+        self.base = base
+        self.extra = extra
+
+    def __getitem__(self, u: int) -> List[Tuple[int, float]]:
+        more = self.extra.get(u)
+        return self.base[u] if more is None else more + self.base[u]
+
+class ObstacleGraph:
+    # Visibility graph between polygon vertices only, built once and reused for many
+    # start/goal queries. Node ids follow build_graph: 0 and 1 are the S and G of the
+    # current query, polygon vertices start at 2. A query only computes what S and G
+    # see (one rotational sweep each), so the search runs on exactly the adj that
+    # build_graph(S, G, polygons) would have built.
+    def __init__(self, polygons, adj: List[List[Tuple[int, float]]], crossing: bool, reduced: bool = False):
+        self.polygons = polygons
+        self.adj = adj  # adj[i] for every node id; adj[0] and adj[1] stay empty
+        self.crossing = crossing  # polygon edges cross: sweeps are not valid
+        self.reduced = reduced  # bitangent edges only, for S and G too
+        self.all_edges = build_edges_from_polygons(polygons)
+        self.index = EdgeGrid(self.all_edges)
+        self.ends, self.incident = edge_ends(polygons, self.all_edges)
+        self.nodes = build_nodes((0.0, 0.0), (0.0, 0.0), polygons)
+
+    @classmethod
+    def build(cls, polygons, method: str = "grid", jobs: int = 1, reduced: bool = False) -> "ObstacleGraph":
+        # Pairs of polygon vertices do not depend on S and G, so build with both parked
+        # on the first vertex and drop their edges.
+        park = polygons[0][0] if polygons else (0.0, 0.0)
+        nodes, full = build_graph(park, park, polygons, method, jobs, reduced)
+        adj = [[], []] + [[(j, w) for j, w in full[i] if j >= 2] for i in range(2, len(nodes))]
+        all_edges = build_edges_from_polygons(polygons)
+        crossing = _edges_cross(all_edges, EdgeGrid(all_edges))
+        return cls(polygons, adj, crossing, reduced)
+
+    def num_edges(self) -> int:
+        return sum(len(a) for a in self.adj) // 2
+
+    def query_graph(self, S, G):
+        # (nodes, adj) for one start/goal pair.
+        nodes = list(self.nodes)
+        nodes[0] = Node(S[0], S[1], None, None, "S")
+        nodes[1] = Node(G[0], G[1], None, None, "G")
+        pairs = []
+        for i in (0, 1):
+            if self.crossing:
+                found = [j for j in range(i + 1, len(nodes))
+                         if is_visible(nodes[i], nodes[j], self.all_edges, self.polygons, self.index)]
+            else:
+                visible, undecided = sweep_visible_from(i, nodes, self.all_edges, self.ends, self.incident,
+                                                        self.polygons)
+                found = {j for j in visible if j > i}
+                found.update(j for j in undecided
+                             if j > i and is_visible(nodes[i], nodes[j], self.all_edges, self.polygons, self.index))
+                found = sorted(found)
+            pairs.extend((i, j) for j in found
+                         if not self.reduced or is_bitangent(nodes[i], nodes[j], self.polygons))
+        return nodes, _LayeredAdj(self.adj, _assemble_adj(nodes, pairs))
+
+    def query(self, S, G, stats=None):
+        # A* from S to G; returns (nodes, path) like build_graph + astar.
+        nodes, adj = self.query_graph(S, G)
+        return nodes, astar(adj, nodes, 0, 1, stats)
+
+    def batch(self, queries, stats=None) -> List[dict]:
+        # Answer (S, G) queries in order, with the latency of each one in seconds.
+        results = []
+        for S, G in queries:
+            t0 = time.perf_counter()
+            nodes, path = self.query(S, G, stats)
+            seconds = time.perf_counter() - t0
+            results.append({
+                "start": list(S), "goal": list(G),
+                "cost": None if path is None else path_length(nodes, path),
+                "path": [] if path is None else [[nodes[i].x, nodes[i].y] for i in path],
+                "seconds": seconds,
+            })
+        return results
+
+    def save(self, path: str) -> None:
+        if sys.byteorder != "little":
+            raise ValueError("Obstacle graph files require a little-endian machine")
+        sizes = array("i", (len(poly) for poly in self.polygons))
+        coords = array("d", (c for poly in self.polygons for v in poly for c in v))
+        offsets = array("q", [0])
+        nbrs = array("i")
+        weights = array("d")
+        for i in range(2, len(self.adj)):
+            for j, w in self.adj[i]:
+                nbrs.append(j)
+                weights.append(w)
+            offsets.append(len(nbrs))
+        with open(path, "wb") as f:
+            f.write(_OBSTACLE_HEADER.pack(OBSTACLE_MAGIC, OBSTACLE_VERSION, len(sizes), len(coords) // 2,
+                                          len(nbrs),
+                                          _FLAG_CROSSING * self.crossing | _FLAG_REDUCED * self.reduced))
+            for a in (sizes, coords, offsets, nbrs, weights):
+                f.write(a.tobytes())
+
+    @classmethod
+    def load(cls, path: str) -> "ObstacleGraph":
+        with open(path, "rb") as f:
+            magic, version, P, V, A, flags = _OBSTACLE_HEADER.unpack(f.read(_OBSTACLE_HEADER.size))
+            if magic != OBSTACLE_MAGIC:
+                raise ValueError(f"{path} is not an obstacle graph file")
+            if version != OBSTACLE_VERSION:
+                raise ValueError(f"{path}: unsupported obstacle graph version {version}")
+
+            def read(code: str, count: int) -> array:
+                a = array(code)
+                a.frombytes(f.read(a.itemsize * count))
+                if len(a) != count:
+                    raise ValueError(f"{path} is truncated")
+                return a
+
+            sizes, coords = read("i", P), read("d", 2 * V)
+            offsets, nbrs, weights = read("q", V + 1), read("i", A), read("d", A)
+        polygons = []
+        k = 0
+        for m in sizes:
+            polygons.append([(coords[2 * (k + t)], coords[2 * (k + t) + 1]) for t in range(m)])
+            k += m
+        adj = [[], []] + [list(zip(nbrs[offsets[v]:offsets[v + 1]], weights[offsets[v]:offsets[v + 1]]))
+                          for v in range(V)]
+        return cls(polygons, adj, bool(flags & _FLAG_CROSSING), bool(flags & _FLAG_REDUCED))
+
+def read_point_queries(stream):
+    # One query per line: "Sx Sy Gx Gy" (whitespace or comma separated).
+    for line in stream:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        parts = line.replace(",", " ").split()
+        if len(parts) != 4:
+            raise ValueError(f"expected 'Sx Sy Gx Gy', got: {line}")
+        sx, sy, gx, gy = map(float, parts)
+        yield (sx, sy), (gx, gy)
+
+def report_latency(results: List[dict], stream=sys.stderr) -> None:
+    if not results:
+        print("0 queries", file=stream)
+        return
+    lat = sorted(r["seconds"] for r in results)
+    pct = lambda q: lat[min(len(lat) - 1, int(q * len(lat)))] * 1e3
+    print(f"{len(lat)} queries: mean {sum(lat) / len(lat) * 1e3:.2f}ms p50 {pct(0.5):.2f}ms "
+          f"p95 {pct(0.95):.2f}ms max {lat[-1] * 1e3:.2f}ms", file=stream)
 
 # -----------------------------
 # Printing
@@ -288,36 +1069,97 @@ def print_path(title: str, nodes: List[Node], path):
 # -----------------------------
 # Main
 # -----------------------------
+ALGOS = ["bfs", "dfs", "ucs", "greedy", "astar"]
+
 def main():
     parser = argparse.ArgumentParser(description="Visibility-graph search among convex polygon obstacles.")
-    parser.add_argument("--input", "-i", type=str, required=True, help="Path to input txt file.")
+    parser.add_argument("--input", "-i", type=str, help="Path to input txt file.")
     parser.add_argument("--algo", "-a", type=str, default="all",
-                        choices=["bfs","dfs","ucs","greedy","astar","all"],
+                        choices=ALGOS + ["all"],
                         help="Which algorithm to run.")
+    parser.add_argument("--visgraph", type=str, default="grid", choices=list(VISGRAPH_METHODS),
+                        help="Visibility graph construction: grid (spatial index), naive (all edges), "
+                             "sweep (rotational sweep per node) or numpy (vectorized, all edges).")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Worker processes for building the visibility graph (1 = serial).")
+    parser.add_argument("--reduced", action="store_true",
+                        help="Keep only bitangent edges (reduced visibility graph); same shortest paths "
+                             "among disjoint convex polygons.")
+    parser.add_argument("--stats", action="store_true",
+                        help="Print search counters (expanded, generated, heap pushes/pops, ...) per algorithm.")
+    parser.add_argument("--stats-json", metavar="FILE",
+                        help="Write the search counters as JSON to FILE ('-' for stdout).")
+    parser.add_argument("--build-obstacles", metavar="FILE",
+                        help="Build the visibility graph of the polygons in --input (without S and G) "
+                             "into FILE and exit.")
+    parser.add_argument("--obstacles", metavar="FILE",
+                        help="Answer --queries with A* on the obstacle graph stored in FILE.")
+    parser.add_argument("--queries", metavar="FILE",
+                        help="'Sx Sy Gx Gy' per line ('-' for stdin); one JSON result per line on stdout, "
+                             "latency summary on stderr.")
     args = parser.parse_args()
 
+    stats = {}
+    if args.stats or args.stats_json:
+        sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+        from search_stats import SearchStats, write_json
+        names = ["astar"] if args.obstacles else (ALGOS if args.algo == "all" else [args.algo])
+        stats = {name: SearchStats() for name in names}
+
+    def report_stats():
+        if args.stats:
+            for name, st in stats.items():
+                st.report(name)
+        if args.stats_json:
+            write_json(stats, args.stats_json)
+
+    if args.obstacles:
+        if not args.queries:
+            parser.error("--obstacles needs --queries")
+        graph = ObstacleGraph.load(args.obstacles)
+        src = sys.stdin if args.queries == "-" else open(args.queries, encoding="utf-8")
+        try:
+            results = graph.batch(read_point_queries(src), stats.get("astar"))
+        finally:
+            if src is not sys.stdin:
+                src.close()
+        for r in results:
+            print(json.dumps(r))
+        report_latency(results)
+        report_stats()
+        return
+    if not args.input:
+        parser.error("--input is required")
+
     with open(args.input, "r", encoding="utf-8") as f:
         text = f.read()
     N, S, G, polygons = parse_input(text)
 
-    nodes, adj = build_graph(S, G, polygons)
+    if args.build_obstacles:
+        graph = ObstacleGraph.build(polygons, args.visgraph, args.jobs, args.reduced)
+        graph.save(args.build_obstacles)
+        print(f"wrote {args.build_obstacles}: {len(graph.nodes) - 2} vertices, {graph.num_edges()} edges")
+        return
+
+    nodes, adj = build_graph(S, G, polygons, args.visgraph, args.jobs, args.reduced)
     start, goal = 0, 1
 
     if args.algo in ("bfs","all"):
-        p = bfs(adj, start, goal)
+        p = bfs(adj, start, goal, stats.get("bfs"))
         print_path("BFS (cạnh bằng nhau, không tối ưu độ dài):", nodes, p)
     if args.algo in ("dfs","all"):
-        p = dfs(adj, start, goal)
+        p = dfs(adj, start, goal, stats.get("dfs"))
         print_path("DFS (không đảm bảo ngắn nhất):", nodes, p)
     if args.algo in ("ucs","all"):
-        p = ucs(adj, start, goal)
+        p = ucs(adj, start, goal, stats.get("ucs"))
         print_path("UCS / Dijkstra (tối ưu độ dài):", nodes, p)
     if args.algo in ("greedy","all"):
-        p = greedy_best_first(adj, nodes, start, goal)
+        p = greedy_best_first(adj, nodes, start, goal, stats.get("greedy"))
         print_path("Greedy Best-First (tham lam theo heuristic):", nodes, p)
     if args.algo in ("astar","all"):
-        p = astar(adj, nodes, start, goal)
+        p = astar(adj, nodes, start, goal, stats.get("astar"))
         print_path("A* (heuristic khoảng cách thẳng):", nodes, p)
+    report_stats()
 
 if __name__ == "__main__":
     main()
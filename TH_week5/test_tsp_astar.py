@@ -0,0 +1,13 @@
+from tsp_astar import TSPSolverAStar, TSPSolverDP, TSPSolverLocalSearch, TSPSolverParallel
+
+
+def test_single_city_has_no_tour():
+    dist = [[0.0]]
+    solvers = [
+        TSPSolverAStar(dist, 0),
+        TSPSolverDP(dist, 0),
+        TSPSolverParallel(dist, 0, workers=1),
+        TSPSolverLocalSearch(dist=dist),
+    ]
+    for solver in solvers:
+        assert solver.solve() == (None, None), type(solver).__name__
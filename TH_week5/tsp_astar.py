@@ -1,7 +1,116 @@
 import argparse
 import heapq
+import os
+import struct
+import sys
+from array import array
+from collections import OrderedDict
 from math import inf
-from typing import List, Tuple, Optional
+from time import perf_counter
+from typing import Callable, List, Tuple, Optional
+
+
+# File nhi phan cho ma tran khoang cach (little-endian):
+#   header: magic(8) version(u32) reserved(u32) N(i64), sau do N*N so float64 theo hang
+BIN_MAGIC = b"NMAITSP\0"
+BIN_VERSION = 1
+NPY_MAGIC = b"\x93NUMPY"
+_BIN_HEADER = struct.Struct("<8sIIq")
+
+
+class _StateTable:
+    """
+    Bang bam dia chi mo (do tuyen tinh) cho g va parent cua cac trang thai da sinh,
+    dung khi bang day du qua lon. Khoa, g va parent nam trong ba mang array
+    ('q', 'd', 'b'), 17 byte moi o, thay vi dict chua doi tuong int/float rieng
+    (>100 byte moi trang thai). Bang gap doi khi day qua mot nua.
+    table[idx] doc/ghi g (inf neu chua co), table.parent[idx] doc/ghi parent (-1).
+    """
+
+    def __init__(self, bits: int = 12) -> None:
+        self._alloc(bits)
+        self.parent = _ParentView(self)
+
+    def _alloc(self, bits: int) -> None:
+        self.bits = bits
+        self.mask = (1 << bits) - 1
+        self.count = 0
+        self.keys = array("q", [-1]) * (1 << bits)
+        self.g = array("d", [inf]) * (1 << bits)
+        self.par = array("b", [-1]) * (1 << bits)
+
+    def slot(self, key: int) -> int:
+        """O cua key, hoac o trong ma key se duoc dat vao."""
+        keys, mask = self.keys, self.mask
+        # bam Fibonacci: idx lien tiep roi vao cac o xa nhau
+        i = ((key * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> (64 - self.bits)
+        while True:
+            k = keys[i]
+            if k == key or k == -1:
+                return i
+            i = (i + 1) & mask
+
+    def insert(self, key: int) -> int:
+        i = self.slot(key)
+        if self.keys[i] == -1:
+            if 2 * (self.count + 1) > len(self.keys):
+                self._grow()
+                i = self.slot(key)
+            self.keys[i] = key
+            self.count += 1
+        return i
+
+    def _grow(self) -> None:
+        keys, g, par = self.keys, self.g, self.par
+        self._alloc(self.bits + 1)
+        for i, key in enumerate(keys):
+            if key != -1:
+                j = self.slot(key)
+                self.keys[j], self.g[j], self.par[j] = key, g[i], par[i]
+                self.count += 1
+
+    def __getitem__(self, key: int) -> float:
+        return self.g[self.slot(key)]
+
+    def __setitem__(self, key: int, value: float) -> None:
+        i = self.insert(key)  # co the cap phat lai self.g
+        self.g[i] = value
+
+
+class _ParentView:
+    def __init__(self, table: _StateTable) -> None:
+        self.table = table
+
+    def __getitem__(self, key: int) -> int:
+        t = self.table
+        return t.par[t.slot(key)]
+
+    def __setitem__(self, key: int, value: int) -> None:
+        t = self.table
+        i = t.insert(key)
+        t.par[i] = value
+
+
+# Phan tu heap cua A* la mot so nguyen Python (~48 byte) thay cho tuple (f, g, idx)
+# (~150 byte): (key(f) << 64 | key(g)) << idx_bits | idx, voi key() doi so thuc
+# sang so nguyen 64 bit giu nguyen thu tu (bit IEEE-754; so am lat moi bit), nen
+# thu tu trong heap giong het thu tu tuple cu.
+_F64 = bytearray(8)
+_F64_D = memoryview(_F64).cast("d")
+_F64_Q = memoryview(_F64).cast("Q")
+_SIGN = 1 << 63
+_ALL64 = (1 << 64) - 1
+
+
+def _order_key(x: float) -> int:
+    _F64_D[0] = x
+    u = _F64_Q[0]
+    return u ^ _ALL64 if u & _SIGN else u | _SIGN
+
+
+def _from_order_key(k: int) -> float:
+    _F64_Q[0] = k ^ _SIGN if k & _SIGN else k ^ _ALL64
+    return _F64_D[0]
 
 
 class TSPSolverAStar:
@@ -10,136 +119,1065 @@ class TSPSolverAStar:
     tren tap cac thanh pho chua tham.
     """
 
-    def __init__(self, dist: List[List[float]], start: int = 0) -> None:
-        if not dist or any(len(row) != len(dist) for row in dist):
+    # So phan tu cu toi thieu trong heap truoc khi xem xet nen heap
+    COMPACT_MIN = 1 << 15
+    # Kich thuoc toi da (byte) cua bang g/parent cap phat truoc; lon hon thi dung
+    # _StateTable. A* thuong chi cham mot phan nho trong 2^(n-1)*(n-1) trang thai,
+    # bang day du chi nhanh hon bang bam ~10% tren de kho nen chi dung khi bang nho (n <= 18)
+    MAX_TABLE_BYTES = 1 << 25
+
+    def __init__(self, dist: List[List[float]], start: int = 0, cache_size: int = 1 << 16) -> None:
+        if len(dist) == 0 or any(len(row) != len(dist) for row in dist):
             raise ValueError("Ma tran khoang cach phai la NxN va khong rong")
         self.dist = dist
         self.n = len(dist)
         if not (0 <= start < self.n):
             raise ValueError("Chi so thanh pho bat dau khong hop le")
         self.start = start
+        # Dang list cua Python (truy cap tung phan tu nhanh hon ndarray/memmap);
+        # A* chi dung cho n nho nen ban sao nay khong dang ke
+        self._rows = dist.tolist() if hasattr(dist, "tolist") else dist
+        # nearest[c]: cac thanh pho khac c, sap xep tang dan theo dist[c][j]
+        self._nearest = [
+            sorted((j for j in range(self.n) if j != c), key=row.__getitem__)
+            for c, row in enumerate(self._rows)
+        ]
+        # Ma tran bat doi xung: MST tinh tren min(dist[u][v], dist[v][u]) va canh ve
+        # start la canh vao dist[j][start], de heuristic van chap nhan duoc
+        rows, n = self._rows, self.n
+        self.symmetric = all(rows[i][j] == rows[j][i] for i in range(n) for j in range(i))
+        if self.symmetric:
+            self._mst_rows = rows
+            self._nearest_to_start = self._nearest[start]
+        else:
+            self._mst_rows = [[min(rows[i][j], rows[j][i]) for j in range(n)] for i in range(n)]
+            self._nearest_to_start = sorted((j for j in range(n) if j != start), key=lambda j: rows[j][start])
+        # Cache LRU: mask cac dinh chua tham -> chi phi MST (chi phu thuoc vao tap nay)
+        self.cache_size = cache_size
+        self._mst_cache: "OrderedDict[int, float]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # chi cong don khi solve() co stats (xem _timed_heuristic)
+        self.heuristic_time = 0.0
 
     def mst_cost(self, nodes: List[int]) -> float:
         """
-        Tinh chi phi MST tren danh sach dinh nodes su dung Prim.
+        Tinh chi phi MST tren danh sach dinh nodes su dung Prim O(k^2)
+        voi vector key[v] = canh re nhat tu cay hien tai den v.
         """
-        if len(nodes) <= 1:
+        k = len(nodes)
+        if k <= 1:
             return 0.0
 
-        in_mst = {nodes[0]}
-        not_in_mst = set(nodes[1:])
+        rows = self._mst_rows
+        rest = nodes[1:]
+        key = [inf] * len(rest)
+        u = nodes[0]
         total = 0.0
 
-        while not_in_mst:
-            best_cost = inf
-            best_v = None
-            for u in in_mst:
-                for v in not_in_mst:
-                    c = self.dist[u][v]
-                    if c < best_cost:
-                        best_cost = c
-                        best_v = v
-            if best_v is None:
-                return 0.0
-            total += best_cost
-            in_mst.add(best_v)
-            not_in_mst.remove(best_v)
+        while rest:
+            # cap nhat key bang canh tu u (dinh vua them) va chon dinh co key nho nhat
+            row = rows[u]
+            best_i, best_c = 0, inf
+            for t, v in enumerate(rest):
+                c = row[v]
+                if c < key[t]:
+                    key[t] = c
+                else:
+                    c = key[t]
+                if c < best_c:
+                    best_i, best_c = t, c
+            total += best_c
+            u = rest[best_i]
+            # xoa phan tu best_i bang cach doi cho voi phan tu cuoi
+            rest[best_i] = rest[-1]
+            key[best_i] = key[-1]
+            rest.pop()
+            key.pop()
 
         return total
 
+    def _cached_mst(self, remaining_mask: int, remaining: List[int]) -> float:
+        cache = self._mst_cache
+        mst = cache.get(remaining_mask)
+        if mst is not None:
+            self.cache_hits += 1
+            cache.move_to_end(remaining_mask)
+            return mst
+        self.cache_misses += 1
+        mst = self.mst_cost(remaining)
+        if self.cache_size > 0:
+            cache[remaining_mask] = mst
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)
+        return mst
+
+    def _min_unvisited(self, city: int, visited_mask: int) -> float:
+        for j in self._nearest[city]:
+            if not (visited_mask >> j) & 1:
+                return self._rows[city][j]
+        return inf
+
+    def _min_to_start(self, visited_mask: int) -> float:
+        s = self.start
+        for j in self._nearest_to_start:
+            if not (visited_mask >> j) & 1:
+                return self._rows[j][s]
+        return inf
+
     def heuristic(self, current: int, visited_mask: int) -> float:
         """
         Heuristic A*:
           - Neu chua tham het:
-            MST tren cac dinh chua tham
+            MST tren cac dinh chua tham (canh vo huong min(d[u][v], d[v][u]))
             cong canh re nhat tu current den mot dinh chua tham
-            cong canh re nhat tu start den mot dinh chua tham
+            cong canh re nhat tu mot dinh chua tham ve start
           - Neu da tham het:
             chi phi can thiet de ve lai start
         """
         all_visited_mask = (1 << self.n) - 1
+        remaining_mask = all_visited_mask & ~visited_mask
 
-        if visited_mask == all_visited_mask:
-            return self.dist[current][self.start]
+        if not remaining_mask:
+            h = self._rows[current][self.start]
+        else:
+            remaining = [i for i in range(self.n) if (remaining_mask >> i) & 1]
+            mst = self._cached_mst(remaining_mask, remaining)
+            min_from_current = self._min_unvisited(current, visited_mask)
+            h = mst + min_from_current + self._min_to_start(visited_mask)
+        return h
 
-        remaining = [i for i in range(self.n) if not (visited_mask & (1 << i))]
-        if not remaining:
-            return self.dist[current][self.start]
+    def _timed_heuristic(self, current: int, visited_mask: int) -> float:
+        # heuristic() kem do thoi gian; solve() chi dung ban nay khi co stats
+        t0 = perf_counter()
+        h = self.heuristic(current, visited_mask)
+        self.heuristic_time += perf_counter() - t0
+        return h
 
-        mst = self.mst_cost(remaining)
-        min_from_current = min(self.dist[current][j] for j in remaining)
-        min_from_start = min(self.dist[self.start][j] for j in remaining)
-
-        return mst + min_from_current + min_from_start
+    def cache_hit_rate(self) -> float:
+        lookups = self.cache_hits + self.cache_misses
+        return self.cache_hits / lookups if lookups else 0.0
 
-    def solve(self) -> Tuple[Optional[float], Optional[List[int]]]:
+    def solve(
+        self,
+        time_limit: Optional[float] = None,
+        warm_start: bool = False,
+        on_incumbent: Optional[Callable[[float, List[int]], None]] = None,
+        stats=None,
+    ) -> Tuple[Optional[float], Optional[List[int]]]:
         """
         Chay A* de giai TSP.
+        Tham so:
+          - time_limit: dung sau so giay nay (tinh ca warm start) va tra ve tour tot
+            nhat da tim duoc; duoc kiem tra ca giua cac lan sinh trang thai con
+          - warm_start: dung tour lang gieng gan nhat + 2-opt/Or-opt lam can tren
+            ban dau, cat bo moi trang thai co f >= can tren
+          - on_incumbent(cost, tour): goi moi khi tim duoc tour tot hon
+          - stats: search_stats.SearchStats (thu muc goc), cong don so trang thai
+            mo rong, push/pop, kich thuoc heap lon nhat va thoi gian heuristic
         Tra ve:
           - best_cost: chi phi tour
           - best_path: danh sach thanh pho theo thu tu tham
+        Sau khi chay: self.lower_bound, self.gap (0 neu tour la toi uu), self.optimal.
         """
-        start_mask = 1 << self.start
-        start_state = (self.start, start_mask)
+        t_start = perf_counter()
+        deadline = None if time_limit is None else t_start + time_limit
+        h_time0 = self.heuristic_time
+        n, s = self.n, self.start
+        m = n - 1
+        rows = self._rows
+        heuristic = self.heuristic if stats is None else self._timed_heuristic
+        # Trang thai (city, mask) duoc ma hoa thanh mot so nguyen idx = cmask * m + cj:
+        #   cj    : chi so nen cua city trong cac thanh pho khac start (0..m-1)
+        #   cmask : mask cac thanh pho da tham, bo bit cua start
+        # Trang thai dac biet START: dang o start, chua di dau.
+        size = (1 << m) * m
+        START = size
+        # parent[idx] = chi so nen cua thanh pho truoc do (-1: di tu start);
+        # mask truoc do chinh la cmask bo bit cj nen khong can luu
+        if (size + 1) * 9 <= self.MAX_TABLE_BYTES:
+            g_arr = array("d", [inf]) * (size + 1)
+            parent = array("b", [-1]) * (size + 1)
+        else:
+            # n lon: bang day du khong vua bo nho, chi luu cac trang thai da sinh
+            table = _StateTable()
+            g_arr, parent = table, table.parent
+        # Phan tu heap: so nguyen dong goi (f, g, idx), xem _order_key
+        idx_bits = (size + 1).bit_length()
+        idx_mask = (1 << idx_bits) - 1
+        f_shift = idx_bits + 64
 
-        pq = []
-        g_start = 0.0
-        h_start = self.heuristic(self.start, start_mask)
-        heapq.heappush(pq, (g_start + h_start, g_start, self.start, start_mask))
+        def pack(f: float, g: float, idx: int) -> int:
+            return (_order_key(f) << 64 | _order_key(g)) << idx_bits | idx
 
-        best_g = {start_state: 0.0}
-        parent = {}
+        def entry_g(e: int) -> float:
+            return _from_order_key((e >> idx_bits) & _ALL64)
+        full = (1 << m) - 1
+        low = (1 << s) - 1
 
-        all_visited_mask = (1 << self.n) - 1
+        def real_mask(cmask: int) -> int:
+            return ((cmask & ~low) << 1) | (cmask & low) | (1 << s)
+
+        def unpack(cj: int) -> List[int]:
+            path = [s]
+            cmask = full
+            while cj != -1:
+                path.append(cj if cj < s else cj + 1)
+                prev = parent[cmask * m + cj]
+                cmask ^= 1 << cj
+                cj = prev
+            path.append(s)
+            path.reverse()
+            return path
+
+        # Can tren: tour tot nhat hien co (incumbent). Tour hoan chinh khong dua vao
+        # heap ma cap nhat truc tiep can tren.
+        best_cost, best_path = inf, None
+        if warm_start and m > 0:
+            best_path = improve_tour(rows, nearest_neighbour_tour(rows, s), deadline, self.symmetric)
+            best_cost = tour_cost(rows, best_path)
+            if on_incumbent:
+                on_incumbent(best_cost, best_path)
+
+        g_arr[START] = 0.0
+        pq = [pack(heuristic(s, 1 << s), 0.0, START)]
+        stale = 0
+        # Bo dem cho stats (skipped: phan tu cu bi bo qua khi pop)
+        pops = skipped = generated = 0
+        pushes = peak = 1
+        self.optimal = False
 
+        lower_bound = 0.0
+        timed_out = False
         while pq:
-            f, g, current, visited_mask = heapq.heappop(pq)
-            state = (current, visited_mask)
+            top = pq[0]
+            f = _from_order_key(top >> f_shift)
+            # f nho nhat trong heap la can duoi hop le (heuristic chap nhan duoc)
+            if f > lower_bound:
+                lower_bound = f
+            if f >= best_cost:
+                # moi trang thai con lai deu khong tot hon incumbent
+                pq = []
+                break
+            if deadline is not None and perf_counter() > deadline:
+                break
+            heapq.heappop(pq)
+            pops += 1
+            g, idx = entry_g(top), top & idx_mask
+            if g_arr[idx] < g:
+                stale -= 1
+                skipped += 1
+                continue
+
+            if idx == START:
+                cmask, cj, current = 0, -1, s
+            else:
+                cmask, cj = divmod(idx, m)
+                current = cj if cj < s else cj + 1
+            row = rows[current]
+
+            if cmask != full:
+                generated += m - bin(cmask).count("1")
+                visited_mask = real_mask(cmask)
+                for nj in range(m):
+                    # n lon: moi trang thai con can mot MST O(n^2), kiem tra thoi gian tung con.
+                    # Het gio giua chung: dua trang thai lai heap de can duoi va optimal van dung
+                    if deadline is not None and perf_counter() > deadline:
+                        heapq.heappush(pq, top)
+                        timed_out = True
+                        break
+                    bit = 1 << nj
+                    if cmask & bit:
+                        continue
+                    nxt = nj if nj < s else nj + 1
+                    new_g = g + row[nxt]
+                    new_idx = (cmask | bit) * m + nj
+                    old_g = g_arr[new_idx]
+                    if new_g < old_g:
+                        h = heuristic(nxt, visited_mask | (1 << nxt))
+                        if new_g + h >= best_cost:
+                            continue
+                        if old_g < inf:
+                            stale += 1
+                        g_arr[new_idx] = new_g
+                        parent[new_idx] = cj
+                        heapq.heappush(pq, pack(new_g + h, new_g, new_idx))
+                        pushes += 1
+                if timed_out:
+                    break
+            elif m > 0:
+                new_g = g + row[s]
+                if new_g < best_cost:
+                    best_cost, best_path = new_g, unpack(cj)
+                    if on_incumbent:
+                        on_incumbent(best_cost, best_path)
+
+            if len(pq) > peak:
+                peak = len(pq)
+            # Nen heap dinh ky: bo cac phan tu cu (g lon hon g tot nhat hien tai)
+            if stale > self.COMPACT_MIN and stale * 2 > len(pq):
+                pq = [e for e in pq if entry_g(e) <= g_arr[e & idx_mask]]
+                heapq.heapify(pq)
+                stale = 0
+
+        if stats is not None:
+            stats.add(expanded=pops - skipped, generated=generated, pushes=pushes, pops=pops, stale=skipped,
+                      peak_frontier=peak, heuristic_time=self.heuristic_time - h_time0,
+                      wall_time=perf_counter() - t_start)
+        self.optimal = not pq
+        self.lower_bound = best_cost if not pq else min(best_cost, lower_bound)
+        if best_path is None:
+            self.gap = inf
+            return None, None
+        self.gap = (best_cost - self.lower_bound) / best_cost if best_cost > 0 else 0.0
+        return best_cost, best_path
+
+
+class TSPSolverDP:
+    """
+    Giai TSP chinh xac bang quy hoach dong Held-Karp tren bitmask.
+
+    Cac thanh pho khac start duoc danh so lai 0..m-1 (m = n - 1).
+    dp[mask, j] = chi phi nho nhat di tu start, tham dung tap mask, ket thuc o j.
+    Bang dp la mang NumPy phang (2^m, m) danh chi so theo mask; cac mask duoc
+    xu ly theo tung lop popcount, moi lop cap nhat bang phep min vector hoa.
+    Bo nho: 2^m * m * itemsize (float64: n=20 ~ 80 MB, n=25 ~ 3.2 GB).
+    """
+
+    def __init__(self, dist, start: int = 0, reconstruct: bool = True, dtype=None) -> None:
+        import numpy as np
+
+        # Mang NumPy so thuc (ke ca memmap) duoc dung truc tiep, khong sao chep
+        d = np.asarray(dist)
+        if dtype is not None or d.dtype.kind != "f":
+            d = d.astype(dtype or np.float64, copy=False)
+        if d.ndim != 2 or d.shape[0] != d.shape[1] or d.shape[0] == 0:
+            raise ValueError("Ma tran khoang cach phai la NxN va khong rong")
+        self.n = d.shape[0]
+        if not (0 <= start < self.n):
+            raise ValueError("Chi so thanh pho bat dau khong hop le")
+        if self.n - 1 > 30:
+            raise ValueError("Held-Karp chi ho tro toi da 31 thanh pho")
+        self.dist = d
+        self.start = start
+        self.reconstruct = reconstruct
+
+    def solve(self) -> Tuple[Optional[float], Optional[List[int]]]:
+        import numpy as np
+
+        n, s, d = self.n, self.start, self.dist
+        if n == 1:
+            # nhu A*: mot thanh pho thi khong co tour
+            return None, None
+        others = np.array([c for c in range(n) if c != s])
+        m = len(others)
+        sub = d[np.ix_(others, others)]
+        full = (1 << m) - 1
+
+        dp = np.full((1 << m, m), np.inf, dtype=d.dtype)
+        parent = np.full((1 << m, m), -1, dtype=np.int8) if self.reconstruct else None
+        bits = 1 << np.arange(m)
+        dp[bits, np.arange(m)] = d[s, others]
 
-            if best_g.get(state, inf) < g:
+        # Nhom cac mask theo popcount
+        masks = np.arange(1 << m, dtype=np.int64)
+        popcount = np.zeros(1 << m, dtype=np.int8)
+        for b in range(m):
+            popcount += ((masks >> b) & 1).astype(np.int8)
+        order = np.argsort(popcount, kind="stable")
+        bounds = np.searchsorted(popcount[order], np.arange(m + 2))
+        del masks, popcount
+
+        for k in range(1, m):
+            layer = order[bounds[k]:bounds[k + 1]]
+            for j in range(m):
+                src = layer[(layer & bits[j]) == 0]
+                if len(src) == 0:
+                    continue
+                cand = dp[src] + sub[:, j]
+                best = cand.argmin(axis=1)
+                dst = src | bits[j]
+                dp[dst, j] = cand[np.arange(len(src)), best]
+                if parent is not None:
+                    parent[dst, j] = best
+
+        closing = dp[full] + d[others, s]
+        last = int(closing.argmin())
+        cost = float(closing[last])
+        if not np.isfinite(cost):
+            return None, None
+        if parent is None:
+            return cost, None
+
+        path = [s]
+        mask, j = full, last
+        while j != -1:
+            path.append(int(others[j]))
+            prev = int(parent[mask, j])
+            mask ^= 1 << j
+            j = prev
+        path.append(s)
+        path[1:-1] = path[-2:0:-1]
+        return cost, path
+
+
+class TSPSolverLocalSearch:
+    """
+    Giai gan dung TSP lon (hang nghin - hang chuc nghin thanh pho).
+
+      1. Danh sach ung vien: k thanh pho gan nhat cua moi thanh pho.
+      2. Tour ban dau: lang gieng gan nhat (uu tien danh sach ung vien).
+      3. Tim kiem cuc bo 2-opt + Or-opt voi "don't-look bits": hang doi cac
+         thanh pho can xem xet; thanh pho khong co buoc cai thien nao thi bi bo
+         ra, chi duoc dua lai khi canh ke no thay doi. Delta cua moi buoc duoc
+         tinh vector hoa (NumPy) tren toan bo k ung vien cung luc.
+
+    Dau vao: ma tran khoang cach (dist, doi xung) hoac toa do (coords, Nx2,
+    khoang cach Euclid tinh khi can, khong tao ma tran NxN).
+    Tour luu trong mang tour[pos] va pos[city]; dao doan luon chon phia ngan hon.
+    """
+
+    def __init__(self, dist=None, start: int = 0, coords=None, k: int = 8,
+                 time_limit: Optional[float] = None) -> None:
+        import numpy as np
+
+        if (dist is None) == (coords is None):
+            raise ValueError("Can dung mot trong hai: dist hoac coords")
+        if coords is not None:
+            xy = np.asarray(coords, dtype=np.float64)
+            if xy.ndim != 2 or xy.shape[1] != 2 or len(xy) == 0:
+                raise ValueError("Toa do phai la mang Nx2 va khong rong")
+            self.x, self.y = np.ascontiguousarray(xy[:, 0]), np.ascontiguousarray(xy[:, 1])
+            self.dist = None
+            self.n = len(xy)
+        else:
+            d = np.asarray(dist)
+            if d.dtype.kind != "f":
+                d = d.astype(np.float64)
+            if d.ndim != 2 or d.shape[0] != d.shape[1] or d.shape[0] == 0:
+                raise ValueError("Ma tran khoang cach phai la NxN va khong rong")
+            # 2-opt dao chieu doan tour nen chi dung voi khoang cach doi xung;
+            # kiem tra theo khoi hang de khong tao mang tam NxN
+            for lo in range(0, len(d), 1024):
+                if not np.allclose(d[lo:lo + 1024], d[:, lo:lo + 1024].T):
+                    raise ValueError("--method local chi ho tro ma tran khoang cach doi xung")
+            self.dist = d
+            self.n = d.shape[0]
+        if not (0 <= start < self.n):
+            raise ValueError("Chi so thanh pho bat dau khong hop le")
+        self.start = start
+        self.k = max(1, min(k, self.n - 1))
+        self.time_limit = time_limit
+        self.improvements = 0
+        self.timings = {}
+
+    def d(self, a, b):
+        """Khoang cach giua a va b (so nguyen hoac mang chi so, vector hoa)."""
+        import numpy as np
+
+        if self.dist is not None:
+            return self.dist[a, b].astype(np.float64)
+        return np.hypot(self.x[a] - self.x[b], self.y[a] - self.y[b])
+
+    def _rows(self, idx):
+        """Khoang cach tu cac thanh pho idx den moi thanh pho, dang (len(idx), n)."""
+        import numpy as np
+
+        if self.dist is not None:
+            return np.array(self.dist[idx], dtype=np.float64)
+        return np.hypot(self.x[idx, None] - self.x[None, :], self.y[idx, None] - self.y[None, :])
+
+    def _nearest_k(self, idx, rows, cols=None):
+        """k cot nho nhat moi hang cua rows (bo chinh no), sap xep tang dan."""
+        import numpy as np
+
+        k = self.k
+        if cols is None:
+            cols = np.arange(rows.shape[1])
+        rows[idx[:, None] == cols[None, :]] = np.inf
+        if k < rows.shape[1]:
+            part = np.argpartition(rows, k - 1, axis=1)[:, :k]
+        else:
+            part = np.argsort(rows, axis=1)[:, :k]
+        best = np.take_along_axis(rows, part, axis=1)
+        order = np.argsort(best, axis=1)
+        return cols[np.take_along_axis(part, order, axis=1)], np.take_along_axis(best, order, axis=1)
+
+    def _grid_candidates(self, out):
+        """
+        k lang gieng gan nhat theo luoi o vuong (chi cho toa do): moi o chua
+        ~256 diem duoc so voi cac diem trong 3x3 o xung quanh. Ket qua chi chac
+        chan dung khi khoang cach thu k khong vuot qua bien cua vung 3x3;
+        tra ve cac diem con lai de tinh lai bang cach vet can.
+        """
+        import numpy as np
+
+        x, y, n = self.x, self.y, self.n
+        x0, y0 = x.min(), y.min()
+        g = max(1, int((n / 256) ** 0.5))
+        size = max(x.max() - x0, y.max() - y0, 1e-12) / g * (1 + 1e-9)
+        tx = np.minimum(((x - x0) / size).astype(np.int64), g - 1)
+        ty = np.minimum(((y - y0) / size).astype(np.int64), g - 1)
+        tile = ty * g + tx
+        order = np.argsort(tile, kind="stable")
+        starts = np.searchsorted(tile[order], np.arange(g * g + 1))
+        retry = []
+        for j in range(g):
+            for i in range(g):
+                t = j * g + i
+                q = order[starts[t]:starts[t + 1]]
+                if len(q) == 0:
+                    continue
+                c = np.concatenate([
+                    order[starts[jj * g + max(i - 1, 0)]:starts[jj * g + min(i + 1, g - 1) + 1]]
+                    for jj in range(max(j - 1, 0), min(j + 1, g - 1) + 1)
+                ])
+                if len(c) <= self.k:
+                    retry.append(q)
+                    continue
+                rows = (x[q, None] - x[None, c]) ** 2 + (y[q, None] - y[None, c]) ** 2
+                nbr, sqd = self._nearest_k(q, rows, c)
+                # khoang cach den bien vung 3x3 (vo cung neu vung cham bien luoi)
+                inf_ = np.inf
+                left = x[q] - (x0 + (i - 1) * size) if i > 0 else inf_
+                right = (x0 + (i + 2) * size) - x[q] if i < g - 1 else inf_
+                down = y[q] - (y0 + (j - 1) * size) if j > 0 else inf_
+                up = (y0 + (j + 2) * size) - y[q] if j < g - 1 else inf_
+                margin = np.minimum(np.minimum(left, right), np.minimum(down, up))
+                ok = sqd[:, -1] <= margin * margin
+                out[q[ok]] = nbr[ok]
+                retry.append(q[~ok])
+        return np.concatenate(retry) if retry else np.empty(0, dtype=np.int64)
+
+    def candidates(self):
+        """Mang (n, k): k thanh pho gan nhat cua moi thanh pho, tang dan theo khoang cach."""
+        import numpy as np
+
+        n = self.n
+        out = np.empty((n, self.k), dtype=np.int64)
+        rest = np.arange(n)
+        if self.dist is None and n > 4096:
+            rest = self._grid_candidates(out)
+        block = max(1, (1 << 22) // n)
+        for lo in range(0, len(rest), block):
+            idx = rest[lo:lo + block]
+            out[idx] = self._nearest_k(idx, self._rows(idx))[0]
+        return out
+
+    def nearest_neighbour(self, cand):
+        import numpy as np
+
+        n = self.n
+        visited = np.zeros(n, dtype=bool)
+        tour = np.empty(n, dtype=np.int64)
+        cur = self.start
+        visited[cur] = True
+        tour[0] = cur
+        for i in range(1, n):
+            for c in cand[cur]:
+                if not visited[c]:
+                    nxt = int(c)
+                    break
+            else:
+                # het ung vien: tim thanh pho gan nhat chua tham tren toan bo
+                row = self._rows([cur])[0]
+                row[visited] = np.inf
+                nxt = int(np.argmin(row))
+            visited[nxt] = True
+            tour[i] = nxt
+            cur = nxt
+        return tour
+
+    def tour_length(self, tour) -> float:
+        import numpy as np
+
+        return float(self.d(tour, np.roll(tour, -1)).sum())
+
+    def _reverse(self, i: int, j: int) -> None:
+        """Dao doan tour tu vi tri i den j (theo chieu tien, co the vong qua cuoi mang)."""
+        import numpy as np
+
+        n, tour, pos = self.n, self.tour, self.pos
+        length = (j - i) % n + 1
+        if 2 * length > n:
+            # dao phan con lai cho ket qua la cung mot chu trinh
+            i, j, length = (j + 1) % n, (i - 1) % n, n - length
+        if length < 2:
+            return
+        if i + length <= n:
+            seg = tour[i:i + length][::-1].copy()
+            tour[i:i + length] = seg
+            pos[seg] = np.arange(i, i + length)
+        else:
+            idx = np.arange(i, i + length) % n
+            seg = tour[idx][::-1]
+            tour[idx] = seg
+            pos[seg] = idx
+
+    def _move(self, a: int, b: int, c: int, e: int) -> None:
+        """Buoc 2-opt: bo canh (a,b), (c,e), them (a,c), (b,e)."""
+        n, tour, pos = self.n, self.tour, self.pos
+        if tour[(pos[a] + 1) % n] != b:
+            # tour dang di theo chieu nguoc lai
+            a, b, c, e = e, c, b, a
+        self._reverse(int(pos[b]), int(pos[c]))
+
+    def _improve_2opt(self, a: int, cand) -> Optional[Tuple[int, ...]]:
+        import numpy as np
+
+        n, tour, pos = self.n, self.tour, self.pos
+        pa = pos[a]
+        cs = cand[a]
+        pc = pos[cs]
+        for step in (1, -1):
+            b = tour[(pa + step) % n]
+            e = tour[(pc + step) % n]
+            delta = self.d(a, cs) + self.d(b, e) - self.d(a, b) - self.d(cs, e)
+            i = int(np.argmin(delta))
+            if delta[i] < -1e-9:
+                c, ei, b = int(cs[i]), int(e[i]), int(b)
+                if step == 1:
+                    self._move(a, b, c, ei)
+                else:
+                    self._move(b, a, ei, c)
+                return a, b, c, ei
+        return None
+
+    def _improve_oropt(self, a: int, cand) -> Optional[Tuple[int, ...]]:
+        import numpy as np
+
+        n, tour, pos = self.n, self.tour, self.pos
+        pa = int(pos[a])
+        p = int(tour[(pa - 1) % n])
+        for length in (1, 2, 3):
+            if length + 3 > n:
+                break
+            s1, s2 = a, int(tour[(pa + length - 1) % n])
+            nx = int(tour[(pa + length) % n])
+            seg = tour[np.arange(pa, pa + length) % n]
+            gain = self.d(p, s1) + self.d(s2, nx) - self.d(p, nx)
+            # canh ung vien (u, v) theo chieu tien ke cac thanh pho gan s1 va s2
+            cs = np.concatenate((cand[s1], cand[s2]))
+            pc = pos[cs]
+            u = np.concatenate((cs, tour[(pc - 1) % n]))
+            v = np.concatenate((tour[(pc + 1) % n], cs))
+            ok = ~(np.isin(u, seg) | np.isin(v, seg))
+            if not ok.any():
                 continue
+            u, v = u[ok], v[ok]
+            duv = self.d(u, v)
+            keep = self.d(u, s1) + self.d(s2, v) - duv
+            flip = self.d(u, s2) + self.d(s1, v) - duv
+            add = np.minimum(keep, flip)
+            i = int(np.argmin(add))
+            if add[i] - gain < -1e-9:
+                c, e = int(u[i]), int(v[i])
+                # doi cho doan [s1..s2] vao giua (c, e) bang 2-3 buoc 2-opt
+                self._move(p, s1, c, e)
+                self._move(p, c, nx, s2)
+                if flip[i] > keep[i] and s1 != s2:
+                    self._move(c, s2, s1, e)
+                return p, s1, s2, nx, c, e
+        return None
+
+    def solve(self) -> Tuple[Optional[float], Optional[List[int]]]:
+        from collections import deque
+        import numpy as np
+
+        n, s = self.n, self.start
+        if n == 1:
+            return None, None
+        if n <= 3:
+            # moi tour deu nhu nhau
+            path = [s] + [c for c in range(n) if c != s] + [s]
+            return float(sum(self.d(a, b) for a, b in zip(path, path[1:]))), path
+
+        t0 = perf_counter()
+        cand = self.candidates()
+        t1 = perf_counter()
+        self.tour = self.nearest_neighbour(cand)
+        self.pos = np.empty(n, dtype=np.int64)
+        self.pos[self.tour] = np.arange(n)
+        self.initial_cost = self.tour_length(self.tour)
+        t2 = perf_counter()
 
-            if visited_mask == all_visited_mask and current == self.start and g > 0:
-                path = [current]
-                s = state
-                while s in parent:
-                    s = parent[s]
-                    path.append(s[0])
-                path.reverse()
-                return g, path
-
-            remaining = [i for i in range(self.n) if not (visited_mask & (1 << i))]
-
-            if remaining:
-                for nxt in remaining:
-                    new_mask = visited_mask | (1 << nxt)
-                    new_g = g + self.dist[current][nxt]
-                    new_state = (nxt, new_mask)
-                    if new_g < best_g.get(new_state, inf):
-                        best_g[new_state] = new_g
-                        parent[new_state] = state
-                        h = self.heuristic(nxt, new_mask)
-                        heapq.heappush(pq, (new_g + h, new_g, nxt, new_mask))
+        # don't-look bits: queued[c] = True neu c dang nam trong hang doi
+        queue = deque(int(c) for c in self.tour)
+        queued = np.ones(n, dtype=bool)
+        self.improvements = 0
+        while queue:
+            if self.time_limit is not None and perf_counter() - t0 > self.time_limit:
+                break
+            a = queue.popleft()
+            queued[a] = False
+            touched = self._improve_2opt(a, cand) or self._improve_oropt(a, cand)
+            if touched is None:
+                continue
+            self.improvements += 1
+            for c in touched:
+                if not queued[c]:
+                    queued[c] = True
+                    queue.append(c)
+        t3 = perf_counter()
+        self.timings = {"candidates": t1 - t0, "construct": t2 - t1, "local_search": t3 - t2}
+
+        tour = self.tour
+        i = int(self.pos[s])
+        path = [int(c) for c in np.concatenate((tour[i:], tour[:i]))]
+        path.append(s)
+        return self.tour_length(tour), path
+
+    def improvements_per_second(self) -> float:
+        t = self.timings.get("local_search", 0.0)
+        return self.improvements / t if t > 0 else 0.0
+
+
+# Trang thai cua tien trinh con: (solver A* dung cho heuristic, can tren dung chung)
+_WORKER_STATE = None
+
+
+def _init_worker(state) -> None:
+    global _WORKER_STATE
+    if state is not None:
+        _WORKER_STATE = state
+
+
+def _branch(solver: "TSPSolverAStar", prefix: Tuple[int, ...], ub) -> Tuple[float, Optional[List[int]], int]:
+    """
+    Nhanh can (DFS) tren cay con co tien to start -> prefix.
+    ub: multiprocessing.Value('d') chua can tren chung cua moi tien trinh.
+    Tra ve (chi phi, tour) tot nhat tim duoc trong cay con va so nut da duyet.
+    """
+    rows, s, heuristic = solver._rows, solver.start, solver.heuristic
+    full = (1 << solver.n) - 1
+    g, mask, cur = 0.0, 1 << s, s
+    for c in prefix:
+        g += rows[cur][c]
+        mask |= 1 << c
+        cur = c
+    path = [s, *prefix]
+    best: List = [inf, None]
+    nodes = 0
+
+    def dfs(cur: int, mask: int, g: float) -> None:
+        nonlocal nodes
+        nodes += 1
+        if mask == full:
+            total = g + rows[cur][s]
+            if total < ub.value:
+                with ub.get_lock():
+                    if total < ub.value:
+                        ub.value = total
+                best[:] = [total, path + [s]]
+            return
+        row = rows[cur]
+        for j in solver._nearest[cur]:
+            if (mask >> j) & 1:
+                continue
+            ng = g + row[j]
+            nm = mask | (1 << j)
+            if ng + heuristic(j, nm) >= ub.value:
+                continue
+            path.append(j)
+            dfs(j, nm, ng)
+            path.pop()
+
+    if g + heuristic(cur, mask) < ub.value:
+        dfs(cur, mask, g)
+    return best[0], best[1], nodes
+
+
+def _branch_task(prefix: Tuple[int, ...]) -> Tuple[float, Optional[List[int]], int]:
+    solver, ub = _WORKER_STATE
+    return _branch(solver, prefix, ub)
+
+
+class TSPSolverParallel:
+    """
+    Giai TSP chinh xac bang nhanh can song song tren nhieu tien trinh.
+
+    Cay tim kiem duoc chia theo depth thanh pho dau tien sau start: moi tien to
+    (start, c1, ..., c_depth) la mot bai toan con, duoc sap xep theo can duoi
+    (g + heuristic MST) va giao cho Pool. Can tren (chi phi tour tot nhat) nam
+    trong bo nho dung chung (multiprocessing.Value) nen tour tot tim duoc o mot
+    tien trinh lap tuc giup cac tien trinh khac cat nhanh. Can tren ban dau lay
+    tu tour lang gieng gan nhat + 2-opt/Or-opt.
+    """
+
+    def __init__(self, dist, start: int = 0, workers: Optional[int] = None, depth: int = 2,
+                 cache_size: int = 1 << 16) -> None:
+        self.astar = TSPSolverAStar(dist, start, cache_size)
+        self.n, self.start = self.astar.n, start
+        self.workers = workers or os.cpu_count() or 1
+        self.depth = max(0, min(depth, self.n - 1))
+        self.nodes = 0
+        self.tasks = 0
+
+    def subproblems(self, ub: float) -> List[Tuple[int, ...]]:
+        """Cac tien to do dai depth co can duoi < ub, tang dan theo can duoi."""
+        rows, s, heuristic = self.astar._rows, self.start, self.astar.heuristic
+        out = []
+
+        def expand(prefix: Tuple[int, ...], cur: int, mask: int, g: float) -> None:
+            bound = g + heuristic(cur, mask)
+            if bound >= ub:
+                return
+            if len(prefix) == self.depth:
+                out.append((bound, prefix))
+                return
+            for j in range(self.n):
+                if not (mask >> j) & 1:
+                    expand(prefix + (j,), j, mask | (1 << j), g + rows[cur][j])
+
+        expand((), s, 1 << s, 0.0)
+        out.sort()
+        return [prefix for _, prefix in out]
+
+    def solve(self) -> Tuple[Optional[float], Optional[List[int]]]:
+        import multiprocessing as mp
+
+        global _WORKER_STATE
+        rows, s = self.astar._rows, self.start
+        if self.n == 1:
+            return None, None
+        best_path = improve_tour(rows, nearest_neighbour_tour(rows, s))
+        best_cost = tour_cost(rows, best_path)
+        tasks = self.subproblems(best_cost)
+        self.tasks = len(tasks)
+
+        ctx = mp.get_context("fork") if "fork" in mp.get_all_start_methods() else mp.get_context()
+        ub = ctx.Value("d", best_cost)
+        if self.workers == 1:
+            results = (_branch(self.astar, prefix, ub) for prefix in tasks)
+            pool = None
+        else:
+            if ctx.get_start_method() == "fork":
+                _WORKER_STATE = (self.astar, ub)
+                pool = ctx.Pool(self.workers, _init_worker, (None,))
             else:
-                if current != self.start:
-                    nxt = self.start
-                    new_mask = visited_mask
-                    new_g = g + self.dist[current][nxt]
-                    new_state = (nxt, new_mask)
-                    if new_g < best_g.get(new_state, inf):
-                        best_g[new_state] = new_g
-                        parent[new_state] = state
-                        h = self.heuristic(nxt, new_mask)
-                        heapq.heappush(pq, (new_g + h, new_g, nxt, new_mask))
+                pool = ctx.Pool(self.workers, _init_worker, ((self.astar, ub),))
+            results = pool.imap_unordered(_branch_task, tasks)
+        try:
+            for cost, path, nodes in results:
+                self.nodes += nodes
+                if path is not None and cost < best_cost:
+                    best_cost, best_path = cost, path
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+        return best_cost, best_path
+
+
+def tour_cost(dist: List[List[float]], tour: List[int]) -> float:
+    return sum(dist[a][b] for a, b in zip(tour, tour[1:]))
+
+
+def nearest_neighbour_tour(dist: List[List[float]], start: int = 0) -> List[int]:
+    """
+    Tour tham lam: tu thanh pho hien tai di den thanh pho gan nhat chua tham.
+    Tra ve tour dong [start, ..., start].
+    """
+    n = len(dist)
+    unvisited = set(range(n)) - {start}
+    tour = [start]
+    while unvisited:
+        row = dist[tour[-1]]
+        nxt = min(unvisited, key=row.__getitem__)
+        unvisited.remove(nxt)
+        tour.append(nxt)
+    tour.append(start)
+    return tour
+
+
+def two_opt(dist: List[List[float]], tour: List[int], deadline: Optional[float] = None) -> bool:
+    """
+    2-opt (first improvement) tren tour dong, sua tour tai cho.
+    Chi dung cho ma tran doi xung vi dao nguoc doan tour.
+    deadline: moc perf_counter(), qua moc thi dung ngay, tour van hop le.
+    Tra ve True neu tour duoc cai thien.
+    """
+    improved = False
+    n = len(tour) - 1
+    changed = True
+    while changed:
+        changed = False
+        for i in range(1, n - 1):
+            if deadline is not None and perf_counter() > deadline:
+                return improved
+            a, b = tour[i - 1], tour[i]
+            da, db = dist[a], dist[b]
+            for j in range(i + 1, n):
+                c, e = tour[j], tour[j + 1]
+                delta = da[c] + db[e] - da[b] - dist[c][e]
+                if delta < -1e-9:
+                    tour[i:j + 1] = tour[j:i - 1:-1]
+                    b, db = tour[i], dist[tour[i]]
+                    changed = improved = True
+    return improved
+
+
+def or_opt(dist: List[List[float]], tour: List[int], deadline: Optional[float] = None) -> bool:
+    """
+    Or-opt: chuyen mot doan 1..3 thanh pho lien tiep sang vi tri khac
+    (giu nguyen chieu nen dung duoc ca voi ma tran bat doi xung).
+    deadline nhu two_opt.
+    Tra ve True neu tour duoc cai thien.
+    """
+    improved = False
+    changed = True
+    while changed:
+        changed = False
+        for seg in (1, 2, 3):
+            n = len(tour) - 1
+            i = 1
+            while i + seg <= n:
+                if deadline is not None and perf_counter() > deadline:
+                    return improved
+                prev, first, last, nxt = tour[i - 1], tour[i], tour[i + seg - 1], tour[i + seg]
+                gain = dist[prev][first] + dist[last][nxt] - dist[prev][nxt]
+                best_k, best_delta = -1, -1e-9
+                for k in range(n):
+                    if i - 1 <= k < i + seg:
+                        continue
+                    p, q = tour[k], tour[k + 1]
+                    delta = dist[p][first] + dist[last][q] - dist[p][q] - gain
+                    if delta < best_delta:
+                        best_k, best_delta = k, delta
+                if best_k >= 0:
+                    segment = tour[i:i + seg]
+                    del tour[i:i + seg]
+                    k = best_k if best_k < i else best_k - seg
+                    tour[k + 1:k + 1] = segment
+                    changed = improved = True
+                else:
+                    i += 1
+    return improved
+
+
+def improve_tour(dist: List[List[float]], tour: List[int], deadline: Optional[float] = None,
+                 symmetric: Optional[bool] = None) -> List[int]:
+    """
+    Xen ke 2-opt (neu ma tran doi xung) va Or-opt cho den khi khong cai thien duoc
+    hoac qua deadline (moc perf_counter()). symmetric=None thi tu kiem tra, O(n^2).
+    """
+    n = len(dist)
+    if symmetric is None:
+        symmetric = all(dist[i][j] == dist[j][i] for i in range(n) for j in range(i))
+    tour = list(tour)
+    while True:
+        if symmetric:
+            two_opt(dist, tour, deadline)
+        if not or_opt(dist, tour, deadline) or deadline is not None and perf_counter() > deadline:
+            return tour
+
+
+def is_compiled_matrix(path: str) -> bool:
+    with open(path, "rb") as f:
+        return f.read(len(BIN_MAGIC)) == BIN_MAGIC
+
+
+def is_npy(path: str) -> bool:
+    with open(path, "rb") as f:
+        return f.read(len(NPY_MAGIC)) == NPY_MAGIC
+
+
+def _text_rows(f, width: Optional[int] = None):
+    """
+    Doc dong dau (N) va tra ve (N, iterator cac hang NumPy float64).
+    Cac hang duoc doc lan luot, moi luc chi giu mot dong trong bo nho.
+    Bo qua dong rong va dong chu thich (#). width mac dinh la N.
+    """
+    import numpy as np
+
+    # (so dong trong file, noi dung) de thong bao loi chi dung dong
+    lines = ((i, ln.strip()) for i, ln in enumerate(f, 1))
+    lines = ((i, ln) for i, ln in lines if ln and not ln.startswith("#"))
+    first = next(lines, None)
+    if first is None:
+        raise ValueError("File rong")
+    try:
+        n = int(first[1])
+    except ValueError:
+        raise ValueError(f"Dong {first[0]}: can so thanh pho N, gap '{first[1]}'") from None
+    width = n if width is None else width
+
+    def rows():
+        count = 0
+        for lineno, ln in lines:
+            count += 1
+            if count > n:
+                raise ValueError("So dong trong file khong phu hop voi N")
+            try:
+                row = np.array(ln.split(), dtype=np.float64)
+            except ValueError as e:
+                raise ValueError(f"Dong {lineno}: {e}") from None
+            if len(row) != width:
+                raise ValueError(f"Dong {lineno} khong co dung {width} phan tu")
+            yield row
+        if count != n:
+            raise ValueError("So dong trong file khong phu hop voi N")
+
+    return n, rows()
+
+
+def _allocate(shape: Tuple[int, int], dtype: str, out: Optional[str]):
+    """Mang NumPy cap phat truoc, hoac file .npy anh xa bo nho neu co out."""
+    import numpy as np
+
+    if out:
+        return np.lib.format.open_memmap(out, mode="w+", dtype=dtype, shape=shape)
+    return np.empty(shape, dtype=dtype)
+
+
+def compile_distance_matrix(src: str, dst: str) -> int:
+    """
+    Chuyen file ma tran (text hoac .npy) sang file nhi phan co phien ban de nap
+    bang numpy.memmap. Ghi tung hang nen khong can giu ca ma tran trong bo nho.
+    """
+    if sys.byteorder != "little":
+        raise ValueError("Dinh dang nhi phan yeu cau may little-endian")
+    with open(dst, "wb") as f:
+        if is_compiled_matrix(src) or is_npy(src):
+            dist = load_distance_matrix(src)
+            n, rows = len(dist), iter(dist)
+            f.write(_BIN_HEADER.pack(BIN_MAGIC, BIN_VERSION, 0, n))
+            for row in rows:
+                f.write(row.astype("<f8").tobytes())
+        else:
+            with open(src, "r", encoding="utf-8") as fin:
+                n, rows = _text_rows(fin)
+                f.write(_BIN_HEADER.pack(BIN_MAGIC, BIN_VERSION, 0, n))
+                for row in rows:
+                    f.write(row.astype("<f8").tobytes())
+    return n
+
 
-        return None, None
+def load_compiled_matrix(path: str):
+    """
+    Mo file nhi phan bang numpy.memmap (zero-copy, chi doc).
+    """
+    import numpy as np
 
+    with open(path, "rb") as f:
+        magic, version, _, n = _BIN_HEADER.unpack(f.read(_BIN_HEADER.size))
+    if magic != BIN_MAGIC:
+        raise ValueError(f"{path} khong phai file ma tran da bien dich")
+    if version != BIN_VERSION:
+        raise ValueError(f"Phien ban file {version} khong ho tro, can {BIN_VERSION}")
+    return np.memmap(path, dtype="<f8", mode="r", offset=_BIN_HEADER.size, shape=(n, n))
 
-def load_distance_matrix(path: str) -> List[List[float]]:
+
+def load_distance_matrix(path: str, dtype: str = "float64", out: Optional[str] = None):
     """
-    Doc ma tran khoang cach tu file text.
+    Doc ma tran khoang cach thanh mang NumPy (N, N).
+
+      - file nhi phan tao boi --compile: numpy.memmap chi doc (float64)
+      - file .npy: np.load voi mmap_mode="r", giu nguyen kieu du lieu
+      - file text: doc tung dong vao mang dtype cap phat truoc; neu co out
+        thi ghi vao file .npy anh xa bo nho thay vi RAM
 
-    Dinh dang:
+    Dinh dang text:
       - Dong 1: so nguyen N
       - N dong tiep theo: N so (int hoac float) cach nhau boi khoang trang
 
@@ -150,24 +1188,63 @@ def load_distance_matrix(path: str) -> List[List[float]]:
       15 7 0 8
       6 3 12 0
     """
+    import numpy as np
+
+    if is_compiled_matrix(path):
+        return load_compiled_matrix(path)
+    if is_npy(path):
+        dist = np.load(path, mmap_mode="r")
+        if dist.ndim != 2 or dist.shape[0] != dist.shape[1]:
+            raise ValueError(f"{path}: can mang NxN, nhan duoc {dist.shape}")
+        return dist
+
     with open(path, "r", encoding="utf-8") as f:
-        lines = [ln.strip() for ln in f if ln.strip() and not ln.strip().startswith("#")]
+        n, rows = _text_rows(f)
+        dist = _allocate((n, n), dtype, out)
+        for i, row in enumerate(rows):
+            dist[i] = row
+    if out:
+        dist.flush()
+    return dist
 
-    if not lines:
-        raise ValueError("File rong")
 
-    n = int(lines[0])
-    if len(lines) != n + 1:
-        raise ValueError("So dong trong file khong phu hop voi N")
+def load_coordinates(path: str, dtype: str = "float64"):
+    """
+    Doc toa do thanh pho (khoang cach Euclid) cho --coords.
+
+    Dinh dang text: dong 1 la N, N dong tiep theo moi dong "x y";
+    hoac file .npy chua mang (N, 2). Tra ve mang NumPy (N, 2).
+    """
+    import numpy as np
+
+    if is_npy(path):
+        xy = np.load(path, mmap_mode="r")
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            n, rows = _text_rows(f, 2)
+            xy = np.empty((n, 2), dtype=dtype)
+            for i, row in enumerate(rows):
+                xy[i] = row
+    if xy.ndim != 2 or xy.shape[1] != 2:
+        raise ValueError("Moi dong toa do phai co 2 so x y")
+    return xy
+
 
-    dist: List[List[float]] = []
-    for i in range(1, n + 1):
-        parts = lines[i].split()
-        if len(parts) != n:
-            raise ValueError(f"Dong {i + 1} khong co dung {n} phan tu")
-        row = [float(x) for x in parts]
-        dist.append(row)
+def coords_to_matrix(xy, dtype: str = "float64", out: Optional[str] = None, tile: int = 1024):
+    """
+    Ma tran khoang cach Euclid tu toa do, tinh theo tung khoi tile hang
+    (bo nho tam O(tile * N)) vao mang cap phat truoc hoac file .npy (out).
+    """
+    import numpy as np
 
+    n = len(xy)
+    dist = _allocate((n, n), dtype, out)
+    x, y = np.asarray(xy[:, 0], dtype=np.float64), np.asarray(xy[:, 1], dtype=np.float64)
+    for lo in range(0, n, tile):
+        hi = min(n, lo + tile)
+        dist[lo:hi] = np.hypot(x[lo:hi, None] - x[None, :], y[lo:hi, None] - y[None, :])
+    if out:
+        dist.flush()
     return dist
 
 
@@ -177,7 +1254,7 @@ def main() -> None:
     )
     parser.add_argument(
         "matrix_file",
-        help="Duong dan file chua ma tran khoang cach",
+        help="File ma tran khoang cach: text, .npy hoac file --compile (toa do neu co --coords)",
     )
     parser.add_argument(
         "--start",
@@ -185,17 +1262,168 @@ def main() -> None:
         default=0,
         help="Chi so thanh pho bat dau, mac dinh 0",
     )
+    parser.add_argument(
+        "--compile",
+        metavar="BIN",
+        help="Chuyen matrix_file sang file nhi phan BIN roi thoat",
+    )
+    parser.add_argument(
+        "--method",
+        choices=["astar", "dp", "local", "parallel"],
+        default="astar",
+        help="astar: A* voi heuristic MST, dp: quy hoach dong Held-Karp (NumPy), "
+        "local: gan dung cho bai toan lon (2-opt/Or-opt), "
+        "parallel: nhanh can chinh xac tren nhieu tien trinh",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="So tien trinh cho --method parallel (mac dinh: so CPU)",
+    )
+    parser.add_argument(
+        "--split-depth",
+        type=int,
+        default=2,
+        help="So thanh pho dau tien sau start dung de chia bai toan con (--method parallel)",
+    )
+    parser.add_argument(
+        "--coords",
+        action="store_true",
+        help="matrix_file chua toa do 'x y' (text hoac .npy) thay vi ma tran, khoang cach Euclid",
+    )
+    parser.add_argument(
+        "--dtype",
+        choices=["float64", "float32"],
+        default="float64",
+        help="Kieu so cua ma tran doc tu file text (float32 giam mot nua bo nho)",
+    )
+    parser.add_argument(
+        "--mmap",
+        metavar="NPY",
+        help="Ghi ma tran doc tu file text vao file .npy anh xa bo nho thay vi RAM",
+    )
+    parser.add_argument(
+        "--neighbors",
+        type=int,
+        default=8,
+        help="So ung vien gan nhat cua moi thanh pho cho --method local",
+    )
+    parser.add_argument(
+        "--mst-cache",
+        type=int,
+        default=1 << 16,
+        help="So gia tri MST toi da giu trong cache LRU cua A* (0 = tat cache)",
+    )
+    parser.add_argument(
+        "--anytime",
+        action="store_true",
+        help="A*: bat dau tu tour lang gieng gan nhat + 2-opt/Or-opt va in moi tour tot hon",
+    )
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        metavar="SEC",
+        help="A*/local: dung sau SEC giay, tra ve tour tot nhat (A*: kem khoang cach toi uu, bat --anytime)",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="In ti le trung cache MST va thoi gian tinh heuristic (A*)",
+    )
+    parser.add_argument(
+        "--stats-json",
+        metavar="FILE",
+        help="A*: ghi bo dem tim kiem (SearchStats) dang JSON ra FILE ('-' la stdout)",
+    )
     args = parser.parse_args()
 
-    dist = load_distance_matrix(args.matrix_file)
-    solver = TSPSolverAStar(dist, start=args.start)
-    cost, tour = solver.solve()
+    if args.compile:
+        n = compile_distance_matrix(args.matrix_file, args.compile)
+        print(f"Da ghi {args.compile}: ma tran {n}x{n}")
+        return
+
+    if args.coords:
+        xy = load_coordinates(args.matrix_file)
+        if args.method == "local":
+            # khoang cach tinh khi can, khong tao ma tran NxN
+            source = {"coords": xy}
+        else:
+            source = {"dist": coords_to_matrix(xy, args.dtype, args.mmap)}
+    else:
+        source = {"dist": load_distance_matrix(args.matrix_file, args.dtype, args.mmap)}
+
+    if args.method == "local":
+        solver = TSPSolverLocalSearch(
+            start=args.start, k=args.neighbors, time_limit=args.time_limit, **source
+        )
+    elif args.method == "dp":
+        solver = TSPSolverDP(source["dist"], start=args.start)
+    elif args.method == "parallel":
+        solver = TSPSolverParallel(
+            source["dist"],
+            start=args.start,
+            workers=args.workers,
+            depth=args.split_depth,
+            cache_size=args.mst_cache,
+        )
+    else:
+        solver = TSPSolverAStar(source["dist"], start=args.start, cache_size=args.mst_cache)
+    search_stats = None
+    if (args.stats or args.stats_json) and isinstance(solver, TSPSolverAStar):
+        # search_stats.py nam o thu muc goc cua repo
+        sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+        from search_stats import SearchStats
+
+        search_stats = SearchStats()
+    t0 = perf_counter()
+    if isinstance(solver, TSPSolverAStar):
+        anytime = args.anytime or args.time_limit is not None
+
+        def report(c: float, t: List[int]) -> None:
+            print(f"[{perf_counter() - t0:.2f}s] Tour moi: {c}")
+
+        cost, tour = solver.solve(
+            time_limit=args.time_limit,
+            warm_start=anytime,
+            on_incumbent=report if anytime else None,
+            stats=search_stats,
+        )
+    else:
+        cost, tour = solver.solve()
+    elapsed = perf_counter() - t0
 
     if tour is None:
         print("Khong tim duoc tour hop le")
     else:
         print("Chi phi tour tot nhat:", cost)
         print("Tour:", " -> ".join(str(c) for c in tour))
+        if isinstance(solver, TSPSolverAStar) and not solver.optimal:
+            print(
+                f"Het thoi gian: can duoi {solver.lower_bound:.2f}, "
+                f"khoang cach toi uu (gap) {solver.gap:.2%}"
+            )
+    if args.stats:
+        print(f"Thoi gian giai: {elapsed:.3f}s")
+        if isinstance(solver, TSPSolverAStar):
+            lookups = solver.cache_hits + solver.cache_misses
+            print(
+                f"Cache MST: {solver.cache_hits}/{lookups} lan trung "
+                f"({solver.cache_hit_rate():.1%}), heuristic: {solver.heuristic_time:.3f}s"
+            )
+            search_stats.report("astar")
+        elif isinstance(solver, TSPSolverParallel):
+            print(f"{solver.workers} tien trinh, {solver.tasks} bai toan con, {solver.nodes} nut da duyet")
+        elif isinstance(solver, TSPSolverLocalSearch):
+            print(" ".join(f"{k}={v:.3f}s" for k, v in solver.timings.items()))
+            print(
+                f"Tour ban dau: {solver.initial_cost:.2f}, {solver.improvements} buoc cai thien "
+                f"({solver.improvements_per_second():.0f}/s)"
+            )
+    if args.stats_json and search_stats is not None:
+        from search_stats import write_json
+
+        write_json({"astar": search_stats}, args.stats_json)
 
 
 if __name__ == "__main__":
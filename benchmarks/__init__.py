@@ -0,0 +1,19 @@
+"""Benchmark scripts and synthetic input generators for the TH_week* modules.
+
+Each ``bench_*`` script only imports code from a single module directory and is
+run from the repository root, e.g. ``python -m benchmarks.bench_week1``.
+``benchmarks.suite`` times every module together and compares result files;
+``benchmarks.make_inputs`` writes generated instances in each module's input format.
+"""
+from __future__ import annotations
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def use_module_dir(*parts: str) -> str:
+    """Put ``ROOT/<parts>`` at the front of ``sys.path`` so its flat imports resolve."""
+    path = os.path.join(ROOT, *parts)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+    return path
@@ -0,0 +1,50 @@
+"""Scaling benchmark for BFS / DFS / UCS_old / UCS_new in TH_week1/search.py.
+
+    python -m benchmarks.bench_week1 --min-exp 3 --max-exp 6
+"""
+from __future__ import annotations
+import argparse
+import io
+import time
+from benchmarks import use_module_dir
+from benchmarks.generators import edge_list_text, random_digraph
+
+use_module_dir("TH_week1")
+from search import BFS, DFS, UCS_old, UCS_new, UCS_bidir  # noqa: E402
+from utils import read_edge_list, reverse_graph  # noqa: E402
+
+def main() -> None:
+    p = argparse.ArgumentParser("TH_week1 search scaling benchmark")
+    p.add_argument("--min-exp", type=int, default=3, help="smallest graph has 10^min-exp nodes")
+    p.add_argument("--max-exp", type=int, default=5, help="largest graph has 10^max-exp nodes")
+    p.add_argument("--degree", type=int, default=4, help="average out-degree")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--csr", action="store_true", help="run on CSRGraph loaded from an edge list instead of dicts")
+    args = p.parse_args()
+
+    print(f"{'n':>9} {'algo':>9} {'seconds':>10} {'us/node':>9}")
+    for e in range(args.min_exp, args.max_exp + 1):
+        n = 10 ** e
+        plain = random_digraph(n, args.degree, args.seed)
+        weighted = random_digraph(n, args.degree, args.seed, weighted=True)
+        if args.csr:
+            t0 = time.perf_counter()
+            plain = read_edge_list(io.StringIO(edge_list_text(plain, n, 0, n - 1)))[3]
+            weighted = read_edge_list(io.StringIO(edge_list_text(weighted, n, 0, n - 1)), weighted=True)[3]
+            print(f"{n:>9} {'load':>9} {time.perf_counter() - t0:>10.4f}")
+        reverse = reverse_graph(weighted)
+        runs = [
+            ("BFS", lambda: BFS(plain, 0, n - 1)),
+            ("DFS", lambda: DFS(plain, 0, n - 1)),
+            ("UCS_old", lambda: UCS_old(weighted, 0, n - 1)),
+            ("UCS_new", lambda: UCS_new(weighted, 0, n - 1)),
+            ("UCS_bidir", lambda: UCS_bidir(weighted, 0, n - 1, reverse)),
+        ]
+        for name, run in runs:
+            t0 = time.perf_counter()
+            run()
+            dt = time.perf_counter() - t0
+            print(f"{n:>9} {name:>9} {dt:>10.4f} {dt / n * 1e6:>9.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""UCS_new frontiers in TH_week1/search.py: binary heap vs Dial buckets vs radix heap.
+
+    python -m benchmarks.bench_week1_frontier --sizes 10000 100000 --max-weights 10 100 10000
+
+Every run searches from 0 to n - 1 on the same random graph and must return the
+same cost. ``check`` is the scan ``integer_weight_bound`` needs to size the
+bucket queue: a Python loop over every edge for dict graphs, one min/max over
+the weight array for ``--csr`` graphs (cached on the graph afterwards).
+``auto`` is what ``frontier="auto"`` picks for the graph.
+"""
+from __future__ import annotations
+import argparse
+import io
+import time
+from benchmarks import use_module_dir
+from benchmarks.generators import edge_list_text, random_digraph
+
+use_module_dir("TH_week1")
+from search import UCS_new, integer_weight_bound, make_frontier  # noqa: E402
+from utils import read_edge_list  # noqa: E402
+
+def main() -> None:
+    p = argparse.ArgumentParser("TH_week1 UCS frontier benchmark")
+    p.add_argument("--sizes", type=int, nargs="*", default=[10000, 100000])
+    p.add_argument("--max-weights", type=int, nargs="*", default=[10, 100, 1000, 100000])
+    p.add_argument("--degree", type=int, default=4)
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--csr", action="store_true", help="run on CSRGraph loaded from an edge list instead of dicts")
+    args = p.parse_args()
+
+    print(f"{'n':>8} {'max w':>7} {'frontier':>8} {'seconds':>9} {'speedup':>8} {'check s':>8} {'auto':>8}")
+    for n in args.sizes:
+        for mw in args.max_weights:
+            graph = random_digraph(n, args.degree, args.seed, weighted=True, max_weight=mw)
+            if args.csr:
+                graph = read_edge_list(io.StringIO(edge_list_text(graph, n, 0, n - 1)), weighted=True)[3]
+            t0 = time.perf_counter()
+            integer_weight_bound(graph)
+            check = time.perf_counter() - t0
+            auto = type(make_frontier(graph)).__name__.replace("Frontier", "").lower()
+            base = cost = None
+            for kind in ("heap", "bucket", "radix"):
+                if kind == "bucket" and mw > 1 << 24:
+                    continue
+                best = float("inf")
+                for _ in range(args.repeat):
+                    t0 = time.perf_counter()
+                    c, _ = UCS_new(graph, 0, n - 1, frontier=kind)
+                    best = min(best, time.perf_counter() - t0)
+                base = base or best
+                cost = c if cost is None else cost
+                assert c == cost, f"{kind} returned cost {c}, heap returned {cost}"
+                print(f"{n:>8} {mw:>7} {kind:>8} {best:>9.4f} {base / best:>8.2f} {check:>8.4f} {auto:>8}")
+
+if __name__ == "__main__":
+    main()
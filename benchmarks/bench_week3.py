@@ -0,0 +1,55 @@
+"""Per-query latency of a_star / greedy_best_first in TH_week3/src/search.py.
+
+    python -m benchmarks.bench_week3 --sizes 10 30 100
+"""
+from __future__ import annotations
+import argparse
+import random
+import time
+from benchmarks import ROOT, use_module_dir
+from benchmarks.generators import grid_road_graph, straight_line_heuristic
+
+use_module_dir("TH_week3", "src")
+from data_loader import load_graph, load_heuristic  # noqa: E402
+from graph import RoadGraph  # noqa: E402
+from search import a_star, greedy_best_first  # noqa: E402
+
+def time_queries(G, queries, heuristics) -> dict:
+    out = {}
+    for name, fn in (("astar", a_star), ("gbfs", greedy_best_first)):
+        t0 = time.perf_counter()
+        expanded = 0
+        for s, t in queries:
+            expanded += fn(G, s, t, heuristics[t])[2]
+        dt = time.perf_counter() - t0
+        out[name] = (dt / len(queries) * 1e6, expanded / len(queries))
+    return out
+
+def report(label: str, n: int, res: dict) -> None:
+    for algo, (us, exp) in res.items():
+        print(f"{label:>12} {n:>8} {algo:>6} {us:>12.1f} {exp:>10.1f}")
+
+def main() -> None:
+    p = argparse.ArgumentParser("TH_week3 query latency benchmark")
+    p.add_argument("--sizes", type=int, nargs="*", default=[10, 30, 100], help="grid side lengths")
+    p.add_argument("--queries", type=int, default=200)
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+
+    print(f"{'graph':>12} {'nodes':>8} {'algo':>6} {'us/query':>12} {'expanded':>10}")
+    data = f"{ROOT}/TH_week3/data"
+    G = load_graph(f"{data}/citiesGraph.txt")
+    H = load_heuristic(f"{data}/heuristic.txt")
+    queries = [(a, b) for a in G.names for b in G.names]
+    report("romania", len(G), time_queries(G, queries, {b: H for _, b in queries}))
+
+    rng = random.Random(args.seed)
+    for side in args.sizes:
+        pos, edges = grid_road_graph(side, side, args.seed)
+        G = RoadGraph.from_edges(edges)
+        queries = [(rng.choice(G.names), rng.choice(G.names)) for _ in range(args.queries)]
+        heuristics = {t: straight_line_heuristic(pos, t) for _, t in queries}
+        report(f"grid{side}x{side}", len(G), time_queries(G, queries, heuristics))
+
+if __name__ == "__main__":
+    main()
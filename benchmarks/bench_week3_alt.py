@@ -0,0 +1,61 @@
+"""Expanded nodes and latency: UCS vs A* (straight line) vs A* (ALT landmarks),
+each also in its bidirectional form.
+
+    python -m benchmarks.bench_week3_alt --sizes 30 100 --landmarks 8
+"""
+from __future__ import annotations
+import argparse
+import random
+import time
+from benchmarks import use_module_dir
+from benchmarks.generators import grid_road_graph, straight_line_heuristic
+
+use_module_dir("TH_week3", "src")
+from graph import RoadGraph  # noqa: E402
+from landmarks import Landmarks, STRATEGIES  # noqa: E402
+from search import ZeroHeuristic, a_star, bidirectional_a_star  # noqa: E402
+
+def main() -> None:
+    p = argparse.ArgumentParser("TH_week3 ALT benchmark")
+    p.add_argument("--sizes", type=int, nargs="*", default=[30, 60], help="grid side lengths")
+    p.add_argument("--queries", type=int, default=100)
+    p.add_argument("--landmarks", type=int, default=8)
+    p.add_argument("--strategy", choices=sorted(STRATEGIES), default="avoid")
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+
+    print(f"{'nodes':>8} {'heuristic':>10} {'expanded':>10} {'us/query':>10}")
+    for side in args.sizes:
+        pos, edges = grid_road_graph(side, side, args.seed)
+        G = RoadGraph.from_edges(edges)
+        rng = random.Random(args.seed)
+        queries = [(rng.choice(G.names), rng.choice(G.names)) for _ in range(args.queries)]
+
+        t0 = time.perf_counter()
+        L = Landmarks.build(G, args.landmarks, args.strategy, args.seed)
+        print(f"{len(G):>8} {'(prep)':>10} {'':>10} {(time.perf_counter() - t0) * 1e6:>10.0f}")
+
+        # name -> heuristic factory taking (start, goal) and the search to run with it
+        variants = {
+            "ucs": (lambda s, t: ZeroHeuristic(), a_star),
+            "euclid": (lambda s, t: G.heuristic_table(straight_line_heuristic(pos, t)), a_star),
+            "alt": (lambda s, t: L.heuristic(G, t), a_star),
+            "bi-ucs": (lambda s, t: None, lambda G, s, t, h: bidirectional_a_star(G, s, t)),
+            "bi-alt": (lambda s, t: (L.heuristic(G, t), L.heuristic(G, s)),
+                       lambda G, s, t, h: bidirectional_a_star(G, s, t, *h)),
+        }
+        costs = {}
+        for name, (make_h, search) in variants.items():
+            hs = [make_h(s, t) for s, t in queries]
+            expanded = 0
+            t0 = time.perf_counter()
+            for (s, t), h in zip(queries, hs):
+                _, cost, e = search(G, s, t, h)
+                expanded += e
+                costs.setdefault((s, t), set()).add(round(cost, 3))
+            dt = time.perf_counter() - t0
+            print(f"{len(G):>8} {name:>10} {expanded / len(queries):>10.1f} {dt / len(queries) * 1e6:>10.0f}")
+        assert all(len(c) == 1 for c in costs.values()), "heuristics disagree on optimal cost"
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Batch throughput and worker scaling for TH_week3/src/batch.py.
+
+    python -m benchmarks.bench_week3_batch --side 100 --queries 20000 --workers 1 2 4 8
+"""
+from __future__ import annotations
+import argparse
+import os
+import random
+from benchmarks import use_module_dir
+from benchmarks.generators import grid_road_graph, straight_line_heuristic
+
+use_module_dir("TH_week3", "src")
+from batch import run_batch  # noqa: E402
+from graph import RoadGraph  # noqa: E402
+
+def main() -> None:
+    p = argparse.ArgumentParser("TH_week3 batch scaling benchmark")
+    p.add_argument("--side", type=int, default=60, help="grid side length")
+    p.add_argument("--queries", type=int, default=5000)
+    p.add_argument("--sources", type=int, default=0, help="distinct start cities (0 = all random)")
+    p.add_argument("--algo", choices=["astar", "gbfs"], default="astar")
+    p.add_argument("--workers", type=int, nargs="*", default=[1, 2, 4])
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+
+    pos, edges = grid_road_graph(args.side, args.side, args.seed)
+    G = RoadGraph.from_edges(edges)
+    rng = random.Random(args.seed)
+    starts = rng.sample(G.names, args.sources) if args.sources else G.names
+    goal = G.names[-1]
+    H = straight_line_heuristic(pos, goal)
+    queries = [(rng.choice(starts), rng.choice(G.names)) for _ in range(args.queries)]
+
+    print(f"{len(G)} nodes, {len(queries)} queries, {os.cpu_count()} cpus")
+    print(f"{'workers':>8} {'seconds':>10} {'queries/s':>12} {'speedup':>8}")
+    base = None
+    with open(os.devnull, "w") as sink:
+        for w in args.workers:
+            count, seconds = run_batch(G, H, queries, args.algo, sink, workers=w)
+            base = base or seconds
+            print(f"{w:>8} {seconds:>10.3f} {count / seconds:>12,.0f} {base / seconds:>8.2f}")
+
+if __name__ == "__main__":
+    main()
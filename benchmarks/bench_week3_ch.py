@@ -0,0 +1,55 @@
+"""Contraction Hierarchies vs UCS / A* on generated road grids.
+
+    python -m benchmarks.bench_week3_ch --sizes 30 60 100
+"""
+from __future__ import annotations
+import argparse
+import random
+import time
+from benchmarks import use_module_dir
+from benchmarks.generators import grid_road_graph, straight_line_heuristic
+
+use_module_dir("TH_week3", "src")
+from ch import ContractionHierarchy  # noqa: E402
+from graph import RoadGraph  # noqa: E402
+from search import ZeroHeuristic, a_star  # noqa: E402
+
+def main() -> None:
+    p = argparse.ArgumentParser("TH_week3 contraction hierarchy benchmark")
+    p.add_argument("--sizes", type=int, nargs="*", default=[30, 60], help="grid side lengths")
+    p.add_argument("--queries", type=int, default=200)
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+
+    print(f"{'nodes':>8} {'algo':>6} {'us/query':>10} {'searched':>10}")
+    for side in args.sizes:
+        pos, edges = grid_road_graph(side, side, args.seed)
+        G = RoadGraph.from_edges(edges)
+        t0 = time.perf_counter()
+        C = ContractionHierarchy.build(G)
+        print(f"{len(G):>8} {'build':>6} {(time.perf_counter() - t0) * 1e6:>10.0f} "
+              f"{C.num_shortcuts():>10} shortcuts")
+
+        rng = random.Random(args.seed)
+        queries = [(rng.choice(G.names), rng.choice(G.names)) for _ in range(args.queries)]
+        heuristics = {t: G.heuristic_table(straight_line_heuristic(pos, t)) for _, t in queries}
+        runs = {
+            "ucs": lambda s, t: a_star(G, s, t, ZeroHeuristic()),
+            "astar": lambda s, t: a_star(G, s, t, heuristics[t]),
+            "ch": C.query,
+        }
+        costs = {}
+        for name, run in runs.items():
+            searched = 0
+            elapsed = 0.0
+            for s, t in queries:
+                t0 = time.perf_counter()
+                _, cost, n = run(s, t)
+                elapsed += time.perf_counter() - t0
+                searched += n
+                costs.setdefault((s, t), set()).add(round(cost, 6))
+            print(f"{len(G):>8} {name:>6} {elapsed / len(queries) * 1e6:>10.0f} {searched / len(queries):>10.1f}")
+        assert all(len(c) == 1 for c in costs.values()), "CH cost differs from A*"
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Visibility graph construction in TH_week4/shortest_path_polygons.py.
+
+    python -m benchmarks.bench_week4 --polygons 10 100 1000 5000 --methods naive grid
+
+Maps up to ``--full-max`` polygons build the whole graph with every method and
+check that the adjacency lists are identical. Larger maps time ``--pairs``
+random visibility tests per method (``build`` is then extrapolated from the
+per-test latency to all ``n * (n - 1) / 2`` vertex pairs). The ``sweep`` method
+instead runs ``--sources`` full rotational sweeps and extrapolates to all ``n``
+nodes, so its ``us/test`` is the cost of one sweep divided by ``n - 1``.
+
+    python -m benchmarks.bench_week4 --polygons 100 200 400 800 --full-max 0 --methods grid sweep
+"""
+from __future__ import annotations
+import argparse
+import random
+import time
+import numpy as np
+from benchmarks import use_module_dir
+from benchmarks.generators import polygon_field
+
+use_module_dir("TH_week4")
+import shortest_path_polygons as spp  # noqa: E402
+
+def main() -> None:
+    p = argparse.ArgumentParser("TH_week4 visibility graph benchmark")
+    p.add_argument("--polygons", type=int, nargs="*", default=[10, 50, 200, 1000])
+    p.add_argument("--methods", nargs="*", default=list(spp.VISGRAPH_METHODS), choices=spp.VISGRAPH_METHODS)
+    p.add_argument("--full-max", type=int, default=60, help="build the full graph up to this many polygons")
+    p.add_argument("--pairs", type=int, default=300, help="sampled visibility tests on larger maps")
+    p.add_argument("--sources", type=int, default=5, help="sampled sweep origins on larger maps")
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+
+    print(f"{'polygons':>8} {'nodes':>7} {'method':>8} {'mode':>7} {'us/test':>9} {'build s':>10} {'edges':>8}")
+    for count in args.polygons:
+        S, G, polygons = polygon_field(count, args.seed)
+        nodes = 2 + sum(len(poly) for poly in polygons)
+        pairs = nodes * (nodes - 1) // 2
+        if count <= args.full_max:
+            ref = None
+            for method in args.methods:
+                t0 = time.perf_counter()
+                _, adj = spp.build_graph(S, G, polygons, method)
+                dt = time.perf_counter() - t0
+                n_edges = sum(len(v) for v in adj.values()) // 2
+                print(f"{count:>8} {nodes:>7} {method:>8} {'full':>7} {dt / pairs * 1e6:>9.1f} {dt:>10.2f} {n_edges:>8}")
+                ref = ref or dict(adj)
+                assert dict(adj) == ref, f"{method} builds a different graph"
+            continue
+
+        all_nodes = [spp.Node(S[0], S[1], None, None, "S"), spp.Node(G[0], G[1], None, None, "G")]
+        all_nodes += [spp.Node(x, y, pid, idx, "V") for pid, poly in enumerate(polygons)
+                      for idx, (x, y) in enumerate(poly)]
+        rng = random.Random(args.seed)
+        sample = [tuple(rng.sample(all_nodes, 2)) for _ in range(args.pairs)]
+        all_edges = spp.build_edges_from_polygons(polygons)
+        answers = None
+        for method in args.methods:
+            if method == "sweep":
+                ends, incident = spp.edge_ends(polygons, all_edges)
+                sources = rng.sample(range(len(all_nodes)), min(args.sources, len(all_nodes)))
+                t0 = time.perf_counter()
+                for i in sources:
+                    spp.sweep_visible_from(i, all_nodes, all_edges, ends, incident, polygons)
+                per = (time.perf_counter() - t0) / len(sources)
+                print(f"{count:>8} {nodes:>7} {method:>8} {'sampled':>7} {per / (nodes - 1) * 1e6:>9.1f} "
+                      f"{per * nodes:>10.0f} {'-':>8}")
+                continue
+            if method == "numpy":
+                # one block with every sampled pair (the same-polygon rule comes from is_visible)
+                t0 = time.perf_counter()
+                arrays = spp.EdgeArrays(all_edges)
+                prep = time.perf_counter() - t0
+                t0 = time.perf_counter()
+                a = np.array([(u.x, u.y) for u, _ in sample])
+                b = np.array([(v.x, v.y) for _, v in sample])
+                free = ~arrays.blocked(a, b).any(axis=1)
+                per = (time.perf_counter() - t0) / len(sample)
+                got = [bool(ok) and spp.is_visible(u, v, [], polygons) for ok, (u, v) in zip(free, sample)]
+            else:
+                t0 = time.perf_counter()
+                index = spp.EdgeGrid(all_edges) if method == "grid" else None
+                prep = time.perf_counter() - t0
+                t0 = time.perf_counter()
+                got = [spp.is_visible(u, v, all_edges, polygons, index) for u, v in sample]
+                per = (time.perf_counter() - t0) / len(sample)
+            print(f"{count:>8} {nodes:>7} {method:>8} {'sampled':>7} {per * 1e6:>9.1f} "
+                  f"{prep + per * pairs:>10.0f} {'-':>8}")
+            answers = answers or got
+            assert got == answers, f"{method} disagrees on sampled pairs"
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Parallel visibility graph construction (TH_week4 ``--jobs``): wall time and speedup.
+
+    python -m benchmarks.bench_week4_parallel --polygons 250 --jobs 1 2 4 8
+
+Speedup is relative to ``--jobs 1`` (the serial loop) and is only meaningful
+when the machine has at least that many cores; the ``cpus`` line at the top
+shows what is available. 250 polygons give about 1,250 vertices.
+"""
+from __future__ import annotations
+import argparse
+import os
+import time
+from benchmarks import use_module_dir
+from benchmarks.generators import polygon_field
+
+use_module_dir("TH_week4")
+import shortest_path_polygons as spp  # noqa: E402
+
+def main() -> None:
+    p = argparse.ArgumentParser("TH_week4 parallel visibility graph benchmark")
+    p.add_argument("--polygons", type=int, nargs="*", default=[250])
+    p.add_argument("--jobs", type=int, nargs="*", default=[1, 2, 4, 8])
+    p.add_argument("--method", choices=spp.VISGRAPH_METHODS, default="grid")
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+
+    print(f"cpus={os.cpu_count()}")
+    print(f"{'polygons':>8} {'nodes':>7} {'jobs':>5} {'seconds':>9} {'speedup':>8} {'edges':>8}")
+    for count in args.polygons:
+        S, G, polygons = polygon_field(count, args.seed)
+        base = ref = None
+        for jobs in args.jobs:
+            t0 = time.perf_counter()
+            nodes, adj = spp.build_graph(S, G, polygons, args.method, jobs)
+            dt = time.perf_counter() - t0
+            base = base or dt
+            n_edges = sum(len(v) for v in adj.values()) // 2
+            print(f"{count:>8} {len(nodes):>7} {jobs:>5} {dt:>9.2f} {base / dt:>8.2f} {n_edges:>8}")
+            if ref is None:
+                ref = (list(adj), dict(adj))
+            assert (list(adj), dict(adj)) == ref, f"--jobs {jobs} builds a different graph"
+
+if __name__ == "__main__":
+    main()
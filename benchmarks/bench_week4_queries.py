@@ -0,0 +1,77 @@
+"""Repeated start/goal queries on fixed obstacles (TH_week4 ObstacleGraph).
+
+    python -m benchmarks.bench_week4_queries --polygons 20 50 100 --queries 200
+
+For each map the obstacle graph is built, saved and loaded once; then the
+same queries are answered by ObstacleGraph and, for the first ``--rebuild``
+of them, by rebuilding the whole graph (build_graph + astar) as ``main`` does.
+Both must return the same paths.
+"""
+from __future__ import annotations
+import argparse
+import os
+import random
+import tempfile
+import time
+from benchmarks import use_module_dir
+from benchmarks.generators import polygon_field
+
+use_module_dir("TH_week4")
+import shortest_path_polygons as spp  # noqa: E402
+
+def main() -> None:
+    p = argparse.ArgumentParser("TH_week4 repeated query benchmark")
+    p.add_argument("--polygons", type=int, nargs="*", default=[20, 50, 100])
+    p.add_argument("--queries", type=int, default=200)
+    p.add_argument("--rebuild", type=int, default=5, help="queries also answered by a full rebuild")
+    p.add_argument("--method", choices=spp.VISGRAPH_METHODS, default="grid")
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+
+    print(f"{'polygons':>8} {'nodes':>7} {'build s':>8} {'load s':>7} {'KB':>7} "
+          f"{'p50 ms':>7} {'p95 ms':>7} {'rebuild ms':>11} {'speedup':>8}")
+    for count in args.polygons:
+        _, _, polygons = polygon_field(count, args.seed)
+        xs = [x for poly in polygons for x, _ in poly]
+        ys = [y for poly in polygons for _, y in poly]
+        rng = random.Random(args.seed)
+
+        def point():
+            return rng.uniform(min(xs), max(xs)), rng.uniform(min(ys), max(ys))
+
+        queries = [(point(), point()) for _ in range(args.queries)]
+
+        t0 = time.perf_counter()
+        graph = spp.ObstacleGraph.build(polygons, args.method)
+        build = time.perf_counter() - t0
+        fd, path = tempfile.mkstemp(suffix=".bin")
+        os.close(fd)
+        try:
+            graph.save(path)
+            size = os.path.getsize(path)
+            t0 = time.perf_counter()
+            graph = spp.ObstacleGraph.load(path)
+            load = time.perf_counter() - t0
+        finally:
+            os.remove(path)
+
+        results = graph.batch(queries)
+        lat = sorted(r["seconds"] for r in results)
+        p50, p95 = lat[len(lat) // 2], lat[min(len(lat) - 1, int(0.95 * len(lat)))]
+
+        rebuild = 0.0
+        sample = queries[:args.rebuild]
+        for (S, G), r in zip(sample, results):
+            t0 = time.perf_counter()
+            nodes, adj = spp.build_graph(S, G, polygons, args.method)
+            path_ids = spp.astar(adj, nodes, 0, 1)
+            rebuild += time.perf_counter() - t0
+            want = [] if path_ids is None else [[nodes[i].x, nodes[i].y] for i in path_ids]
+            assert want == r["path"], "ObstacleGraph and build_graph disagree"
+        rebuild /= max(1, len(sample))
+
+        print(f"{count:>8} {len(graph.nodes):>7} {build:>8.2f} {load:>7.3f} {size / 1024:>7.0f} "
+              f"{p50 * 1e3:>7.2f} {p95 * 1e3:>7.2f} {rebuild * 1e3:>11.1f} {rebuild / p50:>7.0f}x")
+
+if __name__ == "__main__":
+    main()
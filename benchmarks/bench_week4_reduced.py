@@ -0,0 +1,46 @@
+"""Full vs reduced (bitangent) visibility graph in TH_week4: size, build and query time.
+
+    python -m benchmarks.bench_week4_reduced --polygons 20 50 100 200
+
+Both graphs are built for the same map with ``--method``; UCS and A* then run
+``--repeat`` times from S to G on each and must find paths of the same length.
+"""
+from __future__ import annotations
+import argparse
+import time
+from benchmarks import use_module_dir
+from benchmarks.generators import polygon_field
+
+use_module_dir("TH_week4")
+import shortest_path_polygons as spp  # noqa: E402
+
+def main() -> None:
+    p = argparse.ArgumentParser("TH_week4 reduced visibility graph benchmark")
+    p.add_argument("--polygons", type=int, nargs="*", default=[20, 50, 100, 200])
+    p.add_argument("--method", choices=spp.VISGRAPH_METHODS, default="grid")
+    p.add_argument("--repeat", type=int, default=20)
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+
+    print(f"{'polygons':>8} {'nodes':>7} {'graph':>8} {'edges':>8} {'build s':>8} {'ucs ms':>8} {'astar ms':>9} {'length':>10}")
+    for count in args.polygons:
+        S, G, polygons = polygon_field(count, args.seed)
+        lengths = set()
+        for reduced in (False, True):
+            t0 = time.perf_counter()
+            nodes, adj = spp.build_graph(S, G, polygons, args.method, reduced=reduced)
+            build = time.perf_counter() - t0
+            n_edges = sum(len(v) for v in adj.values()) // 2
+            times = {}
+            for name, search in (("ucs", lambda: spp.ucs(adj, 0, 1)), ("astar", lambda: spp.astar(adj, nodes, 0, 1))):
+                t0 = time.perf_counter()
+                for _ in range(args.repeat):
+                    path = search()
+                times[name] = (time.perf_counter() - t0) / args.repeat
+                lengths.add(round(spp.path_length(nodes, path), 9))
+            print(f"{count:>8} {len(nodes):>7} {'reduced' if reduced else 'full':>8} {n_edges:>8} {build:>8.2f} "
+                  f"{times['ucs'] * 1e3:>8.2f} {times['astar'] * 1e3:>9.2f} {min(lengths):>10.3f}")
+        assert len(lengths) == 1, "reduced graph changes the shortest path length"
+
+if __name__ == "__main__":
+    main()
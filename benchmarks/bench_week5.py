@@ -0,0 +1,63 @@
+"""Exact TSP: A* (MST heuristic) vs bitmask dynamic programming (Held-Karp).
+
+    python -m benchmarks.bench_week5 --sizes 10 12 14 16 18 20 --astar-max 20
+    python -m benchmarks.bench_week5 --sizes 15 18 20 --mst-cache 0   # A* without MST cache
+    python -m benchmarks.bench_week5 --sizes 16 18 20 --memory        # tracemalloc peak
+
+Both solvers index states by ``(subset, last city)``. DP preallocates a float64
+cost plus an int8 parent per state, ``2**(n-1) * (n-1) * 9`` bytes in total
+(about 3.6 GB at n = 25); use ``--sizes`` to stay within the available memory.
+A* preallocates the same tables only while they fit in ``MAX_TABLE_BYTES`` and
+otherwise keeps the states it reaches in a compact open-addressing table.
+"""
+from __future__ import annotations
+import argparse
+import time
+import tracemalloc
+from benchmarks import use_module_dir
+from benchmarks.generators import random_metric_tsp
+
+use_module_dir("TH_week5")
+from search_stats import SearchStats  # noqa: E402
+from tsp_astar import TSPSolverAStar, TSPSolverDP  # noqa: E402
+
+def main() -> None:
+    p = argparse.ArgumentParser("TH_week5 exact TSP benchmark")
+    p.add_argument("--sizes", type=int, nargs="*", default=[10, 12, 14, 16, 18, 20])
+    p.add_argument("--astar-max", type=int, default=14, help="skip A* above this many cities")
+    p.add_argument("--mst-cache", type=int, default=1 << 16, help="MST cache size for A* (0 disables)")
+    p.add_argument("--memory", action="store_true", help="report the tracemalloc peak (slower)")
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+
+    print(f"{'n':>4} {'method':>7} {'cost':>10} {'seconds':>10} {'table MB':>10} {'hit %':>7} {'heur s':>8} {'peak MB':>8}")
+    for n in args.sizes:
+        dist = random_metric_tsp(n, args.seed)
+        solvers = {"dp": lambda: TSPSolverDP(dist, 0)}
+        if n <= args.astar_max:
+            solvers["astar"] = lambda: TSPSolverAStar(dist, 0, cache_size=args.mst_cache)
+        costs = set()
+        for name, make in solvers.items():
+            if args.memory:
+                tracemalloc.start()
+            solver = make()
+            t0 = time.perf_counter()
+            # A* only times its heuristic when given stats (the "heur s" column)
+            cost, _ = solver.solve(stats=SearchStats()) if name == "astar" else solver.solve()
+            dt = time.perf_counter() - t0
+            peak = "-"
+            if args.memory:
+                peak = f"{tracemalloc.get_traced_memory()[1] / 2 ** 20:.1f}"
+                tracemalloc.stop()
+            # float64 cost + int8 parent per (subset, last city)
+            mb = f"{(1 << (n - 1)) * (n - 1) * 9 / 2 ** 20:.1f}"
+            if name == "dp":
+                hit, heur = "-", "-"
+            else:
+                hit, heur = f"{solver.cache_hit_rate():.1%}", f"{solver.heuristic_time:.3f}"
+            print(f"{n:>4} {name:>7} {cost:>10.1f} {dt:>10.3f} {mb:>10} {hit:>7} {heur:>8} {peak:>8}")
+            costs.add(round(cost, 6))
+        assert len(costs) == 1, "A* and DP disagree on the optimal tour"
+
+if __name__ == "__main__":
+    main()
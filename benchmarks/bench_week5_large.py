@@ -0,0 +1,45 @@
+"""Large-scale approximate TSP: candidate lists + 2-opt/Or-opt with don't-look bits.
+
+    python -m benchmarks.bench_week5_large --sizes 1000 10000 50000
+    python -m benchmarks.bench_week5_large --sizes 2000 --matrix      # NxN matrix input
+
+For uniform random points the optimal tour length is close to
+``0.7124 * sqrt(n * area)`` (Beardwood-Halton-Hammersley), printed as ``bhh``.
+"""
+from __future__ import annotations
+import argparse
+import math
+import numpy as np
+from benchmarks import use_module_dir
+from benchmarks.generators import random_points
+
+use_module_dir("TH_week5")
+from tsp_astar import TSPSolverLocalSearch  # noqa: E402
+
+def main() -> None:
+    p = argparse.ArgumentParser("TH_week5 large TSP benchmark")
+    p.add_argument("--sizes", type=int, nargs="*", default=[1000, 10000])
+    p.add_argument("--neighbors", type=int, default=8)
+    p.add_argument("--clusters", type=int, default=0, help="0 = uniform points")
+    p.add_argument("--matrix", action="store_true", help="pass a full distance matrix instead of coordinates")
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+
+    print(f"{'n':>7} {'initial':>11} {'final':>11} {'bhh':>11} {'cand s':>7} {'init s':>7} "
+          f"{'2opt s':>7} {'moves':>7} {'moves/s':>8}")
+    for n in args.sizes:
+        pts = random_points(n, args.seed, clusters=args.clusters)
+        if args.matrix:
+            diff = pts[:, None, :] - pts[None, :, :]
+            solver = TSPSolverLocalSearch(np.hypot(diff[..., 0], diff[..., 1]), k=args.neighbors)
+        else:
+            solver = TSPSolverLocalSearch(coords=pts, k=args.neighbors)
+        cost, _ = solver.solve()
+        t = solver.timings
+        bhh = 0.7124 * math.sqrt(n * 1000.0 ** 2)
+        print(f"{n:>7} {solver.initial_cost:>11.0f} {cost:>11.0f} {bhh:>11.0f} {t['candidates']:>7.2f} "
+              f"{t['construct']:>7.2f} {t['local_search']:>7.2f} {solver.improvements:>7} "
+              f"{solver.improvements_per_second():>8.0f}")
+
+if __name__ == "__main__":
+    main()
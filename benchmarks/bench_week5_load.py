@@ -0,0 +1,60 @@
+"""Peak memory and time of the TH_week5 distance-matrix loaders.
+
+    python -m benchmarks.bench_week5_load --sizes 1000 4000
+
+Writes an ``n x n`` text matrix to a temporary directory, then loads it as
+float64 / float32 arrays, into a memory-mapped ``.npy`` and back from that
+``.npy``. Peak memory is measured with tracemalloc (memory-mapped pages are
+not counted, which is the point).
+"""
+from __future__ import annotations
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from benchmarks import use_module_dir
+from benchmarks.generators import random_points
+
+use_module_dir("TH_week5")
+from tsp_astar import load_distance_matrix  # noqa: E402
+
+def write_matrix(path: str, n: int, seed: int) -> None:
+    pts = random_points(n, seed)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"{n}\n")
+        for lo in range(0, n, 256):
+            block = np.hypot(pts[lo:lo + 256, None, 0] - pts[None, :, 0],
+                             pts[lo:lo + 256, None, 1] - pts[None, :, 1])
+            np.savetxt(f, block, fmt="%.2f")
+
+def main() -> None:
+    p = argparse.ArgumentParser("TH_week5 loader benchmark")
+    p.add_argument("--sizes", type=int, nargs="*", default=[1000, 3000])
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+
+    print(f"{'n':>6} {'mode':>9} {'seconds':>8} {'peak MB':>8} {'array MB':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            txt, npy = os.path.join(tmp, f"d{n}.txt"), os.path.join(tmp, f"d{n}.npy")
+            write_matrix(txt, n, args.seed)
+            modes = {
+                "float64": lambda: load_distance_matrix(txt),
+                "float32": lambda: load_distance_matrix(txt, "float32"),
+                "mmap": lambda: load_distance_matrix(txt, out=npy),
+                "npy": lambda: load_distance_matrix(npy),
+            }
+            for name, load in modes.items():
+                tracemalloc.start()
+                t0 = time.perf_counter()
+                dist = load()
+                dt = time.perf_counter() - t0
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                print(f"{n:>6} {name:>9} {dt:>8.2f} {peak / 2 ** 20:>8.1f} {dist.nbytes / 2 ** 20:>9.1f}")
+                del dist
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Parallel branch and bound for exact TSP: wall time and speedup per worker count.
+
+    python -m benchmarks.bench_week5_parallel --sizes 16 18 --workers 1 4 8 16 32
+
+Speedup is relative to ``--workers 1`` (same algorithm, in-process) and is
+only meaningful when the machine has at least that many cores; the
+``cpus`` line at the top shows what is available. Instances use random
+symmetric integer weights, which are much harder for the MST bound than
+Euclidean ones.
+"""
+from __future__ import annotations
+import argparse
+import os
+import random
+import time
+from benchmarks import use_module_dir
+
+use_module_dir("TH_week5")
+from tsp_astar import TSPSolverAStar, TSPSolverParallel  # noqa: E402
+
+def random_symmetric(n: int, seed: int, max_weight: int = 100):
+    rng = random.Random(seed)
+    dist = [[0] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(i + 1, n):
+            dist[i][j] = dist[j][i] = rng.randint(1, max_weight)
+    return dist
+
+def main() -> None:
+    p = argparse.ArgumentParser("TH_week5 parallel branch-and-bound benchmark")
+    p.add_argument("--sizes", type=int, nargs="*", default=[16, 18])
+    p.add_argument("--workers", type=int, nargs="*", default=[1, 4, 8, 16, 32])
+    p.add_argument("--split-depth", type=int, default=2)
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+
+    print(f"cpus={os.cpu_count()}")
+    print(f"{'n':>4} {'workers':>8} {'cost':>8} {'seconds':>9} {'speedup':>8} {'tasks':>6} {'nodes':>9}")
+    for n in args.sizes:
+        dist = random_symmetric(n, args.seed + n)
+        t0 = time.perf_counter()
+        expected, _ = TSPSolverAStar(dist).solve()
+        print(f"{n:>4} {'A*':>8} {expected:>8.0f} {time.perf_counter() - t0:>9.3f}")
+        base = None
+        for w in args.workers:
+            solver = TSPSolverParallel(dist, workers=w, depth=args.split_depth)
+            t0 = time.perf_counter()
+            cost, _ = solver.solve()
+            dt = time.perf_counter() - t0
+            base = base or dt
+            print(f"{n:>4} {w:>8} {cost:>8.0f} {dt:>9.3f} {base / dt:>8.2f} {solver.tasks:>6} {solver.nodes:>9}")
+            assert cost == expected, "parallel result differs from the single-process optimum"
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Seeded generators for synthetic benchmark instances."""
+from __future__ import annotations
+import math
+import random
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+def random_digraph(n: int, avg_degree: int = 4, seed: int = 0,
+                   weighted: bool = False, max_weight: int = 100) -> Dict[int, list]:
+    """Random sparse directed graph in the TH_week1 adjacency-list format.
+
+    A random chain through every node guarantees that ``n - 1`` is reachable
+    from ``0``. Unweighted graphs map ``u -> [v, ...]``, weighted ones map
+    ``u -> [(v, w), ...]``.
+    """
+    rng = random.Random(seed)
+    order = list(range(1, n - 1))
+    rng.shuffle(order)
+    chain = [0] + order + [n - 1]
+    edges: List[Tuple[int, int]] = list(zip(chain, chain[1:]))
+    for _ in range(max(0, n * avg_degree - len(edges))):
+        edges.append((rng.randrange(n), rng.randrange(n)))
+
+    adj: Dict[int, list] = defaultdict(list)
+    for u, v in edges:
+        if u == v:
+            continue
+        if weighted:
+            adj[u].append((v, rng.randint(1, max_weight)))
+        else:
+            adj[u].append(v)
+    return adj
+
+def edge_list_text(adj: Dict[int, list], n: int, start: int, goal: int) -> str:
+    """Serialize an adjacency dict to the TH_week1 edge-list format (``N M`` / ``start goal`` / ``u v [w]``)."""
+    lines = []
+    for u, nbrs in adj.items():
+        for item in nbrs:
+            if isinstance(item, tuple):
+                lines.append(f"{u} {item[0]} {item[1]}")
+            else:
+                lines.append(f"{u} {item}")
+    return f"{n} {len(lines)}\n{start} {goal}\n" + "\n".join(lines) + "\n"
+
+def grid_road_graph(rows: int, cols: int, seed: int = 0, detour: float = 0.3
+                    ) -> Tuple[Dict[str, Tuple[float, float]], List[Tuple[str, str, float]]]:
+    """Jittered grid road network in the TH_week3 format.
+
+    Returns ``(positions, edges)`` with city names ``c<row>_<col>``. Each road
+    is at least as long as the straight line between its endpoints (stretched
+    by up to ``1 + detour``), so straight-line distance is admissible.
+    """
+    rng = random.Random(seed)
+    pos: Dict[str, Tuple[float, float]] = {}
+    for r in range(rows):
+        for c in range(cols):
+            pos[f"c{r}_{c}"] = (c * 10 + rng.uniform(-3, 3), r * 10 + rng.uniform(-3, 3))
+
+    edges: List[Tuple[str, str, float]] = []
+    for r in range(rows):
+        for c in range(cols):
+            a = f"c{r}_{c}"
+            for b in ((f"c{r}_{c + 1}" if c + 1 < cols else None),
+                      (f"c{r + 1}_{c}" if r + 1 < rows else None)):
+                if b is None:
+                    continue
+                w = math.dist(pos[a], pos[b]) * (1 + rng.uniform(0, detour))
+                edges.append((a, b, round(w, 3)))
+    return pos, edges
+
+def random_road_graph(n: int, k: int = 3, seed: int = 0, size: float = 1000.0, detour: float = 0.3
+                      ) -> Tuple[Dict[str, Tuple[float, float]], List[Tuple[str, str, float]]]:
+    """Random geometric road network in the TH_week3 format.
+
+    ``n`` cities (``c0`` .. ``c<n-1>``) are placed uniformly in a square; each
+    is joined to its ``k`` nearest neighbours (found on a bucket grid) and a
+    chain through the cities sorted by x keeps the network connected. Roads
+    are stretched by up to ``1 + detour`` like ``grid_road_graph``, so
+    straight-line distance stays admissible.
+    """
+    rng = random.Random(seed)
+    pts = [(rng.uniform(0, size), rng.uniform(0, size)) for _ in range(n)]
+    cell = size / max(1, int(math.sqrt(n / 4)))
+    buckets: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+    for i, (x, y) in enumerate(pts):
+        buckets[int(x // cell), int(y // cell)].append(i)
+
+    k = min(k, n - 1)
+    pairs = set()
+    for i, (x, y) in enumerate(pts):
+        bx, by, ring = int(x // cell), int(y // cell), 1
+        while True:
+            near = [j for dx in range(-ring, ring + 1) for dy in range(-ring, ring + 1)
+                    for j in buckets.get((bx + dx, by + dy), ()) if j != i]
+            near.sort(key=lambda j: math.dist(pts[i], pts[j]))
+            # every city closer than ring * cell lies in the searched square
+            if ring * cell > size or len(near) >= k and math.dist(pts[i], pts[near[k - 1]]) <= ring * cell:
+                break
+            ring += 1
+        pairs.update((min(i, j), max(i, j)) for j in near[:k])
+    by_x = sorted(range(n), key=lambda i: pts[i])
+    pairs.update((min(a, b), max(a, b)) for a, b in zip(by_x, by_x[1:]))
+
+    pos = {f"c{i}": p for i, p in enumerate(pts)}
+    edges = [(f"c{a}", f"c{b}", round(math.dist(pts[a], pts[b]) * (1 + rng.uniform(0, detour)) + 0.0005, 3))
+             for a, b in sorted(pairs)]
+    return pos, edges
+
+def straight_line_heuristic(pos: Dict[str, Tuple[float, float]], goal: str) -> Dict[str, float]:
+    gx, gy = pos[goal]
+    return {city: math.hypot(x - gx, y - gy) for city, (x, y) in pos.items()}
+
+def road_graph_texts(pos: Dict[str, Tuple[float, float]], edges: List[Tuple[str, str, float]], goal: str
+                     ) -> Dict[str, str]:
+    """TH_week3 data files (``citiesGraph.txt``, ``cities.txt``, ``heuristic.txt``) for goal."""
+    h = straight_line_heuristic(pos, goal)
+    return {
+        "citiesGraph.txt": "".join(f"{a} {b} {w}\n" for a, b, w in edges),
+        "cities.txt": "".join(f"{c} {x:.3f} {y:.3f}\n" for c, (x, y) in pos.items()),
+        # rounded down so the file stays admissible
+        "heuristic.txt": "".join(f"{c} {math.floor(v * 1000) / 1000}\n" for c, v in h.items()),
+    }
+
+def random_metric_tsp(n: int, seed: int = 0, size: float = 100.0) -> List[List[float]]:
+    """Symmetric TSP distance matrix of ``n`` random points, rounded to 1 decimal (TH_week5 format)."""
+    rng = random.Random(seed)
+    pts = [(rng.uniform(0, size), rng.uniform(0, size)) for _ in range(n)]
+    return [[round(math.dist(p, q), 1) for q in pts] for p in pts]
+
+def tsp_matrix_text(dist: List[List[float]]) -> str:
+    """Serialize to the TH_week5 text format (``N`` then N rows)."""
+    return f"{len(dist)}\n" + "".join(" ".join(str(d) for d in row) + "\n" for row in dist)
+
+def random_points(n: int, seed: int = 0, size: float = 1000.0, clusters: int = 0):
+    """``(n, 2)`` NumPy array of city coordinates, uniform or around ``clusters`` centres."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    if clusters <= 0:
+        return rng.uniform(0, size, (n, 2))
+    centres = rng.uniform(0, size, (clusters, 2))
+    return centres[rng.integers(clusters, size=n)] + rng.normal(0, size / (4 * clusters ** 0.5), (n, 2))
+
+def polygon_field(count: int, seed: int = 0, cell: float = 10.0, decimals: int = 2
+                  ) -> Tuple[Tuple[float, float], Tuple[float, float], List[List[Tuple[float, float]]]]:
+    """Non-overlapping convex polygons for TH_week4, one per cell of a square grid.
+
+    Each polygon has 3-7 vertices on a circle of random radius around its
+    (jittered) cell centre, so neighbours never overlap. Returns ``(S, G,
+    polygons)`` with S and G just outside opposite corners of the field.
+    Rounding to few ``decimals`` produces many collinear/degenerate pairs.
+    """
+    rng = random.Random(seed)
+    side = max(1, math.ceil(math.sqrt(count)))
+    polygons: List[List[Tuple[float, float]]] = []
+    for k in range(count):
+        r, c = divmod(k, side)
+        radius = rng.uniform(0.2, 0.45) * cell
+        slack = cell / 2 - radius
+        cx = c * cell + cell / 2 + rng.uniform(-slack, slack) * 0.5
+        cy = r * cell + cell / 2 + rng.uniform(-slack, slack) * 0.5
+        angles = sorted(rng.uniform(0, 2 * math.pi) for _ in range(rng.randint(3, 7)))
+        poly = []
+        for a in angles:
+            p = (round(cx + radius * math.cos(a), decimals), round(cy + radius * math.sin(a), decimals))
+            if not poly or p != poly[-1]:
+                poly.append(p)
+        if len(poly) >= 3 and poly[0] != poly[-1]:
+            polygons.append(poly)
+    far = side * cell + cell / 2
+    return (-cell / 2, -cell / 2), (far, far), polygons
+
+def polygon_input_text(S: Tuple[float, float], G: Tuple[float, float],
+                       polygons: List[List[Tuple[float, float]]]) -> str:
+    """Serialize to the TH_week4 input format (``N Sx Sy Gx Gy`` then ``M x1 y1 ...`` per polygon)."""
+    lines = [f"{len(polygons)} {S[0]} {S[1]} {G[0]} {G[1]}"]
+    for poly in polygons:
+        lines.append(" ".join([str(len(poly))] + [f"{x} {y}" for x, y in poly]))
+    return "\n".join(lines) + "\n"
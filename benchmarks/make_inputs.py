@@ -0,0 +1,60 @@
+"""Write seeded synthetic instances to disk in each module's own input format.
+
+    python -m benchmarks.make_inputs out --week1 100000 --week3-grid 100 --week3-random 10000 \\
+        --week4 200 --week5 12
+
+Produces, under ``out/``:
+
+    week1/graph_<n>.txt, week1/graph_<n>_w.txt   edge lists (``--input`` / ``--input-ucs``)
+    week3/grid<side>/, week3/random<n>/          citiesGraph.txt, cities.txt, heuristic.txt
+    week4/polygons_<count>.txt                   ``shortest_path_polygons.py -i``
+    week5/tsp_<n>.txt                            ``tsp_astar.py``
+
+Week 3 heuristics are straight-line distances to the last city (``c<rows-1>_<cols-1>``
+or ``c<n-1>``), which every road is at least as long as, so they are admissible.
+"""
+from __future__ import annotations
+import argparse
+import os
+from benchmarks.generators import (edge_list_text, grid_road_graph, polygon_field, polygon_input_text,
+                                   random_digraph, random_metric_tsp, random_road_graph, road_graph_texts,
+                                   tsp_matrix_text)
+
+def _write(path: str, text: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    print(f"{path} ({len(text) / 1024:.0f} KB)")
+
+def main() -> None:
+    p = argparse.ArgumentParser("write synthetic benchmark inputs")
+    p.add_argument("out", help="output directory")
+    p.add_argument("--week1", type=int, nargs="*", default=[], metavar="N", help="graph sizes (nodes)")
+    p.add_argument("--degree", type=int, default=4, help="average out-degree of week 1 graphs")
+    p.add_argument("--week3-grid", type=int, nargs="*", default=[], metavar="SIDE", help="grid road graphs")
+    p.add_argument("--week3-random", type=int, nargs="*", default=[], metavar="N", help="random road graphs")
+    p.add_argument("--week4", type=int, nargs="*", default=[], metavar="COUNT", help="polygon fields")
+    p.add_argument("--week5", type=int, nargs="*", default=[], metavar="N", help="metric TSP matrices")
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+
+    for n in args.week1:
+        for weighted, suffix in ((False, ""), (True, "_w")):
+            adj = random_digraph(n, args.degree, args.seed, weighted=weighted)
+            _write(os.path.join(args.out, "week1", f"graph_{n}{suffix}.txt"), edge_list_text(adj, n, 0, n - 1))
+    for side in args.week3_grid:
+        pos, edges = grid_road_graph(side, side, args.seed)
+        for name, text in road_graph_texts(pos, edges, f"c{side - 1}_{side - 1}").items():
+            _write(os.path.join(args.out, "week3", f"grid{side}", name), text)
+    for n in args.week3_random:
+        pos, edges = random_road_graph(n, seed=args.seed)
+        for name, text in road_graph_texts(pos, edges, f"c{n - 1}").items():
+            _write(os.path.join(args.out, "week3", f"random{n}", name), text)
+    for count in args.week4:
+        S, G, polygons = polygon_field(count, args.seed)
+        _write(os.path.join(args.out, "week4", f"polygons_{count}.txt"), polygon_input_text(S, G, polygons))
+    for n in args.week5:
+        _write(os.path.join(args.out, "week5", f"tsp_{n}.txt"), tsp_matrix_text(random_metric_tsp(n, args.seed)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""Cross-module benchmark suite: time every search over size sweeps, store and compare results.
+
+    python -m benchmarks.suite                                  # all modules, default sizes
+    python -m benchmarks.suite --modules week1 week3 --sizes 1000 10000
+    python -m benchmarks.suite --output before.json
+    python -m benchmarks.suite --output after.json --compare before.json
+
+Each module runs in its own ``python -m benchmarks.suite --worker <module>``
+subprocess, because TH_week1 and TH_week3 both import a flat ``search``
+module. A case is timed ``--repeat`` times on an instance built outside the
+timed region; the minimum and median are kept, plus the SearchStats counters
+of one extra run for searches (a change in ``expanded`` means the algorithm
+now does different work, not just faster or slower work).
+
+Results go to ``--output`` (default ``benchmarks/results/<git commit>.json``)
+together with the Python version, platform and CPU count. ``--compare``
+matches cases by (case, size) and exits with status 1 if any case got slower
+by more than ``--threshold`` and at least ``--min-delta`` seconds, so it can
+gate a change. Results are machine-specific; compare runs from the same machine.
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from benchmarks import ROOT, use_module_dir
+
+# (case name, size, run) where run(stats) performs one timed call; stats is
+# None while timing and a SearchStats for the extra counting run. Cases that
+# are not searches ignore it. Cases are run as soon as they are yielded, so
+# the closures may refer to the current loop variables.
+Case = Tuple[str, int, Callable[[Optional[object]], object]]
+
+def _week1(sizes: List[int], seed: int) -> Iterator[Case]:
+    from benchmarks.generators import random_digraph
+    use_module_dir("TH_week1")
+    from search import BFS, DFS, UCS_old, UCS_new, UCS_bidir
+    from utils import reverse_graph
+
+    for n in sizes:
+        plain = random_digraph(n, 4, seed)
+        weighted = random_digraph(n, 4, seed, weighted=True)
+        reverse = reverse_graph(weighted)
+        yield "week1.BFS", n, lambda st: BFS(plain, 0, n - 1, stats=st)
+        yield "week1.DFS", n, lambda st: DFS(plain, 0, n - 1, stats=st)
+        yield "week1.UCS_old", n, lambda st: UCS_old(weighted, 0, n - 1, stats=st)
+        yield "week1.UCS_new", n, lambda st: UCS_new(weighted, 0, n - 1, stats=st)
+        yield "week1.UCS_bidir", n, lambda st: UCS_bidir(weighted, 0, n - 1, reverse, stats=st)
+
+def _week3(sizes: List[int], seed: int) -> Iterator[Case]:
+    import random
+    from benchmarks.generators import random_road_graph, straight_line_heuristic
+    use_module_dir("TH_week3", "src")
+    from graph import RoadGraph
+    from search import ZeroHeuristic, a_star, bidirectional_a_star, greedy_best_first
+
+    for n in sizes:
+        pos, edges = random_road_graph(n, seed=seed)
+        G = RoadGraph.from_edges(edges)
+        rng = random.Random(seed)
+        queries = [(rng.choice(G.names), rng.choice(G.names)) for _ in range(20)]
+        tables = {}
+        for s, t in queries:
+            for city in (s, t):
+                if city not in tables:
+                    tables[city] = G.heuristic_table(straight_line_heuristic(pos, city))
+
+        def run_all(fn: Callable) -> Callable[[Optional[object]], None]:
+            def run(st):
+                for s, t in queries:
+                    fn(s, t, st)
+            return run
+
+        # 20 fixed queries per case; heuristic tables are precomputed
+        yield "week3.gbfs", n, run_all(lambda s, t, st: greedy_best_first(G, s, t, tables[t], stats=st))
+        yield "week3.astar", n, run_all(lambda s, t, st: a_star(G, s, t, tables[t], stats=st))
+        yield "week3.ucs", n, run_all(lambda s, t, st: a_star(G, s, t, ZeroHeuristic(), stats=st))
+        yield "week3.bidir_astar", n, run_all(
+            lambda s, t, st: bidirectional_a_star(G, s, t, tables[t], tables[s], stats=st))
+
+def _week4(sizes: List[int], seed: int) -> Iterator[Case]:
+    from benchmarks.generators import polygon_field
+    use_module_dir("TH_week4")
+    import shortest_path_polygons as spp
+
+    for count in sizes:
+        S, G, polygons = polygon_field(count, seed)
+        for method in ("grid", "sweep", "numpy"):
+            yield f"week4.build_{method}", count, lambda st: spp.build_graph(S, G, polygons, method)
+        yield "week4.build_reduced", count, lambda st: spp.build_graph(S, G, polygons, reduced=True)
+        nodes, adj = spp.build_graph(S, G, polygons)
+        yield "week4.bfs", count, lambda st: spp.bfs(adj, 0, 1, stats=st)
+        yield "week4.ucs", count, lambda st: spp.ucs(adj, 0, 1, stats=st)
+        yield "week4.astar", count, lambda st: spp.astar(adj, nodes, 0, 1, stats=st)
+
+def _week5(sizes: List[int], seed: int) -> Iterator[Case]:
+    from benchmarks.generators import random_metric_tsp
+    use_module_dir("TH_week5")
+    from tsp_astar import TSPSolverAStar, TSPSolverDP
+
+    for n in sizes:
+        dist = random_metric_tsp(n, seed)
+        # a fresh solver per run so the MST cache starts empty
+        yield "week5.astar", n, lambda st: TSPSolverAStar(dist, 0).solve(stats=st)
+        yield "week5.dp", n, lambda st: TSPSolverDP(dist, 0).solve()
+
+MODULES: Dict[str, Tuple[Callable[[List[int], int], Iterator[Case]], List[int]]] = {
+    "week1": (_week1, [1000, 10000, 100000]),
+    "week3": (_week3, [1000, 10000, 50000]),
+    "week4": (_week4, [10, 30, 60]),
+    "week5": (_week5, [10, 13, 16]),
+}
+
+def run_worker(module: str, sizes: List[int], repeat: int, seed: int) -> List[dict]:
+    use_module_dir()
+    from search_stats import SearchStats
+
+    make, default = MODULES[module]
+    records = []
+    for name, size, run in make(sizes or default, seed):
+        times = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            run(None)
+            times.append(time.perf_counter() - t0)
+        stats = SearchStats()
+        run(stats)
+        rec = {"case": name, "size": size, "min": min(times), "median": statistics.median(times)}
+        if stats.searches:
+            rec["expanded"] = stats.expanded
+        records.append(rec)
+        print(f"{name:>20} {size:>8} {rec['min']:>10.4f}", file=sys.stderr)
+    return records
+
+def git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+    except OSError:
+        return "unknown"
+    return out.stdout.strip() or "unknown"
+
+def compare(base: dict, new: dict, threshold: float, min_delta: float) -> bool:
+    """Print new against base; return True if some case regressed."""
+    old = {(r["case"], r["size"]): r for r in base["results"]}
+    regressed = False
+    print(f"{'case':>20} {'size':>8} {'old s':>10} {'new s':>10} {'ratio':>7}")
+    for r in new["results"]:
+        o = old.get((r["case"], r["size"]))
+        if o is None:
+            continue
+        ratio = r["min"] / o["min"] if o["min"] > 0 else float("inf")
+        flags = []
+        if ratio > 1 + threshold and r["min"] - o["min"] >= min_delta:
+            flags.append("SLOWER")
+            regressed = True
+        if o.get("expanded") != r.get("expanded"):
+            flags.append(f"expanded {o.get('expanded')} -> {r.get('expanded')}")
+        print(f"{r['case']:>20} {r['size']:>8} {o['min']:>10.4f} {r['min']:>10.4f} {ratio:>7.2f} {' '.join(flags)}")
+    return regressed
+
+def main() -> None:
+    p = argparse.ArgumentParser("cross-module benchmark suite")
+    p.add_argument("--modules", nargs="*", choices=sorted(MODULES), default=sorted(MODULES))
+    p.add_argument("--sizes", type=int, nargs="*", default=[], help="override the default sizes of every module")
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--output", help="results file (default benchmarks/results/<git commit>.json)")
+    p.add_argument("--compare", metavar="BASE", help="results file to compare against")
+    p.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown before a case is flagged")
+    p.add_argument("--min-delta", type=float, default=0.005, help="ignore slowdowns smaller than this (seconds)")
+    p.add_argument("--worker", choices=sorted(MODULES), help=argparse.SUPPRESS)
+    args = p.parse_args()
+
+    if args.worker:
+        json.dump(run_worker(args.worker, args.sizes, args.repeat, args.seed), sys.stdout)
+        return
+
+    results = []
+    for module in args.modules:
+        cmd = [sys.executable, "-m", "benchmarks.suite", "--worker", module,
+               "--repeat", str(args.repeat), "--seed", str(args.seed)]
+        if args.sizes:
+            cmd += ["--sizes"] + [str(s) for s in args.sizes]
+        out = subprocess.run(cmd, cwd=ROOT, stdout=subprocess.PIPE, text=True, check=True)
+        results += json.loads(out.stdout)
+
+    commit = git_commit()
+    doc = {
+        "commit": commit,
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "results": results,
+    }
+    path = args.output or os.path.join(ROOT, "benchmarks", "results", f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(doc, f, indent=1)
+    print(f"wrote {path}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            base = json.load(f)
+        if compare(base, doc, args.threshold, args.min_delta):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Counters shared by the search algorithms of every TH_week* module.
+
+Each search takes an optional ``stats`` argument. It counts in local variables
+and hands the totals over once, at the end, through ``stats.add(...)``, so a
+search run without stats only pays for a few integer additions. Any object
+with compatible ``add`` and ``timed`` methods can be passed instead.
+
+The module lives at the repository root; the command-line scripts add the root
+to ``sys.path`` before importing it.
+"""
+from __future__ import annotations
+import json
+import sys
+from dataclasses import asdict, dataclass
+from time import perf_counter
+from typing import Callable, Dict, TextIO
+
+@dataclass
+class SearchStats:
+    searches: int = 0
+    expanded: int = 0         # nodes taken off the frontier and expanded
+    generated: int = 0        # successors looked at while expanding
+    pushes: int = 0           # frontier insertions (heap pushes, queue appends)
+    pops: int = 0             # frontier removals
+    stale: int = 0            # removals skipped: node already closed or entry outdated
+    peak_frontier: int = 0    # largest frontier size seen
+    heuristic_time: float = 0.0
+    wall_time: float = 0.0
+
+    def add(self, expanded: int = 0, generated: int = 0, pushes: int = 0, pops: int = 0, stale: int = 0,
+            peak_frontier: int = 0, heuristic_time: float = 0.0, wall_time: float = 0.0) -> None:
+        """Add the totals of one search."""
+        self.searches += 1
+        self.expanded += expanded
+        self.generated += generated
+        self.pushes += pushes
+        self.pops += pops
+        self.stale += stale
+        self.peak_frontier = max(self.peak_frontier, peak_frontier)
+        self.heuristic_time += heuristic_time
+        self.wall_time += wall_time
+
+    def timed(self, h: Callable[..., float]) -> Callable[..., float]:
+        """Wrap a heuristic function so its running time goes into heuristic_time."""
+        def wrapper(*args):
+            t0 = perf_counter()
+            value = h(*args)
+            self.heuristic_time += perf_counter() - t0
+            return value
+        return wrapper
+
+    def as_dict(self) -> Dict[str, float]:
+        return asdict(self)
+
+    def report(self, title: str = "", stream: TextIO = sys.stdout) -> None:
+        prefix = f"[{title}] " if title else ""
+        print(f"{prefix}expanded={self.expanded} generated={self.generated} pushes={self.pushes} "
+              f"pops={self.pops} stale={self.stale} peak_frontier={self.peak_frontier} "
+              f"heuristic={self.heuristic_time * 1e3:.3f}ms wall={self.wall_time * 1e3:.3f}ms", file=stream)
+
+def write_json(stats: Dict[str, SearchStats], path: str) -> None:
+    """Write ``{name: counters}`` as JSON to path ('-' for stdout)."""
+    text = json.dumps({name: s.as_dict() for name, s in stats.items()}, indent=2)
+    if path == "-":
+        print(text)
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text + "\n")